@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+from functools import partial
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# orjson is a C extension, pylint cannot list its members
+# pylint: disable=no-member
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+AUTO = "auto"
+JSON = "json"
+ORJSON = "orjson"
+JSON_BACKENDS = (AUTO, JSON, ORJSON)
+
+COMPACT_SEPARATORS = (",", ":")
+
+# output of orjson that the json module would write differently: DEL is escaped by
+# ensure_ascii, floats are written with an exponent in another form (1e16 vs 1e+16)
+# and NaN/Infinity become null
+_NOT_STDLIB_OUTPUT = re.compile(rb"\x7f|[0-9][eE]|null")
+
+
+class JsonBackend:
+    """Serializer of the json module, the reference every backend must match"""
+
+    name = JSON
+
+    @staticmethod
+    def loads(json_string):
+        return json.loads(json_string)
+
+    @staticmethod
+    def loads_buffer(buffer):
+        """Parse the JSON in the bytes-like buffer, e.g. a memory mapped file"""
+        return json.loads(bytes(buffer))
+
+    @staticmethod
+    def dumps(json_object, indent=None, separators=None):
+        return json.dumps(json_object, indent=indent, separators=separators)
+
+
+class OrjsonBackend(JsonBackend):
+    """Serializer using orjson whenever its result is the same as the json module's
+
+    Documents orjson rejects (e.g. with NaN) are parsed again by the json module,
+    which returns the same value or raises the same error as without orjson. Only
+    formats orjson can write, compact or indented by 2, are written by orjson. The
+    output is written again by the json module when it could differ.
+    """
+
+    name = ORJSON
+    _OPTIONS = 0
+    if orjson is not None:
+        _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    @staticmethod
+    def loads(json_string):
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            return json.loads(json_string)
+
+    @staticmethod
+    def loads_buffer(buffer):
+        # orjson parses the buffer in place, without copying or decoding it first
+        try:
+            return orjson.loads(buffer)
+        except orjson.JSONDecodeError:
+            return json.loads(bytes(buffer))
+
+    @classmethod
+    def dumps(cls, json_object, indent=None, separators=None):
+        if indent is None and separators == COMPACT_SEPARATORS:
+            options = cls._OPTIONS
+        elif isinstance(indent, int) and indent == 2 and separators is None:
+            options = cls._OPTIONS | orjson.OPT_INDENT_2
+        else:
+            return json.dumps(json_object, indent=indent, separators=separators)
+        try:
+            output = orjson.dumps(json_object, option=options)
+        except TypeError:
+            output = None
+        if output is None or not output.isascii() or _NOT_STDLIB_OUTPUT.search(output):
+            return json.dumps(json_object, indent=indent, separators=separators)
+        return output.decode("ascii")
+
+
+def get_json_backend(name):
+    """Return the backend called name, ``auto`` being orjson when it is installed
+
+    Raise ValueError for an unknown or not installed backend.
+    """
+    if name not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unsupported json backend '{name}', "
+            f"expected one of: {', '.join(JSON_BACKENDS)}"
+        )
+    if name == AUTO:
+        name = ORJSON if orjson is not None else JSON
+    if name == ORJSON:
+        if orjson is None:
+            raise ValueError("json backend 'orjson' requires the orjson package")
+        return OrjsonBackend()
+    return JsonBackend()
+
+
+def _newline_indent(indent, level):
+    return "" if indent is None else "\n" + indent * level
+
+
+def _reindent(json_string, indent, level):
+    # JSON strings never contain a raw newline, every newline starts a new line
+    if indent is None or level <= 0:
+        return json_string
+    return json_string.replace("\n", "\n" + indent * level)
+
+
+def iter_encode(
+    json_object, dumps, indent=None, separators=None, depth=2, batch_size=1000
+):
+    """Yield the JSON of json_object in chunks, joined they equal its dumps
+
+    The dictionaries and lists of the first depth levels are written piece by piece,
+    deeper values are serialized by dumps, the items of lists in batches of
+    batch_size. Only one chunk is held in memory at a time, while the whole string
+    is built in C by dumps.
+    """
+    encode = partial(dumps, indent=indent, separators=separators)
+    if indent is not None and not isinstance(indent, str):
+        indent = " " * indent
+    if separators is None:
+        separators = (", " if indent is None else ",", ": ")
+    yield from _iter_encode(json_object, encode, indent, separators, depth, batch_size)
+
+
+def _iter_encode(json_object, encode, indent, separators, depth, batch_size, level=0):
+    item_separator, key_separator = separators
+    is_list = isinstance(json_object, (list, tuple))
+    is_dict = isinstance(json_object, dict) and all(
+        isinstance(key, str) for key in json_object
+    )
+    if level >= depth or not json_object or not (is_list or is_dict):
+        yield _reindent(encode(json_object), indent, level)
+        return
+    item_start = item_separator + _newline_indent(indent, level + 1)
+    yield ("[" if is_list else "{") + _newline_indent(indent, level + 1)
+    if is_list and level + 1 >= depth:
+        # the items are not opened, serialize them in batches and strip the brackets
+        start = 1 + len(_newline_indent(indent, 1))
+        end = -1 - len(_newline_indent(indent, 0))
+        for offset in range(0, len(json_object), batch_size):
+            if offset:
+                yield item_start
+            batch = list(json_object[offset : offset + batch_size])
+            yield _reindent(encode(batch)[start:end], indent, level)
+    elif is_list:
+        for position, value in enumerate(json_object):
+            if position:
+                yield item_start
+            yield from _iter_encode(
+                value, encode, indent, separators, depth, batch_size, level + 1
+            )
+    else:
+        for position, (key, value) in enumerate(json_object.items()):
+            yield (item_start if position else "") + encode(key) + key_separator
+            yield from _iter_encode(
+                value, encode, indent, separators, depth, batch_size, level + 1
+            )
+    yield _newline_indent(indent, level) + ("]" if is_list else "}")
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import concurrent.futures
+from functools import partial
+from itertools import repeat
+from .files import open_text_input
+from .schema import format_schema_path, get_validator, reference_errors, schema_registry
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+THREAD = "thread"
+PROCESS = "process"
+EXECUTORS = (THREAD, PROCESS)
+
+# validator of the schema, built once by each worker process
+_process_state = {}
+
+
+def item_error(validator, instance):
+    """Return the failure message of instance, or None if it is valid"""
+    from jsonschema.exceptions import best_match
+
+    try:
+        error = best_match(validator.iter_errors(instance))
+    except reference_errors() as e:
+        return f"Json schema error: {e}"
+    if error is None:
+        return None
+    return f"{error.message}, Schema path: {format_schema_path(error)}"
+
+
+def load_file(file_name, encoding=None, loads=json.loads):
+    with open_text_input(file_name, encoding) as json_file:
+        return loads(json_file.read())
+
+
+def _load_named_file(file_name, encoding, loads):
+    try:
+        return load_file(file_name, encoding, loads)
+    except ValueError as e:
+        raise ValueError(f"{file_name}: {e}") from e
+
+
+def load_files(
+    file_names, encoding=None, loads=json.loads, executor=THREAD, workers=None
+):
+    """Return the json objects of file_names, parsed by a bounded pool of workers
+
+    A parsing error names the file it occurred in.
+    """
+    if workers is None:
+        # the default bound of ThreadPoolExecutor, threads mostly wait for reads
+        cpus = os.cpu_count() or 1
+        workers = min(32, cpus + 4) if executor == THREAD else cpus
+    if workers == 1 or len(file_names) <= 1:
+        return [_load_named_file(name, encoding, loads) for name in file_names]
+    # concurrent.futures imports the executors, and multiprocessing, when used
+    if executor == PROCESS:
+        pool_class = concurrent.futures.ProcessPoolExecutor
+    else:
+        pool_class = concurrent.futures.ThreadPoolExecutor
+    with pool_class(min(workers, len(file_names))) as pool:
+        return list(
+            pool.map(_load_named_file, file_names, repeat(encoding), repeat(loads))
+        )
+
+
+def validate_chunk(validator, chunk, loads=None, encoding=None):
+    """Return the (key, message) pairs of the invalid items of chunk
+
+    chunk is a list of (key, item) pairs. With loads every item is the name of a
+    file, parsed by loads.
+    """
+    failures = []
+    for key, item in chunk:
+        if loads is not None:
+            try:
+                item = load_file(item, encoding, loads)
+            except (OSError, ValueError) as e:
+                failures.append((key, f"Cannot load json: {e}"))
+                continue
+        message = item_error(validator, item)
+        if message is not None:
+            failures.append((key, message))
+    return failures
+
+
+def _init_process(schema, key, schemas):
+    for uri, registered in schemas.items():
+        schema_registry.register(uri, registered)
+    _process_state["validator"] = get_validator(schema, key)
+
+
+def _validate_chunk_in_process(chunk, loads, encoding):
+    return validate_chunk(_process_state["validator"], chunk, loads, encoding)
+
+
+def validate_items(
+    items,
+    schema,
+    key=None,
+    loads=None,
+    encoding=None,
+    executor=THREAD,
+    workers=None,
+    chunk_size=None,
+):
+    """Validate the (key, item) pairs of items against schema in a pool of workers
+
+    The schema is checked and its validator built once, up front, then once per
+    worker process. Items are sent to the workers in chunks and only the failures
+    come back. Return a dictionary of key to failure message, in the order of items.
+    """
+    validator = get_validator(schema, key)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # a few chunks per worker balance the load without much overhead
+        chunk_size = max(1, -(-len(items) // (workers * 4)))
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results = [
+            validate_chunk(validator, chunk, loads, encoding) for chunk in chunks
+        ]
+    elif executor == PROCESS:
+        initargs = (schema, key, dict(schema_registry.schemas))
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_process, initargs=initargs
+        ) as pool:
+            results = list(
+                pool.map(
+                    _validate_chunk_in_process, chunks, repeat(loads), repeat(encoding)
+                )
+            )
+    else:
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            results = list(
+                pool.map(
+                    partial(validate_chunk, validator),
+                    chunks,
+                    repeat(loads),
+                    repeat(encoding),
+                )
+            )
+    return dict(failure for result in results for failure in result)
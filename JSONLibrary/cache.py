@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import re
+from collections import OrderedDict
+from threading import Lock
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+_SIZE = re.compile(r"\s*([0-9]+)\s*(?:([KMG])B?|B)?\s*", re.IGNORECASE)
+_UNITS = {None: 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(size):
+    """Return the number of bytes of size, an integer or a string like ``64MB``
+
+    Raise ValueError if size is not a valid size.
+    """
+    if isinstance(size, int):
+        return size
+    match = _SIZE.fullmatch(str(size))
+    if match is None:
+        raise ValueError(f"Invalid size '{size}', expected e.g. 1048576, 512KB or 64MB")
+    number, unit = match.groups()
+    return int(number) * _UNITS[unit.upper() if unit else None]
+
+
+class LRUCache:
+    """Thread-safe least recently used cache with hit and miss counters.
+
+    A maxsize of 0 disables caching, every lookup is then counted as a miss.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def _evict(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+
+
+class SizedLRUCache(LRUCache):
+    """Thread-safe least recently used cache of bytes values bounded by their total size.
+
+    The budget is the ``maxsize`` in bytes, a value larger than the whole budget is
+    not cached. A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.nbytes = 0
+        self.evictions = 0
+
+    def put(self, key, value):
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.nbytes -= len(previous)
+            if len(value) > self.maxsize:
+                return
+            self._data[key] = value
+            self.nbytes += len(value)
+            self._evict()
+
+    def discard(self, key):
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.nbytes -= len(previous)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.nbytes = 0
+            self.evictions = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "bytes": self.nbytes,
+            "maxsize": self.maxsize,
+        }
+
+    def _evict(self):
+        while self.nbytes > max(self.maxsize, 0):
+            _, value = self._data.popitem(last=False)
+            self.nbytes -= len(value)
+            self.evictions += 1
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+import sys
+from array import array
+from itertools import islice
+from operator import ge, gt, itemgetter, le, lt
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+COUNT = "count"
+SUM = "sum"
+MIN = "min"
+MAX = "max"
+MEAN = "mean"
+DISTINCT = "distinct"
+AGGREGATES = (COUNT, SUM, MIN, MAX, MEAN, DISTINCT)
+
+# integers a float represents exactly, larger ones stay in a list
+_MAX_EXACT_FLOAT = 2**53
+
+
+def get_records(values):
+    """Return the records of the values matched by a JSONPath
+
+    A single matched list is the list of records, otherwise every matched value
+    is a record.
+    """
+    if len(values) == 1 and isinstance(values[0], list):
+        return values[0]
+    return values
+
+
+def _field_values(records, keys, field, fail_on_missing):
+    try:
+        values = records
+        for key in keys:
+            values = list(map(itemgetter(key), values))
+        return values
+    except (KeyError, IndexError, TypeError):
+        pass
+    # some record has no such field, find which one
+    values = []
+    for position, record in enumerate(records):
+        value = record
+        for key in keys:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                if fail_on_missing:
+                    raise ValueError(
+                        f"Record {position} has no field {field}"
+                    ) from None
+                value = None
+                break
+        values.append(value)
+    return values
+
+
+def make_column(values, numpy=False):
+    """Return values as a compact column
+
+    Integers are stored in an ``array('q')``, floats, or floats and integers, in an
+    ``array('d')``. Values of other types are kept in the list. With numpy a NumPy
+    array is returned, of dtype ``object`` for values of mixed types.
+    """
+    types = set(map(type, values))
+    exact = int not in types or all(
+        -_MAX_EXACT_FLOAT <= value <= _MAX_EXACT_FLOAT
+        for value in values
+        if type(value) is int
+    )
+    if numpy:
+        try:
+            import numpy as np
+        except ImportError:
+            raise ValueError("numpy columns require the numpy package") from None
+        if types == {int}:
+            try:
+                return np.array(values, dtype=np.int64)
+            except OverflowError:
+                return np.array(values, dtype=object)
+        if types in ({float}, {int, float}) and exact:
+            return np.array(values, dtype=np.float64)
+        if types in ({bool}, {str}):
+            return np.array(values)
+        return np.array(values, dtype=object)
+    if types == {int}:
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    if types in ({float}, {int, float}) and exact:
+        return array("d", values)
+    return values
+
+
+def extract_columns(records, fields, fail_on_missing=True, numpy=False):
+    """Return a dictionary of each field to the column of its values in records
+
+    A field is the key of the records, or keys separated with ``.`` for a nested
+    field. Raise ValueError when a record has no such field, unless fail_on_missing
+    is False, which gives None instead.
+    """
+    return {
+        field: make_column(
+            _field_values(records, field.split("."), field, fail_on_missing), numpy
+        )
+        for field in fields
+    }
+
+
+def _prepare(column):
+    """Return column as a sequence, and whether it is a NumPy array of numbers"""
+    # a NumPy array exists only once numpy was imported, never import it here
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(column, np.ndarray):
+        if column.dtype.kind in "biuf":
+            return column, True
+        return column.tolist(), False
+    if not isinstance(column, (list, array)):
+        column = list(column)
+    return column, False
+
+
+def _python_value(value):
+    # NumPy scalars are returned as the equivalent python values
+    return value.item() if hasattr(value, "item") else value
+
+
+def aggregate(column, aggregate_name):
+    """Return the aggregate of the values of column
+
+    Raise ValueError if aggregate_name is not one of AGGREGATES or the values
+    cannot be aggregated.
+    """
+    if aggregate_name not in AGGREGATES:
+        raise ValueError(
+            f"Unsupported aggregate '{aggregate_name}', "
+            f"expected one of: {', '.join(AGGREGATES)}"
+        )
+    column, vectorized = _prepare(column)
+    if aggregate_name == COUNT:
+        return len(column)
+    if aggregate_name == DISTINCT:
+        return _distinct(column, vectorized)
+    if aggregate_name != SUM and len(column) == 0:
+        raise ValueError(f"Cannot get the {aggregate_name} of an empty column")
+    try:
+        if vectorized:
+            result = getattr(column, aggregate_name)()
+        elif aggregate_name == SUM:
+            result = sum(column)
+        elif aggregate_name == MIN:
+            result = min(column)
+        elif aggregate_name == MAX:
+            result = max(column)
+        else:
+            result = sum(column) / len(column)
+    except TypeError as e:
+        raise ValueError(f"Cannot get the {aggregate_name} of the column: {e}") from e
+    return _python_value(result)
+
+
+def _distinct(column, vectorized):
+    if vectorized:
+        import numpy as np
+
+        _, first_positions = np.unique(column, return_index=True)
+        return column[np.sort(first_positions)].tolist()
+    try:
+        return list(dict.fromkeys(column))
+    except TypeError:
+        # unhashable values, e.g. objects, are compared to every distinct one
+        distinct = []
+        for value in column:
+            if value not in distinct:
+                distinct.append(value)
+        return distinct
+
+
+def first_unsorted(column, descending=False, strict=False):
+    """Return the position of the first value out of order, None if column is sorted
+
+    The value at the returned position is not before the next one.
+    """
+    if descending:
+        in_order = gt if strict else ge
+    else:
+        in_order = lt if strict else le
+    column, vectorized = _prepare(column)
+    if vectorized:
+        import numpy as np
+
+        positions = np.flatnonzero(~in_order(column[:-1], column[1:]))
+        return int(positions[0]) if len(positions) else None
+    try:
+        if all(map(in_order, column, islice(column, 1, None))):
+            return None
+    except TypeError as e:
+        raise ValueError(f"Cannot compare the values of the column: {e}") from e
+    for position in range(len(column) - 1):
+        if not in_order(column[position], column[position + 1]):
+            return position
+    return None  # pragma: no cover - found by the check above
+
+
+def first_different(column, value):
+    """Return the position of the first value not equal to value, None if all are"""
+    column, vectorized = _prepare(column)
+    if vectorized:
+        import numpy as np
+
+        positions = np.flatnonzero(column != value)
+        return int(positions[0]) if len(positions) else None
+    if column.count(value) == len(column):
+        return None
+    for position, item in enumerate(column):
+        if item != value:
+            return position
+    return None  # pragma: no cover - found by the count above
+
+
+def first_duplicate(column):
+    """Return the position of the first value equal to a previous one, None if all
+    values are unique"""
+    column, vectorized = _prepare(column)
+    if vectorized:
+        import numpy as np
+
+        if len(np.unique(column)) == len(column):
+            return None
+        column = column.tolist()
+    seen = set()
+    try:
+        for position, value in enumerate(column):
+            if value in seen:
+                return position
+            seen.add(value)
+        return None
+    except TypeError:
+        # unhashable values, e.g. objects, are compared to every previous one
+        for position, value in enumerate(column):
+            if value in column[:position]:
+                return position
+        return None
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+import json
+from collections import Counter
+from .simplepath import to_json_path
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# marks an ignored value in the tree of ignored keys
+IGNORED = object()
+_MISSING = object()
+_CONTAINERS = (dict, list, tuple)
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+# scalars whose canonical value is themselves, booleans are tagged so that they
+# never match the numbers python finds equal to them
+_PLAIN_SCALARS = _SCALARS - {bool}
+# longest value written in a difference, longer ones are cut
+_MAX_VALUE_LENGTH = 80
+
+
+class _Enough(Exception):
+    """Raised once the comparison found all the differences it reports"""
+
+
+def ignore_tree(paths):
+    """Return the tree of ignored keys of paths, lists of keys from the root
+
+    Each key of the tree maps to the tree of its value, or to IGNORED. Return None
+    if nothing is ignored, IGNORED if the root is.
+    """
+    tree = None
+    for keys in paths:
+        if not keys:
+            return IGNORED
+        if tree is None:
+            tree = {}
+        node = tree
+        for key in keys[:-1]:
+            child = node.get(key)
+            if child is IGNORED:
+                break
+            if child is None:
+                child = node[key] = {}
+            node = child
+        else:
+            node[keys[-1]] = IGNORED
+    return tree
+
+
+def _equal(expected, actual):
+    """Return whether the scalars are equal, booleans only equal booleans"""
+    return expected == actual and (type(expected) is bool) == (type(actual) is bool)
+
+
+def _format(value):
+    try:
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        text = repr(value)
+    if len(text) > _MAX_VALUE_LENGTH:
+        text = text[: _MAX_VALUE_LENGTH - 3] + "..."
+    return text
+
+
+def canonical(value, ignored=None, ignore_order=False):
+    """Return a hashable value equal for the json values equal to value
+
+    Ignored values are left out, with ignore_order the order of lists is too.
+    """
+    if isinstance(value, dict):
+        if ignored:
+            items = [
+                (key, canonical(item, ignored.get(key), ignore_order))
+                for key, item in value.items()
+                if ignored.get(key) is not IGNORED
+            ]
+        else:
+            items = [
+                (
+                    (key, item)
+                    if type(item) in _PLAIN_SCALARS
+                    else (key, canonical(item, None, ignore_order))
+                )
+                for key, item in value.items()
+            ]
+        return dict, frozenset(items)
+    if isinstance(value, (list, tuple)):
+        if ignored:
+            items = [
+                canonical(item, ignored.get(position), ignore_order)
+                for position, item in enumerate(value)
+                if ignored.get(position) is not IGNORED
+            ]
+        else:
+            items = [
+                (
+                    item
+                    if type(item) in _PLAIN_SCALARS
+                    else canonical(item, None, ignore_order)
+                )
+                for item in value
+            ]
+        if not ignore_order:
+            return list, tuple(items)
+        distinct = frozenset(items)
+        if len(distinct) == len(items):
+            return list, distinct
+        return Counter, frozenset(Counter(items).items())
+    if type(value) is bool:
+        return bool, value
+    return value
+
+
+class _Comparison:
+    def __init__(self, ignore_order, limit):
+        self.ignore_order = ignore_order
+        self.limit = limit
+        self.differences = []
+        # keys from the root to the compared values
+        self.keys = []
+
+    def add(self, difference, key=None):
+        if key is not None:
+            self.keys.append(key)
+        self.differences.append(f"{to_json_path(self.keys)}: {difference}")
+        if key is not None:
+            self.keys.pop()
+        if self.limit is not None and len(self.differences) >= self.limit:
+            raise _Enough
+
+    def changed(self, expected, actual, key=None):
+        self.add(f"expected {_format(expected)} but got {_format(actual)}", key)
+
+    def compare(self, expected, actual, expected_ignored, actual_ignored):
+        # python's equality is not used on containers, it finds true equal to 1
+        if expected is actual:
+            return
+        if isinstance(expected, dict) and isinstance(actual, dict):
+            self.compare_dicts(expected, actual, expected_ignored, actual_ignored)
+        elif isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+            if self.ignore_order:
+                self.compare_unordered(
+                    expected, actual, expected_ignored, actual_ignored
+                )
+            else:
+                self.compare_lists(expected, actual, expected_ignored, actual_ignored)
+        elif not _equal(expected, actual):
+            self.changed(expected, actual)
+
+    def compare_item(self, key, expected, actual, expected_ignored, actual_ignored):
+        if isinstance(expected, _CONTAINERS) or isinstance(actual, _CONTAINERS):
+            self.keys.append(key)
+            self.compare(expected, actual, expected_ignored, actual_ignored)
+            self.keys.pop()
+        elif not _equal(expected, actual):
+            self.changed(expected, actual, key)
+
+    def compare_dicts(self, expected, actual, expected_ignored, actual_ignored):
+        found = 0
+        for key, value in expected.items():
+            other = actual.get(key, _MISSING)
+            if other is not _MISSING:
+                found += 1
+            if expected_ignored or actual_ignored:
+                expected_child = expected_ignored.get(key) if expected_ignored else None
+                actual_child = actual_ignored.get(key) if actual_ignored else None
+                if expected_child is IGNORED or actual_child is IGNORED:
+                    continue
+            else:
+                expected_child = actual_child = None
+            if other is value:
+                continue
+            if other is _MISSING:
+                self.add(f"missing, expected {_format(value)}", key)
+            elif type(value) in _SCALARS and type(other) in _SCALARS:
+                if not _equal(value, other):
+                    self.changed(value, other, key)
+            else:
+                self.compare_item(key, value, other, expected_child, actual_child)
+        if found == len(actual):
+            return
+        for key, value in actual.items():
+            if key in expected:
+                continue
+            expected_child = expected_ignored.get(key) if expected_ignored else None
+            actual_child = actual_ignored.get(key) if actual_ignored else None
+            if expected_child is not IGNORED and actual_child is not IGNORED:
+                self.add(f"unexpected {_format(value)}", key)
+
+    def compare_lists(self, expected, actual, expected_ignored, actual_ignored):
+        expected_child = actual_child = None
+        for position, (value, other) in enumerate(zip(expected, actual)):
+            if expected_ignored or actual_ignored:
+                expected_child = (
+                    expected_ignored.get(position) if expected_ignored else None
+                )
+                actual_child = actual_ignored.get(position) if actual_ignored else None
+                if expected_child is IGNORED or actual_child is IGNORED:
+                    continue
+            if other is value:
+                continue
+            if type(value) in _SCALARS and type(other) in _SCALARS:
+                if not _equal(value, other):
+                    self.changed(value, other, position)
+            else:
+                self.compare_item(position, value, other, expected_child, actual_child)
+        common = min(len(expected), len(actual))
+        for position in range(common, max(len(expected), len(actual))):
+            expected_child = (
+                expected_ignored.get(position) if expected_ignored else None
+            )
+            actual_child = actual_ignored.get(position) if actual_ignored else None
+            if expected_child is IGNORED or actual_child is IGNORED:
+                continue
+            if position < len(expected):
+                self.add(f"missing, expected {_format(expected[position])}", position)
+            else:
+                self.add(f"unexpected {_format(actual[position])}", position)
+
+    def compare_unordered(self, expected, actual, expected_ignored, actual_ignored):
+        # positions of the expected items by their canonical value, the last
+        # position first so that the first one is matched first
+        positions = {}
+        for position in range(len(expected) - 1, -1, -1):
+            child = expected_ignored.get(position) if expected_ignored else None
+            if child is not IGNORED:
+                key = canonical(expected[position], child, True)
+                positions.setdefault(key, []).append(position)
+        for position, value in enumerate(actual):
+            child = actual_ignored.get(position) if actual_ignored else None
+            if child is IGNORED:
+                continue
+            matching = positions.get(canonical(value, child, True))
+            if matching:
+                matching.pop()
+            else:
+                self.add(f"unexpected {_format(value)}", position)
+        for position in sorted(
+            position for matching in positions.values() for position in matching
+        ):
+            self.add(f"missing, expected {_format(expected[position])}", position)
+
+
+def compare(
+    expected,
+    actual,
+    expected_ignored=None,
+    actual_ignored=None,
+    ignore_order=False,
+    max_differences=None,
+):
+    """Return the first max_differences differences of actual from expected, and
+    whether there are more
+
+    Both values are traversed once, the traversal stops once max_differences is
+    exceeded, so ``max_differences=0`` only checks whether they are equal. Values
+    in the ignore trees of ignore_tree are not compared. With ignore_order the
+    items of lists are matched by their canonical value, in any order.
+    """
+    if expected_ignored is IGNORED or actual_ignored is IGNORED:
+        return [], False
+    limit = None if max_differences is None else max_differences + 1
+    comparison = _Comparison(ignore_order, limit)
+    try:
+        comparison.compare(expected, actual, expected_ignored, actual_ignored)
+    except _Enough:
+        pass
+    differences = comparison.differences
+    if max_differences is None:
+        return differences, False
+    return differences[:max_differences], len(differences) > max_differences
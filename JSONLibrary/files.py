@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import shutil
+from contextlib import contextmanager
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:  # pragma: no cover - optional dependency
+        zstd = None
+
+GZIP = "gzip"
+BZIP2 = "bz2"
+XZ = "xz"
+ZSTD = "zstd"
+
+_MAGIC_NUMBERS = (
+    (b"\x1f\x8b", GZIP),
+    (b"BZh", BZIP2),
+    (b"\xfd7zXZ\x00", XZ),
+    (b"\x28\xb5\x2f\xfd", ZSTD),
+)
+_EXTENSIONS = {".gz": GZIP, ".bz2": BZIP2, ".xz": XZ, ".zst": ZSTD}
+
+
+def detect_compression(binary_file, file_name):
+    """Return the compression of binary_file, None if it is not compressed
+
+    The compression is found by the magic number starting the file, or else by
+    the extension of file_name. Nothing is consumed from binary_file.
+    """
+    head = binary_file.peek(6)[:6]
+    for magic_number, compression in _MAGIC_NUMBERS:
+        if head.startswith(magic_number):
+            return compression
+    return _EXTENSIONS.get(os.path.splitext(os.fspath(file_name))[1].lower())
+
+
+def _decompress(binary_file, compression):
+    if compression == GZIP:
+        return gzip.GzipFile(fileobj=binary_file, mode="rb")
+    if compression == BZIP2:
+        return bz2.BZ2File(binary_file, mode="rb")
+    if compression == XZ:
+        return lzma.LZMAFile(binary_file, mode="rb")
+    if zstd is None:
+        raise IOError("Reading zstd compressed files requires the zstandard package")
+    return zstd.open(binary_file, mode="rb")
+
+
+@contextmanager
+def open_input(file_name):
+    """Open file_name to read bytes, decompressed while they are read"""
+    raw_file = open(file_name, "rb")
+    try:
+        compression = detect_compression(raw_file, file_name)
+        if compression is None:
+            binary_file = raw_file
+        else:
+            binary_file = _decompress(raw_file, compression)
+        try:
+            yield binary_file
+        finally:
+            binary_file.close()
+    finally:
+        raw_file.close()
+
+
+@contextmanager
+def open_mapped_input(file_name):
+    """Map file_name into memory, return a read-only view of its bytes
+
+    Return None instead when the file is compressed or empty, which cannot be mapped.
+    """
+    with open(file_name, "rb") as raw_file:
+        if (
+            detect_compression(raw_file, file_name) is not None
+            or os.fstat(raw_file.fileno()).st_size == 0
+        ):
+            yield None
+            return
+        with mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                yield view
+
+
+@contextmanager
+def open_text_input(file_name, encoding=None):
+    """Open file_name to read text, decompressed while it is read"""
+    with open_input(file_name) as binary_file:
+        text_file = io.TextIOWrapper(binary_file, encoding=encoding)
+        try:
+            yield text_file
+        finally:
+            # the binary file is closed by open_input
+            text_file.detach()
+
+
+def _keeps_identity(file_name):
+    """Return whether replacing the existing file_name by a new file keeps its
+    hard links and owner"""
+    stat = os.stat(file_name)
+    if stat.st_nlink > 1:
+        return False
+    if hasattr(os, "geteuid"):
+        return stat.st_uid == os.geteuid() and stat.st_gid == os.getegid()
+    return True
+
+
+@contextmanager
+def open_text_output(
+    file_name, encoding=None, append=False, atomic=False, compress=False
+):
+    """Open file_name to write text, return the text file
+
+    Unless appending, the text is written to a temporary file next to the file
+    file_name links to, which replaces that file only once everything was written,
+    so a failure leaves file_name as it was and readers never see a partial file.
+    When replacing the file would lose its hard links or its owner, the written
+    text is copied into it instead. With atomic the temporary file is also synced
+    to disk and always replaces the file, so the file is complete even after a
+    crash of the machine. With compress the text is written gzipped.
+    """
+    file_name = os.fspath(file_name)
+    if append:
+        target = file_name
+    else:
+        # symbolic links are written through, like when opening file_name
+        real_name = os.path.realpath(file_name)
+        directory, base_name = os.path.split(real_name)
+        target = os.path.join(directory, f".{base_name}.{os.urandom(4).hex()}.tmp")
+    raw_file = open(target, "ab" if append else "xb")
+    try:
+        binary_file = raw_file
+        if compress:
+            binary_file = gzip.GzipFile(filename=file_name, mode="wb", fileobj=raw_file)
+        text_file = io.TextIOWrapper(binary_file, encoding=encoding)
+        yield text_file
+        # closing the text file would close the raw file before it is synced
+        text_file.detach()
+        if compress:
+            binary_file.close()
+        if atomic:
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+    except BaseException:
+        raw_file.close()
+        if not append:
+            os.remove(target)
+        raise
+    raw_file.close()
+    if append:
+        return
+    if not os.path.exists(real_name):
+        os.replace(target, real_name)
+    elif atomic or _keeps_identity(real_name):
+        shutil.copymode(real_name, target)
+        os.replace(target, real_name)
+    else:
+        try:
+            shutil.copyfile(target, real_name)
+        finally:
+            os.remove(target)
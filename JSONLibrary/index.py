@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from jsonpath_ng import Descendants, Fields, Root
+from .simplepath import (
+    NotSimple,
+    SimpleMatch,
+    SimplePath,
+    apply_segment,
+    flatten,
+    to_segment,
+)
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# values jsonpath_ng neither matches a field on nor descends into
+_LEAF_TYPES = (tuple, str, int, float, type(None))
+
+
+def indexed_query(json_path_expr):
+    """Return the (name, segments) pair of a ``$..name`` path, or None
+
+    The descendant field may be followed by fields, ``*``, indexes and slices, e.g.
+    ``$..address.city``, which are evaluated on the indexed matches.
+    """
+    if isinstance(json_path_expr, SimplePath):
+        return None
+    # ``$..a.b`` is parsed as Descendants(Root, a.b) and ``$..a[0]`` as
+    # Child(Descendants(Root, a), [0]), both find the same matches in the same order
+    steps = flatten(json_path_expr)
+    first = steps[0]
+    if not isinstance(first, Descendants) or not isinstance(first.left, Root):
+        return None
+    steps = flatten(first.right) + steps[1:]
+    name = steps[0]
+    if not (
+        isinstance(name, Fields) and len(name.fields) == 1 and name.fields[0] != "*"
+    ):
+        return None
+    segments = [to_segment(step) for step in steps[1:]]
+    if any(segment is None for segment in segments):
+        return None
+    return name.fields[0], segments
+
+
+class JsonIndex:
+    """Locations of every dictionary key of a json object
+
+    The matches of a key are kept in the order jsonpath_ng finds them for
+    ``$..key``: a dictionary before its descendants, children in order.
+    """
+
+    def __init__(self, json_object):
+        self.json_object = json_object
+        self.locations = {}
+        # False when a value of another type could have a field, like a mapping
+        self.complete = True
+        self._build(SimpleMatch(json_object, None, None))
+
+    def _build(self, root_match):
+        locations = self.locations
+        pending = [root_match]
+        while pending:
+            match = pending.pop()
+            value = match.value
+            if isinstance(value, dict):
+                children = [
+                    SimpleMatch(item, key, match) for key, item in value.items()
+                ]
+                for child in children:
+                    locations.setdefault(child.key, []).append(child)
+            elif isinstance(value, list):
+                children = [SimpleMatch(item, i, match) for i, item in enumerate(value)]
+            else:
+                if not isinstance(value, _LEAF_TYPES):
+                    self.complete = False
+                continue
+            pending.extend(reversed(children))
+
+    def find(self, json_path_expr):
+        """Return the matches of json_path_expr, or None if it cannot use the index"""
+        query = indexed_query(json_path_expr)
+        if query is None or not self.complete:
+            return None
+        name, segments = query
+        matches = list(self.locations.get(name, ()))
+        try:
+            for segment in segments:
+                matches = apply_segment(segment, matches)
+        except NotSimple:
+            return None
+        return matches
+
+    def __len__(self):
+        return sum(len(matches) for matches in self.locations.values())
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+import tracemalloc
+from contextlib import nullcontext
+from time import perf_counter
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+OFF = "off"
+TIME = "time"
+MEMORY = "memory"
+INSTRUMENTATION_MODES = (OFF, TIME, MEMORY)
+
+PARSE = "parse"
+COPY = "copy"
+FIND = "find"
+MUTATE = "mutate"
+SERIALIZE = "serialize"
+DESERIALIZE = "deserialize"
+VALIDATE = "validate"
+COMPARE = "compare"
+
+_NO_PHASE = nullcontext()
+
+
+class _Timing:
+    __slots__ = ("calls", "total", "min", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def info(self):
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls if self.calls else 0.0,
+            "min": self.min or 0.0,
+            "max": self.max,
+        }
+
+
+class _KeywordStatistics(_Timing):
+    __slots__ = ("peak_memory", "phases")
+
+    def __init__(self):
+        super().__init__()
+        self.peak_memory = None
+        self.phases = {}
+
+    def info(self):
+        info = super().info()
+        if self.peak_memory is not None:
+            info["peak_memory"] = self.peak_memory
+        info["phases"] = {name: phase.info() for name, phase in self.phases.items()}
+        return info
+
+
+class _Phase:
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.add_phase(self.name, perf_counter() - self.start)
+
+
+class _RunningKeyword:
+    __slots__ = ("name", "statistics", "start", "traced_memory", "started_tracing")
+
+    def __init__(self, name, statistics):
+        self.name = name
+        self.statistics = statistics
+        self.start = None
+        # memory traced when the keyword started, None when it is not traced
+        self.traced_memory = None
+        self.started_tracing = False
+
+
+class Instrumentation:
+    """Timings of the keywords of a library and of the phases of their work
+
+    Also a library listener: Robot Framework reports the start and end of every
+    keyword to it, the keywords of ``keyword_names`` are timed. Disabled, each
+    phase and listener call only checks the mode.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, keyword_names=(), mode=OFF):
+        self.keyword_names = {self._normalize(name) for name in keyword_names}
+        self.mode = mode
+        self.keywords = {}
+        self.phases = {}
+        self._running = []
+
+    @staticmethod
+    def _normalize(name):
+        return name.lower().replace(" ", "").replace("_", "")
+
+    def phase(self, name):
+        """Return a context manager timing the phase name of the running keyword"""
+        if self.mode == OFF:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def add_phase(self, name, seconds):
+        timing = self.phases.get(name)
+        if timing is None:
+            timing = self.phases[name] = _Timing()
+        timing.add(seconds)
+        if self._running:
+            phases = self._running[-1].statistics.phases
+            timing = phases.get(name)
+            if timing is None:
+                timing = phases[name] = _Timing()
+            timing.add(seconds)
+
+    def start_keyword(self, name, attributes):
+        if self.mode == OFF:
+            return
+        keyword_name = attributes.get("kwname", name)
+        if self._normalize(keyword_name) not in self.keyword_names:
+            return
+        statistics = self.keywords.get(keyword_name)
+        if statistics is None:
+            statistics = self.keywords[keyword_name] = _KeywordStatistics()
+        running = _RunningKeyword(keyword_name, statistics)
+        if self.mode == MEMORY:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                running.started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            running.traced_memory = tracemalloc.get_traced_memory()[0]
+        self._running.append(running)
+        running.start = perf_counter()
+
+    def end_keyword(self, name, attributes):
+        if not self._running:
+            return
+        keyword_name = attributes.get("kwname", name)
+        if self._running[-1].name != keyword_name:
+            return
+        running = self._running.pop()
+        seconds = perf_counter() - running.start
+        statistics = running.statistics
+        statistics.add(seconds)
+        if running.traced_memory is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1] - running.traced_memory
+            if running.started_tracing:
+                tracemalloc.stop()
+            statistics.peak_memory = max(statistics.peak_memory or 0, peak)
+
+    def statistics(self):
+        """Return the statistics of every keyword and phase as a dictionary"""
+        return {
+            "mode": self.mode,
+            "keywords": {
+                name: statistics.info() for name, statistics in self.keywords.items()
+            },
+            "phases": {name: timing.info() for name, timing in self.phases.items()},
+        }
+
+    def clear(self):
+        self.keywords.clear()
+        self.phases.clear()
+
+
+def format_statistics(statistics):
+    """Return the statistics as a text table, the slowest keywords first"""
+    lines = [
+        f"{'Keyword':<40} {'Calls':>8} {'Total s':>10} {'Mean ms':>10} "
+        f"{'Max ms':>10} {'Peak MB':>9}  Phases (total s)"
+    ]
+    keywords = sorted(
+        statistics["keywords"].items(), key=lambda item: item[1]["total"], reverse=True
+    )
+    for name, info in keywords:
+        peak = info.get("peak_memory")
+        peak = "" if peak is None else f"{peak / 2**20:.1f}"
+        phases = ", ".join(
+            f"{phase} {timing['total']:.3f}"
+            for phase, timing in sorted(
+                info["phases"].items(), key=lambda item: item[1]["total"], reverse=True
+            )
+        )
+        lines.append(
+            f"{name:<40} {info['calls']:>8} {info['total']:>10.3f} "
+            f"{info['mean'] * 1000:>10.3f} {info['max'] * 1000:>10.3f} "
+            f"{peak:>9}  {phases}"
+        )
+    for phase, info in sorted(
+        statistics["phases"].items(), key=lambda item: item[1]["total"], reverse=True
+    ):
+        lines.append(
+            f"{'Phase ' + phase:<40} {info['calls']:>8} {info['total']:>10.3f} "
+            f"{info['mean'] * 1000:>10.3f} {info['max'] * 1000:>10.3f}"
+        )
+    return "\n".join(lines)
@@ -1,18 +1,119 @@
 # -*- coding: utf-8 -*-
-import io
+import glob
+import inspect
 import json
 import os.path
-import jsonschema
+import pickle
+from contextlib import closing
 from copy import deepcopy
+from functools import update_wrapper
+from itertools import islice
 from robot.api import logger
 from robot.utils.asserts import fail
-from jsonpath_ng import Index, Fields
-from jsonpath_ng.ext import parse as parse_ng
 from jsonpath_ng.exceptions import JsonPathParserError
+from .backends import JSON, COMPACT_SEPARATORS, get_json_backend, iter_encode
+from .bulk import EXECUTORS, THREAD, load_files, validate_items
+from .columns import (
+    aggregate as aggregate_column,
+    extract_columns,
+    first_different,
+    first_duplicate,
+    first_unsorted,
+    get_records,
+)
+from .compare import compare, ignore_tree
+from .index import JsonIndex
+from .instrumentation import (
+    COMPARE,
+    COPY,
+    DESERIALIZE,
+    FIND,
+    INSTRUMENTATION_MODES,
+    MUTATE,
+    OFF,
+    PARSE,
+    SERIALIZE,
+    VALIDATE,
+    Instrumentation,
+    format_statistics,
+)
+from .files import open_input, open_mapped_input, open_text_input, open_text_output
+from .cache import LRUCache, SizedLRUCache, parse_size
+from .lazypath import iter_find
+from .parser import parse as parse_ng
+from .jsonlines import iter_matching_records, iter_records, iter_values
+from .mutation import (
+    DEEPCOPY,
+    INPLACE,
+    JSON_PATCH_OPERATIONS,
+    MUTATION_MODES,
+    JsonPointerError,
+    is_json_pointer,
+    make_document,
+    match_keys,
+    parse_json_pointer,
+)
+from .schema import (
+    format_schema_path,
+    iter_errors as iter_schema_errors,
+    load_schema_file,
+    reference_errors,
+    schema_file_cache,
+    schema_registry,
+    validate as validate_by_schema,
+    validator_cache,
+)
+from .simplepath import SimplePath, compile_simple_path, find_many, to_json_path
+from .streaming import (
+    JSONStreamError,
+    StreamingPath,
+    ijson,
+    iter_events,
+    iter_ijson_events,
+)
 
 __author__ = "Traitanit Huangsri"
 __email__ = "traitanit.hua@gmail.com"
 
+# compiled JSONPath expressions, shared by every library instance in the process
+_path_cache = LRUCache()
+# pickled json objects of loaded files, opt-in with the file_cache_size argument
+_file_cache = SizedLRUCache()
+# library instances with the default settings, by class
+_default_libraries = {}
+
+
+class _class_callable:
+    """Keyword using the settings of the library, also callable on the class
+
+    These keywords were static methods, called on the class they use a library
+    created with the default arguments, e.g. the ``json`` backend.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        update_wrapper(self, function)
+
+    def __get__(self, instance, owner=None):
+        if instance is not None:
+            return self.function.__get__(instance, owner)
+        function = self.function
+
+        def call(*args, **kwargs):
+            library = _default_libraries.get(owner)
+            if library is None:
+                library = _default_libraries[owner] = owner()
+            return function(library, *args, **kwargs)
+
+        call.__name__ = function.__name__
+        call.__qualname__ = function.__qualname__
+        call.__doc__ = function.__doc__
+        signature = inspect.signature(function)
+        call.__signature__ = signature.replace(
+            parameters=list(signature.parameters.values())[1:]
+        )
+        return call
+
 
 class JSONLibrary:
     """JSONLibrary is a robotframework testlibrary for manipulating JSON object (dictionary)
@@ -56,6 +157,180 @@ class JSONLibrary:
     | ${value}=            |  Get Value From Json  |  ${json_object}  |  $..country  |
     | Should Be Equal As Strings  |  ${value[0]}   | Thailand  |
 
+    == JSONPath cache ==
+    Parsing a JSONPath expression is much more expensive than evaluating it. Compiled
+    expressions are therefore kept in a process-wide least recently used cache keyed by
+    the expression string. The size of the cache is set with the ``path_cache_size``
+    library import argument and its statistics are returned by `Get Jsonpath Cache Info`.
+
+    Expressions made only of the root, field names, ``*``, integer indexes and slices
+    (e.g. ``$.data.items[0].id``) are evaluated by walking the dictionaries and lists
+    directly. Everything else is evaluated by jsonpath_ng. Both give the same results,
+    the evaluator used is written to the debug log.
+
+    == Streaming JSON files ==
+    `Get Value From Json File`, `Should Have Value In Json File`,
+    `Should Not Have Value In Json File` and `Count Values In Json File` evaluate a
+    JSONPath while the file is parsed, so only the matched values are kept in memory
+    instead of the whole document. Field names, ``*``, indexes, slices and ``..name``
+    are followed while parsing. Other steps (e.g. filters) are evaluated on the value
+    they apply to once it is built. Paths going back up the document, like the
+    ``parent`` operator, need the whole document.
+
+    The file is parsed with [https://pypi.org/project/ijson|ijson] when it is
+    installed and the file is UTF-8, with a pure Python parser otherwise, or when
+    ijson rejects the file: ``NaN``, ``Infinity`` and numbers out of the float
+    range are accepted like `Load Json From File` accepts them. Like it, the
+    keywords reading the whole file fail on data after the root value, while
+    `Should Have Value In Json File` and `Should Not Have Value In Json File` stop
+    reading at the first match.
+
+    == Compressed files ==
+    Every keyword reading a JSON, JSON Lines or schema file also reads it compressed
+    with gzip, bzip2, xz or, when [https://pypi.org/project/zstandard|zstandard] is
+    installed, zstd. The compression is recognized by the first bytes of the file, or
+    by its ``.gz``, ``.bz2``, ``.xz`` or ``.zst`` extension. The file is decompressed
+    while it is parsed, no temporary file is written. ``encoding`` is the encoding of
+    the decompressed text.
+
+    == JSON Lines files ==
+    `Load Json Lines From File`, `Get Value From Json Lines File`,
+    `Count Values In Json Lines File`, `Should Have Value In Json Lines File` and
+    `Should Not Have Value In Json Lines File` read JSON Lines (NDJSON) files, one
+    JSON record per line. The file is read one line at a time and the JSONPath is
+    evaluated on each record, so only the returned records or values are kept in
+    memory. Records are appended to a JSON Lines file with `Dump Json To File` and
+    ``json_lines=${True}``.
+
+    == Schema cache ==
+    Checking a schema against its meta schema and building its validator is often
+    more expensive than validating a json object. `Validate Json By Schema` and
+    `Validate Json By Schema File` therefore keep the validators of the schemas they
+    were given in a process-wide least recently used cache, keyed by the content of
+    the schema. `Validate Json By Schema File` also keeps the schema files it parsed,
+    a file is parsed again only once its modification time or size changed. A schema
+    file without ``$id`` is given the URI of the file, see `Schema references`, so
+    its validator is not shared with the same schema given as a dictionary. The size
+    of both caches is set with the ``schema_cache_size`` library import argument.
+    See `Get Json Schema Cache Info` and `Clear Json Schema Cache`.
+
+    == File cache ==
+    Fixtures loaded by many tests with `Load Json From File` are parsed once when the
+    file cache is enabled with the ``file_cache_size`` library import argument, a
+    memory budget like ``64MB``. The cache is shared by every library instance in the
+    process and keyed by the absolute path, modification time, size and encoding of
+    the file and by the `JSON backends` parsing it, so a changed file is parsed again. Each call still returns a new
+    independent json object, changing it never affects other tests. The least
+    recently used files are evicted once the budget is exceeded. See
+    `Get Json File Cache Info` and `Clear Json File Cache`.
+
+    == Schema references ==
+    ``$ref`` is resolved from local files only, remote schemas are never fetched.
+    A schema file without ``$id`` gets the URI of the file, so a relative reference
+    like ``address.json#/definitions/city`` resolves to the file next to it. Schemas
+    referenced by the URI they declare, e.g. ``https://example.com/address.json``,
+    are found once their directory is registered with
+    `Register Json Schema Directory`. Referencing any other URI fails.
+
+    == JSON backends ==
+    `Load Json From File`, `Convert String To Json`, `Convert Json To String` and
+    `Dump Json To File` use the python ``json`` module by default. The faster
+    [https://pypi.org/project/orjson|orjson] is used instead when it is selected with
+    the ``json_backend`` library import argument or `Set Json Backend`:
+
+    | Backend | Description |
+    | json | Default. The python ``json`` module. |
+    | orjson | orjson, which must be installed. |
+    | auto | orjson when it is installed, the python ``json`` module otherwise. |
+
+    Every backend returns the same json objects and strings and fails with the same
+    error messages as the ``json`` module. Strings are written by orjson only when it
+    gives the very same output, i.e. for ``indent=${2}`` and compact JSON Lines
+    records. Other formats are always written by the ``json`` module. orjson differs
+    in two corner cases: integers exceeding 64 bits are parsed as floats, and values
+    the ``json`` module cannot serialize, like UUIDs, are serialized by orjson.
+
+    == JSON index ==
+    Recursive descent paths like ``$..id`` walk the whole json object on every call.
+    When many of them are evaluated on the same large json object, `Index Json`
+    records where every key is once, and these paths are then answered from the
+    index. Up to 8 indexes are kept, each one keeps its json object in memory until
+    it is evicted or removed with `Clear Json Index`.
+
+    Changing any json object with ``inplace=${True}`` removes every index, since
+    the changed json object may be a part of an indexed one. Other
+    mutation keywords return a changed copy and never change the indexed json
+    object. Changes made by other means, e.g. ``Set To Dictionary``, are not seen by
+    the index, call `Index Json` again after them.
+
+    == Columns ==
+    Checking one field of every item of a large list, e.g. the price of 100000
+    items, with `Get Value From Json` and a FOR loop creates a match per item and
+    runs keywords per item. `Get Json Column` and `Get Json Columns` extract fields
+    of a list of objects straight into columns: integers into an ``array('q')``,
+    numbers into an ``array('d')`` and other values into a list, or into NumPy
+    arrays with ``numpy=${True}`` when [https://numpy.org|NumPy] is installed.
+    `Aggregate Json Column`, `Json Column Should Be Sorted`,
+    `Json Column Values Should Be Equal` and `Json Column Values Should Be Unique`
+    then check a whole column in one keyword. They accept any list, e.g. the values
+    returned by `Get Value From Json`.
+
+    == Comparing json ==
+    `Compare Json` and `Json Should Be Equal` compare two json objects in one
+    traversal and address each difference by its JSONPath, e.g.
+    ``$.items[3].price: expected 10 but got 12``. Only the first differences are
+    reported, the traversal stops once they are found. Values matched by the
+    JSONPaths of ``ignore_paths`` are not compared, e.g. ``$..timestamp``. With
+    ``ignore_order=${True}`` the items of lists are matched by their value in any
+    order, each item is hashed once so large lists are compared in linear time.
+    Numbers are compared like python compares them, e.g. ``1`` is equal to ``1.0``,
+    but ``true`` and ``false`` are only equal to themselves, never to ``1`` or ``0``.
+
+    == Instrumentation ==
+    To find where the time of a slow suite goes, the library records how long each
+    of its keywords takes and how long each phase of their work takes, once it is
+    enabled with the ``instrumentation`` library import argument or
+    `Set Json Instrumentation`:
+
+    | Mode | Description |
+    | off | Default. Nothing is recorded. |
+    | time | The calls and durations of the keywords and of their phases are recorded. |
+    | memory | Also the peak memory allocated by each keyword, traced with [https://docs.python.org/3/library/tracemalloc.html|tracemalloc], which makes the keywords much slower. |
+
+    The phases are:
+
+    | Phase | Description |
+    | parse | Parsing a JSONPath expression or getting it from the `JSONPath cache`. |
+    | copy | Copying the json object before it is changed, see `Mutation modes`. |
+    | find | Evaluating a JSONPath expression. |
+    | mutate | Changing the found values. |
+    | serialize | Converting a json object to JSON, including writing the file. |
+    | deserialize | Parsing JSON to a json object, including reading the file. |
+    | validate | Validating a json object by a json schema. |
+    | compare | Comparing two json objects. |
+
+    Keywords are timed by Robot Framework calling the library as a listener, phases
+    are also recorded when the library is used from python. With ``copy-on-write``,
+    dictionaries and lists are copied while the values are found, which is
+    recorded as find. See `Get Json Instrumentation Statistics`,
+    `Log Json Instrumentation Statistics` and `Clear Json Instrumentation Statistics`.
+
+    == Mutation modes ==
+    `Add Object To Json`, `Update Value To Json` and `Delete Object From Json` never change
+    the json object they are given, they return a changed copy. How the copy is made is
+    selected with the ``mutation_mode`` library import argument or keyword argument:
+
+    | Mode | Description |
+    | deepcopy | Default. The whole json object is copied before it is changed. |
+    | copy-on-write | Only dictionaries and lists on the path from the root to each changed value are copied. Every other value is shared between the given and the returned json object, which makes changing large json objects much cheaper. |
+
+    With ``copy-on-write`` the returned json object shares values with the given one, so
+    it must not be changed in place by other means (e.g. ``Set To Dictionary``), the
+    change would be visible in both.
+
+    When the caller owns the json object, e.g. while building a large payload in a
+    setup, these keywords accept ``inplace=${True}``. The given json object is then
+    changed directly and returned, nothing is copied.
 
     """
 
@@ -63,77 +338,779 @@ class JSONLibrary:
     ROBOT_LIBRARY_DOC_FORMAT = "ROBOT"
     ROBOT_EXIT_ON_FAILURE = True
 
+    def __init__(
+        self,
+        path_cache_size=None,
+        mutation_mode=DEEPCOPY,
+        json_backend=JSON,
+        schema_cache_size=None,
+        file_cache_size=None,
+        instrumentation=OFF,
+    ):
+        """Arguments:
+            - path_cache_size: maximum number of compiled JSONPath expressions to keep in the cache, 0 disables the cache. Initially 128
+            - mutation_mode: default `mutation modes` of the keywords changing json objects, ``deepcopy`` or ``copy-on-write``
+            - json_backend: serializer of the keywords loading and dumping JSON, ``json``, ``orjson`` or ``auto``, see `JSON backends`
+            - schema_cache_size: maximum number of validators and of schema files to keep in the `schema cache`, 0 disables the cache. Initially 64
+            - file_cache_size: memory budget of the `file cache` in bytes, or with a unit like ``512KB`` or ``64MB``, 0 disables the cache. Initially 0
+            - instrumentation: ``off``, ``time`` or ``memory``, see `Instrumentation`
+
+        The caches are shared by every library instance in the process, a cache size
+        not given keeps the size set by an earlier import.
+
+        Examples:
+        | Library | JSONLibrary |
+        | Library | JSONLibrary | path_cache_size=1024 |
+        | Library | JSONLibrary | mutation_mode=copy-on-write |
+        | Library | JSONLibrary | json_backend=auto |
+        | Library | JSONLibrary | schema_cache_size=256 |
+        | Library | JSONLibrary | file_cache_size=64MB |
+        | Library | JSONLibrary | instrumentation=time |
+        """
+        if path_cache_size is not None:
+            _path_cache.resize(int(path_cache_size))
+        if schema_cache_size is not None:
+            validator_cache.resize(int(schema_cache_size))
+            schema_file_cache.resize(int(schema_cache_size))
+        if file_cache_size is not None:
+            try:
+                _file_cache.resize(parse_size(file_cache_size))
+            except ValueError as e:
+                fail(str(e))
+        self.mutation_mode = self._check_mutation_mode(mutation_mode)
+        self.json_backend = self._get_json_backend(json_backend)
+        # indexes of json objects by id, each index keeps its json object alive
+        self._json_indexes = LRUCache(maxsize=8)
+        keyword_names = [
+            name
+            for name in dir(type(self))
+            if not name.startswith("_")
+            and "instrumentation" not in name
+            and callable(getattr(type(self), name))
+        ]
+        self._instrumentation = Instrumentation(
+            keyword_names, self._check_instrumentation_mode(instrumentation)
+        )
+        self.ROBOT_LIBRARY_LISTENER = self._instrumentation
+
     @staticmethod
-    def _parse(json_path):
+    def _get_json_backend(json_backend):
         try:
-            return parse_ng(json_path)
-        except JsonPathParserError as e:
+            return get_json_backend(json_backend)
+        except ValueError as e:
+            fail(str(e))
+
+    def set_json_backend(self, json_backend):
+        """Set the serializer of the keywords loading and dumping JSON
+
+        Arguments:
+            - json_backend: ``json``, ``orjson`` or ``auto``, see `JSON backends`
+
+        Return the name of the previous backend
+
+        Examples:
+        | ${previous}=  |  Set Json Backend  | orjson |
+        | Set Json Backend  | ${previous} |
+        """
+        previous = self.json_backend.name
+        self.json_backend = self._get_json_backend(json_backend)
+        logger.debug(f"Use json backend {self.json_backend.name}")
+        return previous
+
+    @staticmethod
+    def _check_instrumentation_mode(mode):
+        if mode not in INSTRUMENTATION_MODES:
             fail(
-                "Parser failed to understand syntax '{}'. error message: "
-                "\n{}\n\nYou may raise an issue on https://github.com/h2non/jsonpath-ng".format(
-                    json_path, e
-                )
+                f"Unsupported instrumentation mode '{mode}', "
+                f"expected one of: {', '.join(INSTRUMENTATION_MODES)}"
+            )
+        return mode
+
+    def set_json_instrumentation(self, mode):
+        """Set what is recorded about the keywords of the library
+
+        Arguments:
+            - mode: ``off``, ``time`` or ``memory``, see `Instrumentation`
+
+        Return the previous mode
+
+        Examples:
+        | ${previous}=  |  Set Json Instrumentation  | time |
+        | Set Json Instrumentation  | ${previous} |
+        """
+        previous = self._instrumentation.mode
+        self._instrumentation.mode = self._check_instrumentation_mode(mode)
+        return previous
+
+    def get_json_instrumentation_statistics(self):
+        """Get the statistics recorded since the library was imported or cleared
+
+        Return dictionary with the ``mode``, and the ``keywords`` and ``phases``
+        dictionaries of keyword names and phase names to their ``calls``, ``total``,
+        ``mean``, ``min`` and ``max`` durations in seconds. Each keyword also has its
+        own ``phases`` and, in ``memory`` mode, its ``peak_memory`` in bytes. See
+        `Instrumentation`.
+
+        Examples:
+        | ${statistics}=  |  Get Json Instrumentation Statistics |
+        | Should Be True | ${statistics}[keywords][Get Value From Json][calls] > 0 |
+        """
+        return self._instrumentation.statistics()
+
+    def log_json_instrumentation_statistics(self, file_name=None):
+        """Log the recorded statistics as a table, the slowest keywords first
+
+        Arguments:
+            - file_name: also write the statistics of `Get Json Instrumentation Statistics` to this file as JSON
+
+        Examples:
+        | Log Json Instrumentation Statistics |
+        | Log Json Instrumentation Statistics  | ${OUTPUT_DIR}${/}jsonlibrary-statistics.json |
+        """
+        statistics = self._instrumentation.statistics()
+        logger.info(format_statistics(statistics))
+        if file_name is not None:
+            with open_text_output(file_name, "utf-8") as statistics_file:
+                json.dump(statistics, statistics_file, indent=2)
+
+    def clear_json_instrumentation_statistics(self):
+        """Remove all recorded statistics
+
+        Examples:
+        |  Clear Json Instrumentation Statistics  |
+        """
+        self._instrumentation.clear()
+
+    @staticmethod
+    def _check_mutation_mode(mutation_mode):
+        if mutation_mode not in MUTATION_MODES:
+            fail(
+                f"Unsupported mutation mode '{mutation_mode}', "
+                f"expected one of: {', '.join(MUTATION_MODES)}"
             )
+        return mutation_mode
+
+    def _make_document(self, json_object, mutation_mode, inplace=False):
+        if inplace:
+            # json_object may be a part of an indexed json object, or contain one,
+            # no index would see the changes
+            self._json_indexes.clear()
+            return make_document(json_object, INPLACE)
+        if mutation_mode is None:
+            mutation_mode = self.mutation_mode
+        mutation_mode = self._check_mutation_mode(mutation_mode)
+        with self._instrumentation.phase(COPY):
+            return make_document(json_object, mutation_mode)
+
+    def _parse(self, json_path):
+        with self._instrumentation.phase(PARSE):
+            return self._parse_json_path(json_path)
+
+    @staticmethod
+    def _parse_json_path(json_path):
+        json_path_expr = _path_cache.get(json_path)
+        if json_path_expr is None:
+            try:
+                json_path_expr = parse_ng(json_path)
+            except JsonPathParserError as e:
+                fail(
+                    "Parser failed to understand syntax '{}'. error message: "
+                    "\n{}\n\nYou may raise an issue on https://github.com/h2non/jsonpath-ng".format(
+                        json_path, e
+                    )
+                )
+            json_path_expr = compile_simple_path(json_path_expr) or json_path_expr
+            _path_cache.put(json_path, json_path_expr)
+        if isinstance(json_path_expr, SimplePath):
+            logger.debug(f"Evaluate {json_path} with the fast path evaluator")
+        else:
+            logger.debug(f"Evaluate {json_path} with jsonpath_ng")
+        return json_path_expr
+
+    @staticmethod
+    def get_jsonpath_cache_info():
+        """Get statistics of the compiled JSONPath expression cache
+
+        Return dictionary with ``hits``, ``misses``, ``size`` and ``maxsize`` of the cache
+
+        Examples:
+        | ${info}=  |  Get Jsonpath Cache Info |
+        | Should Be True | ${info}[hits] > 0 |
+        """
+        return _path_cache.info()
+
+    @staticmethod
+    def clear_jsonpath_cache():
+        """Remove all compiled JSONPath expressions from the cache and reset its statistics
+
+        Examples:
+        |  Clear Jsonpath Cache  |
+        """
+        _path_cache.clear()
+
+    @staticmethod
+    def _check_file_exists(file_name):
+        logger.debug("Check if file exists")
+        if os.path.isfile(file_name) is False:
+            logger.error("JSON file: " + file_name + " not found")
+            raise IOError
+
+    @staticmethod
+    def get_json_schema_cache_info():
+        """Get statistics of the `schema cache`
+
+        Return dictionary with the ``hits``, ``misses``, ``size`` and ``maxsize`` of the
+        ``validators`` and of the ``schema_files`` caches
+
+        Examples:
+        | ${info}=  |  Get Json Schema Cache Info |
+        | Should Be True | ${info}[validators][hits] > 0 |
+        """
+        return {
+            "validators": validator_cache.info(),
+            "schema_files": schema_file_cache.info(),
+        }
+
+    @staticmethod
+    def clear_json_schema_cache():
+        """Remove all validators and schema files from the `schema cache` and reset its statistics
+
+        Examples:
+        |  Clear Json Schema Cache  |
+        """
+        validator_cache.clear()
+        schema_file_cache.clear()
 
     @staticmethod
-    def load_json_from_file(file_name, encoding=None):
+    def get_json_file_cache_info():
+        """Get statistics of the `file cache`
+
+        Return dictionary with ``hits``, ``misses``, ``evictions``, ``size`` (number of
+        files), ``bytes`` and ``maxsize`` (memory budget in bytes) of the cache
+
+        Examples:
+        | ${info}=  |  Get Json File Cache Info |
+        | Should Be True | ${info}[hits] > 0 |
+        """
+        return _file_cache.info()
+
+    @staticmethod
+    def clear_json_file_cache():
+        """Remove all files from the `file cache` and reset its statistics
+
+        Examples:
+        |  Clear Json File Cache  |
+        """
+        _file_cache.clear()
+
+    @staticmethod
+    def register_json_schema_directory(directory, pattern="**/*.json", encoding=None):
+        """Register the schema files of a directory to resolve ``$ref``
+
+        Every schema is loaded once and known by its file URI and by its ``$id``,
+        see `Schema references`.
+
+        Arguments:
+            - directory: directory of the schema files
+            - pattern: glob pattern of the schema files, relative to directory
+            - encoding: encoding of the files
+
+        Return number of registered schema files
+
+        Examples:
+        | Register Json Schema Directory  | ${CURDIR}${/}schemas |
+        | ${count}=  |  Register Json Schema Directory  | ${CURDIR}${/}schemas | pattern=*.schema.json |
+        """
+        if not os.path.isdir(directory):
+            fail(f"Schema directory {directory} not found")
+        count = schema_registry.register_directory(directory, pattern, encoding)
+        logger.debug(f"Registered {count} schemas from {directory}")
+        return count
+
+    @_class_callable
+    def load_json_from_file(self, file_name, encoding=None, memory_map=False):
         """Load JSON from file.
 
         Return json as a dictionary object.
 
+        With ``memory_map=${True}`` the file is mapped into memory and parsed from its
+        bytes. With the ``orjson`` `JSON backends` the mapped bytes are parsed in place,
+        the file is never read into a string, which lowers the peak memory of loading
+        a large file by about its size. The ``json`` backend still copies the bytes.
+        Compressed files and encodings other than UTF-8 are read as usual.
+
         Arguments:
-            - file_name: absolute json file name
+            - file_name: absolute json file name, can be `compressed files`
             - encoding: encoding of the file
+            - memory_map: parse the file mapped into memory
 
         Return json object (list or dictionary)
 
         Examples:
         | ${result}=  |  Load Json From File  | /path/to/file.json |
+        | ${result}=  |  Load Json From File  | /path/to/file.json.gz |
+        | ${result}=  |  Load Json From File  | /path/to/large.json | memory_map=${True} |
         """
-        logger.debug("Check if file exists")
-        if os.path.isfile(file_name) is False:
-            logger.error("JSON file: " + file_name + " not found")
-            raise IOError
-        with io.open(file_name, mode="r", encoding=encoding) as json_file:
-            data = json.load(json_file)
+        self._check_file_exists(file_name)
+        if _file_cache.maxsize <= 0:
+            return self._read_json_file(file_name, encoding, memory_map)
+        stat = os.stat(file_name)
+        # backends may parse the same file differently, e.g. large integers
+        key = (
+            os.path.abspath(file_name),
+            stat.st_mtime_ns,
+            stat.st_size,
+            encoding,
+            self.json_backend.name,
+        )
+        cached = _file_cache.get(key)
+        if cached is not None:
+            # unpickling is faster than parsing and gives an independent copy
+            with self._instrumentation.phase(DESERIALIZE):
+                return pickle.loads(cached)
+        data = self._read_json_file(file_name, encoding, memory_map)
+        _file_cache.put(key, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
         return data
 
-    def add_object_to_json(self, json_object, json_path, object_to_add):
+    def _read_json_file(self, file_name, encoding=None, memory_map=False):
+        with self._instrumentation.phase(DESERIALIZE):
+            return self._parse_json_file(file_name, encoding, memory_map)
+
+    def _parse_json_file(self, file_name, encoding, memory_map):
+        if memory_map and self._is_utf8(encoding):
+            with open_mapped_input(file_name) as buffer:
+                if buffer is not None:
+                    logger.debug(f"Parse {file_name} mapped into memory")
+                    return self.json_backend.loads_buffer(buffer)
+        with open_text_input(file_name, encoding) as json_file:
+            return self.json_backend.loads(json_file.read())
+
+    @staticmethod
+    def _is_utf8(encoding):
+        return (encoding or "utf-8").lower() in ("utf-8", "utf8")
+
+    def load_json_from_files(
+        self, files, pattern="*.json", encoding=None, executor=THREAD, workers=None
+    ):
+        """Load JSON from many files concurrently.
+
+        Arguments:
+            - files: directory of the json files, or list of json file names
+            - pattern: glob pattern of the json files, relative to the directory, ``**`` matches sub directories
+            - encoding: encoding of the files
+            - executor: ``thread``, or ``process`` to parse very large files on every core
+            - workers: maximum number of threads or processes
+
+        Fail listing every missing file before any file is parsed.
+
+        Return dictionary of file name to json object (list or dictionary)
+
+        Examples:
+        | ${fixtures}=  |  Load Json From Files  | ${CURDIR}${/}fixtures |
+        | ${fixtures}=  |  Load Json From Files  | ${CURDIR}${/}fixtures | pattern=**/*.json |
+        | ${files}=  |  Create List  | ${CURDIR}${/}user.json | ${CURDIR}${/}order.json |
+        | ${fixtures}=  |  Load Json From Files  | ${files} | executor=process | workers=${4} |
+        """
+        if executor not in EXECUTORS:
+            fail(
+                f"Unsupported executor '{executor}', "
+                f"expected one of: {', '.join(EXECUTORS)}"
+            )
+        if isinstance(files, str):
+            if not os.path.isdir(files):
+                logger.error("JSON directory: " + files + " not found")
+                raise IOError(f"JSON directory {files} not found")
+            file_names = sorted(
+                name
+                for name in glob.glob(os.path.join(files, pattern), recursive=True)
+                if os.path.isfile(name)
+            )
+        else:
+            file_names = [str(name) for name in files]
+        missing = [name for name in file_names if not os.path.isfile(name)]
+        if missing:
+            for name in missing:
+                logger.error("JSON file: " + name + " not found")
+            raise IOError(f"JSON files not found: {', '.join(missing)}")
+        with self._instrumentation.phase(DESERIALIZE):
+            objects = load_files(
+                file_names,
+                encoding,
+                self.json_backend.loads,
+                executor,
+                int(workers) if workers is not None else None,
+            )
+        return dict(zip(file_names, objects))
+
+    def _iter_json_file_values(
+        self, file_name, json_path, encoding=None, ordered=True, materialize=True
+    ):
+        self._check_file_exists(file_name)
+        json_path_expr = self._parse(json_path)
+        streaming_path = StreamingPath(
+            json_path, getattr(json_path_expr, "json_path_expr", json_path_expr)
+        )
+        yielded = 0
+        if ijson is not None and self._is_utf8(encoding):
+            logger.debug(f"Stream {file_name} with ijson")
+            try:
+                with open_input(file_name) as json_file:
+                    for value in streaming_path.iter_values(
+                        iter_ijson_events(json_file), ordered, materialize
+                    ):
+                        yield value
+                        yielded += 1
+                return
+            except JSONStreamError as e:
+                # ijson rejects NaN, Infinity and numbers out of the float range,
+                # which json.load accepts, the pure Python parser decides
+                logger.debug(f"ijson failed to parse {file_name}: {e}")
+        logger.debug(f"Stream {file_name} with the pure Python parser")
+        with open_text_input(file_name, encoding) as json_file:
+            # the values ijson yielded are not yielded again
+            yield from islice(
+                streaming_path.iter_values(
+                    iter_events(json_file), ordered, materialize
+                ),
+                yielded,
+                None,
+            )
+
+    def get_value_from_json_file(
+        self, file_name, json_path, fail_on_empty=False, encoding=None
+    ):
+        """Get Value From JSON file using JSONPath, without loading the whole file
+
+        The file is parsed incrementally, see `Streaming JSON files`.
+
+        Arguments:
+            - file_name: absolute json file name
+            - json_path: jsonpath expression
+            - fail_on_empty: fail the testcases if nothing is returned
+            - encoding: encoding of the file
+
+        Return array of values
+
+        Examples:
+        | ${values}=  |  Get Value From Json File  | /path/to/file.json |  $..phone_number |
+        | ${values}=  |  Get Value From Json File  | /path/to/file.json |  $..missing | fail_on_empty=${True} |
+        """
+        values = list(self._iter_json_file_values(file_name, json_path, encoding))
+        if fail_on_empty is True and len(values) == 0:
+            fail(
+                f"Get Value From Json File keyword failed to find a value for {json_path}"
+            )
+        return values
+
+    def count_values_in_json_file(self, file_name, json_path, encoding=None):
+        """Count the values matched by JSONPath in a JSON file, without loading the whole file
+
+        Matched values are skipped rather than built, see `Streaming JSON files`.
+
+        Arguments:
+            - file_name: absolute json file name
+            - json_path: jsonpath expression
+            - encoding: encoding of the file
+
+        Return number of values
+
+        Examples:
+        | ${count}=  |  Count Values In Json File  | /path/to/file.json |  $.items[*] |
+        """
+        values = self._iter_json_file_values(
+            file_name, json_path, encoding, ordered=False, materialize=False
+        )
+        return sum(1 for _ in values)
+
+    def _json_file_has_value(self, file_name, json_path, encoding):
+        values = self._iter_json_file_values(
+            file_name, json_path, encoding, ordered=False
+        )
+        with closing(values):
+            for value in values:
+                return True, value
+        return False, None
+
+    def should_have_value_in_json_file(self, file_name, json_path, encoding=None):
+        """Should Have Value In JSON file using JSONPath, without loading the whole file
+
+        Parsing stops at the first match, see `Streaming JSON files`.
+
+        Arguments:
+            - file_name: absolute json file name
+            - json_path: jsonpath expression
+            - encoding: encoding of the file
+
+        Fail if no value is found
+
+        Examples:
+        |  Should Have Value In Json File  | /path/to/file.json |  $..id_card_number |
+        """
+        found, _ = self._json_file_has_value(file_name, json_path, encoding)
+        if not found:
+            fail(f"No value found for path {json_path}")
+
+    def should_not_have_value_in_json_file(self, file_name, json_path, encoding=None):
+        """Should Not Have Value In JSON file using JSONPath, without loading the whole file
+
+        Parsing stops at the first match, see `Streaming JSON files`.
+
+        Arguments:
+            - file_name: absolute json file name
+            - json_path: jsonpath expression
+            - encoding: encoding of the file
+
+        Fail if at least one value is found
+
+        Examples:
+        |  Should Not Have Value In Json File  | /path/to/file.json |  $..id_card_number |
+        """
+        found, value = self._json_file_has_value(file_name, json_path, encoding)
+        if found:
+            fail(f"Match found for parent {json_path}: {value}")
+
+    def _iter_json_lines(self, file_name, encoding=None):
+        self._check_file_exists(file_name)
+        return self._read_json_lines(file_name, encoding)
+
+    def _read_json_lines(self, file_name, encoding):
+        with open_text_input(file_name, encoding) as json_file:
+            yield from iter_records(json_file, self.json_backend.loads)
+
+    @staticmethod
+    def _limit(items, limit):
+        if limit is None:
+            return list(items)
+        return list(islice(items, int(limit)))
+
+    def load_json_lines_from_file(
+        self, file_name, json_path=None, limit=None, encoding=None
+    ):
+        """Load records from JSON Lines file.
+
+        Arguments:
+            - file_name: absolute json lines file name
+            - json_path: jsonpath expression, only records in which it matches a value are returned
+            - limit: maximum number of records to return, reading stops once it is reached
+            - encoding: encoding of the file
+
+        Return list of json objects
+
+        Examples:
+        | ${records}=  |  Load Json Lines From File  | /path/to/events.ndjson |
+        | ${db_events}=  |  Load Json Lines From File  | /path/to/events.ndjson | $.tags[?(@=='db')] | limit=${10} |
+        """
+        records = self._iter_json_lines(file_name, encoding)
+        with closing(records):
+            if json_path is not None:
+                records = iter_matching_records(records, self._parse(json_path))
+            return self._limit(records, limit)
+
+    def get_value_from_json_lines_file(
+        self, file_name, json_path, fail_on_empty=False, limit=None, encoding=None
+    ):
+        """Get Value From JSON Lines file using JSONPath evaluated on each record
+
+        Arguments:
+            - file_name: absolute json lines file name
+            - json_path: jsonpath expression
+            - fail_on_empty: fail the testcases if nothing is returned
+            - limit: maximum number of values to return, reading stops once it is reached
+            - encoding: encoding of the file
+
+        Return array of values, in the order of the records
+
+        Examples:
+        | ${ids}=  |  Get Value From Json Lines File  | /path/to/events.ndjson |  $.id |
+        | ${ids}=  |  Get Value From Json Lines File  | /path/to/events.ndjson |  $.id | limit=${5} |
+        """
+        records = self._iter_json_lines(file_name, encoding)
+        with closing(records):
+            values = self._limit(iter_values(records, self._parse(json_path)), limit)
+        if fail_on_empty is True and len(values) == 0:
+            fail(
+                "Get Value From Json Lines File keyword failed to find a value "
+                f"for {json_path}"
+            )
+        return values
+
+    def count_values_in_json_lines_file(self, file_name, json_path, encoding=None):
+        """Count the values matched by JSONPath in every record of a JSON Lines file
+
+        Arguments:
+            - file_name: absolute json lines file name
+            - json_path: jsonpath expression, ``$`` counts the records
+            - encoding: encoding of the file
+
+        Return number of values
+
+        Examples:
+        | ${count}=  |  Count Values In Json Lines File  | /path/to/events.ndjson |  $ |
+        | ${count}=  |  Count Values In Json Lines File  | /path/to/events.ndjson |  $.tags[*] |
+        """
+        records = self._iter_json_lines(file_name, encoding)
+        return sum(1 for _ in iter_values(records, self._parse(json_path)))
+
+    def _json_lines_file_has_value(self, file_name, json_path, encoding):
+        records = self._iter_json_lines(file_name, encoding)
+        with closing(records):
+            for value in iter_values(records, self._parse(json_path)):
+                return True, value
+        return False, None
+
+    def should_have_value_in_json_lines_file(self, file_name, json_path, encoding=None):
+        """Should Have Value In JSON Lines file using JSONPath evaluated on each record
+
+        Reading stops at the first match.
+
+        Arguments:
+            - file_name: absolute json lines file name
+            - json_path: jsonpath expression
+            - encoding: encoding of the file
+
+        Fail if no value is found
+
+        Examples:
+        |  Should Have Value In Json Lines File  | /path/to/events.ndjson |  $.status |
+        """
+        found, _ = self._json_lines_file_has_value(file_name, json_path, encoding)
+        if not found:
+            fail(f"No value found for path {json_path}")
+
+    def should_not_have_value_in_json_lines_file(
+        self, file_name, json_path, encoding=None
+    ):
+        """Should Not Have Value In JSON Lines file using JSONPath evaluated on each record
+
+        Reading stops at the first match.
+
+        Arguments:
+            - file_name: absolute json lines file name
+            - json_path: jsonpath expression
+            - encoding: encoding of the file
+
+        Fail if at least one value is found
+
+        Examples:
+        |  Should Not Have Value In Json Lines File  | /path/to/events.ndjson |  $.exception |
+        """
+        found, value = self._json_lines_file_has_value(file_name, json_path, encoding)
+        if found:
+            fail(f"Match found for parent {json_path}: {value}")
+
+    def add_object_to_json(
+        self, json_object, json_path, object_to_add, mutation_mode=None, inplace=False
+    ):
         """Add an dictionary or list object to json object using json_path
 
         Arguments:
             - json_object: json as a dictionary object.
             - json_path: jsonpath expression
             - object_to_add: dictionary or list object to add to json_object which is matched by json_path
+            - mutation_mode: ``deepcopy`` or ``copy-on-write``, see `Mutation modes`. Default is the library import setting
+            - inplace: change json_object itself instead of a copy
 
         Return new json object.
 
         Examples:
         | ${dict}=  | Create Dictionary    | latitude=13.1234 | longitude=130.1234 |
         | ${json}=  |  Add Object To Json  | ${json}          | $..address         |  ${dict} |
+        | ${json}=  |  Add Object To Json  | ${json}          | $..address         |  ${dict} | mutation_mode=copy-on-write |
+        |  Add Object To Json  | ${json}          | $..address         |  ${dict} | inplace=${True} |
         """
         json_path_expr = self._parse(json_path)
-        json_object_cpy = deepcopy(json_object)
-        object_to_add_cpy = deepcopy(object_to_add)
-        rv = json_path_expr.find(json_object_cpy)
+        document = self._make_document(json_object, mutation_mode, inplace)
+        with self._instrumentation.phase(COPY):
+            object_to_add = deepcopy(object_to_add)
+        self._add_object(document, json_path_expr, json_path, object_to_add)
+        return document.result
+
+    def _add_object(self, document, json_path_expr, json_path, object_to_add):
+        phase = self._instrumentation.phase
+        with phase(FIND):
+            rv = document.find(json_path_expr, own_values=True)
         if len(rv):
-            for match in rv:
-                if type(match.value) is dict:
-                    match.value.update(object_to_add_cpy)
-                if type(match.value) is list:
-                    match.value.append(object_to_add_cpy)
+            with phase(MUTATE):
+                for match in rv:
+                    if type(match.value) is dict:
+                        match.value.update(object_to_add)
+                    if type(match.value) is list:
+                        match.value.append(object_to_add)
         else:
             parent_json_path = ".".join(json_path.split(".")[:-1])
             child_name = json_path.split(".")[-1]
             json_path_expr = self._parse(parent_json_path)
-            rv = json_path_expr.find(json_object_cpy)
+            with phase(FIND):
+                rv = document.find(json_path_expr, own_values=True)
             if len(rv):
-                for match in rv:
-                    match.value.update({child_name: object_to_add_cpy})
+                with phase(MUTATE):
+                    for match in rv:
+                        match.value.update({child_name: object_to_add})
             else:
                 fail(f"no match found for parent {parent_json_path}")
 
-        return json_object_cpy
+    def index_json(self, json_object):
+        """Index the keys of a json object for recursive descent queries
+
+        `Get Value From Json`, `Get Values From Json`, `Should Have Value In Json` and
+        `Should Not Have Value In Json` then answer ``$..name`` paths, optionally
+        followed by fields, ``*``, indexes and slices like ``$..address.city``, from
+        the index instead of walking the whole json object. See `JSON index`.
+
+        Arguments:
+            - json_object: json as a dictionary object.
+
+        Return number of indexed values
+
+        Examples:
+        | Index Json  | ${json} |
+        | ${values}=  |  Get Value From Json  | ${json} |  $..phone_number |
+        """
+        index = JsonIndex(json_object)
+        self._json_indexes.put(id(json_object), index)
+        logger.debug(f"Indexed {len(index)} keys")
+        return len(index)
+
+    def clear_json_index(self, json_object=None):
+        """Remove the index of a json object built by `Index Json`, or every index
+
+        Arguments:
+            - json_object: json as a dictionary object, all indexes when not given
+
+        Examples:
+        | Clear Json Index  | ${json} |
+        | Clear Json Index  |
+        """
+        if json_object is None:
+            self._json_indexes.clear()
+        else:
+            self._json_indexes.discard(id(json_object))
+
+    def _find(self, json_object, json_path_expr):
+        with self._instrumentation.phase(FIND):
+            return self._find_matches(json_object, json_path_expr)
+
+    def _find_matches(self, json_object, json_path_expr):
+        if id(json_object) in self._json_indexes:
+            index = self._json_indexes.get(id(json_object))
+            if index is not None and index.json_object is json_object:
+                matches = index.find(json_path_expr)
+                if matches is not None:
+                    logger.debug(f"Evaluate {json_path_expr} with the json index")
+                    return matches
+        return json_path_expr.find(json_object)
+
+    def _iter_find(self, json_object, json_path_expr):
+        if id(json_object) in self._json_indexes:
+            return iter(self._find_matches(json_object, json_path_expr))
+        return iter_find(json_path_expr, json_object)
+
+    def _json_has_value(self, json_object, json_path):
+        json_path_expr = self._parse(json_path)
+        with self._instrumentation.phase(FIND):
+            for match in self._iter_find(json_object, json_path_expr):
+                return True, match.value
+        return False, None
 
     def get_value_from_json(self, json_object, json_path, fail_on_empty=False):
         """Get Value From JSON using JSONPath
@@ -150,59 +1127,504 @@ class JSONLibrary:
         | ${values}=  |  Get Value From Json  | ${json} |  $..missing | fail_on_empty=${True} |
         """
         json_path_expr = self._parse(json_path)
-        rv = json_path_expr.find(json_object)
+        rv = self._find(json_object, json_path_expr)
         # optional: make the keyword fails if nothing was return
         if fail_on_empty is True and (rv is None or len(rv) == 0):
             fail(f"Get Value From Json keyword failed to find a value for {json_path}")
         return [match.value for match in rv]
 
-    def update_value_to_json(self, json_object, json_path, new_value):
+    def get_first_value_from_json(self, json_object, json_path, fail_on_empty=False):
+        """Get the first value matching JSONPath, without looking for any other
+
+        The json object is only walked until the first match is found, e.g. the first
+        failed item of a large list.
+
+        Arguments:
+            - json_object: json as a dictionary object.
+            - json_path: jsonpath expression
+            - fail_on_empty: fail the testcases if nothing is found
+
+        Return the first value of `Get Value From Json`, None if nothing is found
+
+        Examples:
+        | ${item}=  |  Get First Value From Json  | ${json} |  $..items[?(@.status=='FAILED')] |
+        | ${id}=  |  Get First Value From Json  | ${json} |  $..id | fail_on_empty=${True} |
+        """
+        found, value = self._json_has_value(json_object, json_path)
+        if fail_on_empty is True and not found:
+            fail(
+                f"Get First Value From Json keyword failed to find a value for {json_path}"
+            )
+        return value
+
+    def get_values_from_json(self, json_object, json_paths, fail_on_empty=False):
+        """Get Values From JSON using several JSONPaths at once
+
+        Simple paths sharing a prefix (e.g. ``$.data.user.name`` and ``$.data.user.id``)
+        walk that prefix only once.
+
+        Arguments:
+            - json_object: json as a dictionary object.
+            - json_paths: list of jsonpath expressions (or a single one), or dictionary of names to jsonpath expressions
+            - fail_on_empty: fail the testcases if nothing is returned for any path, or only for the given list of paths (names), or a single one
+
+        Return dictionary of path (or name) to array of values
+
+        Examples:
+        | ${values}=  |  Get Values From Json  | ${json} |  ${{["$.address.city", "$.address.postalCode"]}} |
+        | Should Be Equal | ${values}[$.address.city] | ${{["Nara"]}} |
+        | ${paths}=  |  Create Dictionary | city=$.address.city | numbers=$..number |
+        | ${values}=  |  Get Values From Json  | ${json} |  ${paths} | fail_on_empty=${True} |
+        | ${values}=  |  Get Values From Json  | ${json} |  ${paths} | fail_on_empty=${{["city"]}} |
+        """
+        if isinstance(json_paths, str):
+            json_paths = [json_paths]
+        if isinstance(json_paths, dict):
+            names, json_paths = list(json_paths), list(json_paths.values())
+        else:
+            names = json_paths = list(json_paths)
+        json_path_exprs = [self._parse(json_path) for json_path in json_paths]
+        simple = [
+            position
+            for position, json_path_expr in enumerate(json_path_exprs)
+            if isinstance(json_path_expr, SimplePath)
+        ]
+        with self._instrumentation.phase(FIND):
+            simple_matches = find_many(
+                [json_path_exprs[i] for i in simple], json_object
+            )
+        matches = dict(zip(simple, simple_matches))
+        result = {}
+        for position, name in enumerate(names):
+            if position not in matches:
+                matches[position] = self._find(json_object, json_path_exprs[position])
+            result[name] = [match.value for match in matches[position]]
+        if fail_on_empty is True:
+            fail_on_empty = names
+        elif fail_on_empty is False:
+            fail_on_empty = []
+        elif isinstance(fail_on_empty, str):
+            fail_on_empty = [fail_on_empty]
+        missing = [name for name in fail_on_empty if not result.get(name)]
+        if missing:
+            fail(
+                "Get Values From Json keyword failed to find a value for "
+                + ", ".join(missing)
+            )
+        return result
+
+    def get_json_column(
+        self, json_object, json_path, field, fail_on_missing=True, numpy=False
+    ):
+        """Get the values of one field of a list of objects as a compact column
+
+        See `Columns` and `Get Json Columns`.
+
+        Arguments:
+            - json_object: json as a dictionary object.
+            - json_path: jsonpath expression of the list of objects, or of the objects
+            - field: key of the objects, ``.`` separates nested keys
+            - fail_on_missing: fail if an object has no such field, otherwise its value is None
+            - numpy: return a NumPy array
+
+        Return column of the values, an ``array``, a list or a NumPy array
+
+        Examples:
+        | ${prices}=  |  Get Json Column  | ${json} |  $.items | price |
+        | ${total}=  |  Aggregate Json Column  | ${prices} | sum |
+        """
+        return self.get_json_columns(
+            json_object,
+            json_path,
+            field,
+            fail_on_missing=fail_on_missing,
+            numpy=numpy,
+        )[field]
+
+    def get_json_columns(
+        self, json_object, json_path, *fields, fail_on_missing=True, numpy=False
+    ):
+        """Get the values of fields of a list of objects as compact columns
+
+        When json_path matches a single list, e.g. ``$.items``, its items are the
+        objects, otherwise the matched values are, e.g. ``$.items[?(@.active)]``.
+        Matching the list is faster than matching each of its items. See `Columns`.
+
+        Arguments:
+            - json_object: json as a dictionary object.
+            - json_path: jsonpath expression of the list of objects, or of the objects
+            - fields: keys of the objects, ``.`` separates nested keys, e.g. ``address.city``
+            - fail_on_missing: fail if an object has no such field, otherwise its value is None
+            - numpy: return NumPy arrays
+
+        Return dictionary of field to column of its values
+
+        Examples:
+        | ${columns}=  |  Get Json Columns  | ${json} |  $.items | id | price | address.city |
+        | Json Column Values Should Be Unique  | ${columns}[id] |
+        | ${columns}=  |  Get Json Columns  | ${json} |  $.items | price | numpy=${True} |
+        """
+        json_path_expr = self._parse(json_path)
+        records = get_records(
+            [match.value for match in self._find(json_object, json_path_expr)]
+        )
+        try:
+            return extract_columns(records, fields, fail_on_missing, numpy)
+        except ValueError as e:
+            fail(str(e))
+
+    @staticmethod
+    def aggregate_json_column(column, aggregate):
+        """Aggregate the values of a column in one call
+
+        Arguments:
+            - column: column of `Get Json Column`, or any list
+            - aggregate: ``count``, ``sum``, ``min``, ``max``, ``mean``, or ``distinct`` for the list of distinct values in order of first appearance
+
+        Return the aggregated value
+
+        Examples:
+        | ${total}=  |  Aggregate Json Column  | ${prices} | sum |
+        | ${cities}=  |  Aggregate Json Column  | ${columns}[address.city] | distinct |
+        """
+        try:
+            return aggregate_column(column, aggregate)
+        except ValueError as e:
+            fail(str(e))
+
+    @staticmethod
+    def json_column_should_be_sorted(column, descending=False, strict=False):
+        """Json Column Should Be Sorted in ascending or descending order
+
+        Arguments:
+            - column: column of `Get Json Column`, or any list
+            - descending: values must be in descending order
+            - strict: consecutive values must not be equal
+
+        Fail if a value is out of order
+
+        Examples:
+        |  Json Column Should Be Sorted  | ${columns}[created] |
+        |  Json Column Should Be Sorted  | ${columns}[id] | descending=${True} | strict=${True} |
+        """
+        try:
+            position = first_unsorted(column, descending, strict)
+        except ValueError as e:
+            fail(str(e))
+        if position is not None:
+            order = "descending" if descending else "ascending"
+            fail(
+                f"Json column is not sorted in {order} order: {column[position]} "
+                f"at index {position} is followed by {column[position + 1]}"
+            )
+
+    @staticmethod
+    def json_column_values_should_be_equal(column, value=None):
+        """Json Column Values Should Be Equal to value, or to the first value
+
+        Arguments:
+            - column: column of `Get Json Column`, or any list
+            - value: expected value of every item, the first value when not given
+
+        Fail if a value is different
+
+        Examples:
+        |  Json Column Values Should Be Equal  | ${columns}[currency] |
+        |  Json Column Values Should Be Equal  | ${columns}[status] | PASSED |
+        """
+        if value is None:
+            if len(column) == 0:
+                return
+            value = column[0]
+        position = first_different(column, value)
+        if position is not None:
+            fail(
+                f"Json column value {column[position]} at index {position} "
+                f"is not equal to {value}"
+            )
+
+    @staticmethod
+    def json_column_values_should_be_unique(column):
+        """Json Column Values Should Be Unique, no value appears twice
+
+        Arguments:
+            - column: column of `Get Json Column`, or any list
+
+        Fail if a value is equal to a previous one
+
+        Examples:
+        |  Json Column Values Should Be Unique  | ${columns}[id] |
+        """
+        position = first_duplicate(column)
+        if position is not None:
+            fail(
+                f"Json column value {column[position]} at index {position} "
+                "is a duplicate"
+            )
+
+    def _ignore_tree(self, json_object, ignore_paths):
+        paths = []
+        for json_path in ignore_paths:
+            json_path_expr = self._parse(json_path)
+            for match in self._find(json_object, json_path_expr):
+                keys = match_keys(match, json_object)
+                if keys is not None:
+                    paths.append(keys)
+        return ignore_tree(paths)
+
+    def _compare_json(
+        self, expected, actual, ignore_paths, ignore_order, max_differences
+    ):
+        if isinstance(ignore_paths, str):
+            ignore_paths = [ignore_paths]
+        ignore_paths = ignore_paths or []
+        expected_ignored = self._ignore_tree(expected, ignore_paths)
+        actual_ignored = self._ignore_tree(actual, ignore_paths)
+        with self._instrumentation.phase(COMPARE):
+            return compare(
+                expected,
+                actual,
+                expected_ignored,
+                actual_ignored,
+                ignore_order,
+                None if max_differences is None else int(max_differences),
+            )
+
+    def compare_json(
+        self,
+        expected,
+        actual,
+        ignore_paths=None,
+        ignore_order=False,
+        max_differences=100,
+    ):
+        """Get the differences of a json object from the expected one
+
+        See `Comparing json`.
+
+        Arguments:
+            - expected: expected json as a dictionary object
+            - actual: json as a dictionary object
+            - ignore_paths: jsonpath expression, or list of them, of values not compared
+            - ignore_order: compare lists regardless of the order of their items
+            - max_differences: maximum number of differences returned, None for all of them
+
+        Return list of differences, each one a message starting with its JSONPath
+
+        Examples:
+        | ${differences}=  |  Compare Json  | ${expected} |  ${json} |
+        | ${differences}=  |  Compare Json  | ${expected} |  ${json} | ignore_paths=$..timestamp | ignore_order=${True} |
+        | Should Be Empty  |  ${differences} |
+        """
+        differences, more = self._compare_json(
+            expected, actual, ignore_paths, ignore_order, max_differences
+        )
+        if more:
+            logger.info(f"Only the first {max_differences} differences are returned")
+        return differences
+
+    def json_should_be_equal(
+        self,
+        expected,
+        actual,
+        ignore_paths=None,
+        ignore_order=False,
+        max_differences=10,
+    ):
+        """Json Should Be Equal, the json object is equal to the expected one
+
+        See `Comparing json`.
+
+        Arguments:
+            - expected: expected json as a dictionary object
+            - actual: json as a dictionary object
+            - ignore_paths: jsonpath expression, or list of them, of values not compared
+            - ignore_order: compare lists regardless of the order of their items
+            - max_differences: maximum number of differences in the failure message
+
+        Fail if the json objects are different, listing their differences
+
+        Examples:
+        |  Json Should Be Equal  | ${expected} |  ${json} |
+        |  Json Should Be Equal  | ${expected} |  ${json} | ignore_paths=${{["$.id", "$..created"]}} |
+        |  Json Should Be Equal  | ${expected} |  ${json} | ignore_order=${True} |
+        """
+        max_differences = max(int(max_differences), 1)
+        differences, more = self._compare_json(
+            expected, actual, ignore_paths, ignore_order, max_differences
+        )
+        if differences:
+            if more:
+                differences.append("...")
+            fail("Json objects are not equal:\n" + "\n".join(differences))
+
+    def update_value_to_json(
+        self, json_object, json_path, new_value, mutation_mode=None, inplace=False
+    ):
         """Update value to JSON using JSONPath
 
         Arguments:
             - json_object: json as a dictionary object.
             - json_path: jsonpath expression
             - new_value: value to update
+            - mutation_mode: ``deepcopy`` or ``copy-on-write``, see `Mutation modes`. Default is the library import setting
+            - inplace: change json_object itself instead of a copy
 
         Return new json_object
 
         Examples:
         | ${json_object}=  |  Update Value To Json | ${json} |  $..address.streetAddress  |  Ratchadapisek Road |
+        |  Update Value To Json | ${json} |  $..address.streetAddress  |  Ratchadapisek Road | inplace=${True} |
         """
         json_path_expr = self._parse(json_path)
-        json_object_cpy = deepcopy(json_object)
-        for match in json_path_expr.find(json_object_cpy):
-            path = match.path
-            if isinstance(path, Index):
-                match.context.value[match.path.index] = new_value
-            elif isinstance(path, Fields):
-                match.context.value[match.path.fields[0]] = new_value
-        return json_object_cpy
-
-    def delete_object_from_json(self, json_object, json_path):
+        document = self._make_document(json_object, mutation_mode, inplace)
+        self._update_value(document, json_path_expr, new_value)
+        return document.result
+
+    def _update_value(self, document, json_path_expr, new_value):
+        with self._instrumentation.phase(FIND):
+            targets = document.find(json_path_expr)
+        with self._instrumentation.phase(MUTATE):
+            for target in targets:
+                if target.container is not None:
+                    target.container[target.key] = new_value
+
+    def delete_object_from_json(
+        self, json_object, json_path, mutation_mode=None, inplace=False
+    ):
         """Delete Object From JSON using json_path
 
         Arguments:
             - json_object: json as a dictionary object.
             - json_path: jsonpath expression
+            - mutation_mode: ``deepcopy`` or ``copy-on-write``, see `Mutation modes`. Default is the library import setting
+            - inplace: change json_object itself instead of a copy
 
         Return new json_object
 
         Examples:
         | ${json_object}=  |  Delete Object From Json | ${json} |  $..address.streetAddress  |
+        |  Delete Object From Json | ${json} |  $..address.streetAddress  | inplace=${True} |
         """
         json_path_expr = self._parse(json_path)
-        json_object_cpy = deepcopy(json_object)
-        for match in reversed(json_path_expr.find(json_object_cpy)):
-            path = match.path
-            if isinstance(path, Index):
-                del match.context.value[match.path.index]
-            elif isinstance(path, Fields):
-                del match.context.value[match.path.fields[0]]
-        return json_object_cpy
+        document = self._make_document(json_object, mutation_mode, inplace)
+        self._delete_object(document, json_path_expr)
+        return document.result
+
+    def _delete_object(self, document, json_path_expr):
+        with self._instrumentation.phase(FIND):
+            targets = document.find(json_path_expr)
+        with self._instrumentation.phase(MUTATE):
+            for target in reversed(targets):
+                if target.container is not None:
+                    del target.container[target.key]
+
+    def patch_json(self, json_object, operations, mutation_mode=None, inplace=False):
+        """Apply a list of add, update and delete operations to json object in one pass
+
+        The json object is copied once and every JSONPath is parsed once, before any
+        operation is applied. Operations are applied in order, each one sees the result
+        of the previous ones.
+
+        Arguments:
+            - json_object: json as a dictionary object.
+            - operations: list of operations (or the same list as a JSON string), see below
+            - mutation_mode: ``deepcopy`` or ``copy-on-write``, see `Mutation modes`. Default is the library import setting
+            - inplace: change json_object itself instead of a copy
+
+        Each operation is a dictionary with ``op``, ``path`` and ``value`` keys:
+        | *op* | *path*     | *Same as* |
+        | add    | JSONPath | `Add Object To Json` with ``value`` as object_to_add |
+        | update | JSONPath | `Update Value To Json` with ``value`` as new_value |
+        | delete | JSONPath | `Delete Object From Json`, no ``value`` |
+
+        Operations whose ``path`` is a JSON Pointer (empty or starting with ``/``) are
+        [https://datatracker.ietf.org/doc/html/rfc6902|RFC 6902 JSON Patch] operations:
+        ``add``, ``remove``, ``replace``, ``move``, ``copy`` and ``test``. A JSON Patch
+        document can therefore be given as is.
+
+        Return new json_object
+
+        Examples:
+        | ${operations}=  |  Evaluate | [{"op": "update", "path": "$..city", "value": "Bangkok"}, {"op": "delete", "path": "$..isMarried"}] |
+        | ${json_object}=  |  Patch Json | ${json} | ${operations} |
+        | ${json_object}=  |  Patch Json | ${json} | [{"op": "replace", "path": "/address/city", "value": "Bangkok"}] |
+        """
+        if isinstance(operations, str):
+            try:
+                operations = json.loads(operations)
+            except ValueError as e:
+                fail(f"Patch operations are not valid JSON: {e}")
+        if not isinstance(operations, (list, tuple)):
+            fail(f"Patch operations must be a list, got {type(operations).__name__}")
+        compiled = [
+            self._compile_patch_operation(operation) for operation in operations
+        ]
+        document = self._make_document(json_object, mutation_mode, inplace)
+        for operation, json_path_expr in compiled:
+            op = operation["op"]
+            if json_path_expr is None:
+                self._apply_json_patch_operation(document, operation)
+            elif op == "add":
+                value = deepcopy(operation["value"])
+                self._add_object(document, json_path_expr, operation["path"], value)
+            elif op == "update":
+                value = deepcopy(operation["value"])
+                self._update_value(document, json_path_expr, value)
+            else:
+                self._delete_object(document, json_path_expr)
+        return document.result
+
+    def _compile_patch_operation(self, operation):
+        try:
+            op, path = operation["op"], operation["path"]
+        except (KeyError, TypeError):
+            fail(f"Patch operation must have 'op' and 'path': {operation}")
+        if is_json_pointer(path):
+            if op not in JSON_PATCH_OPERATIONS:
+                fail(f"Unsupported JSON Patch operation '{op}': {operation}")
+            if op in ("move", "copy") and not is_json_pointer(operation.get("from")):
+                fail(f"JSON Patch operation '{op}' needs a 'from' pointer: {operation}")
+            if op in ("add", "replace", "test") and "value" not in operation:
+                fail(f"JSON Patch operation '{op}' needs a 'value': {operation}")
+            return operation, None
+        if op not in ("add", "update", "delete"):
+            fail(f"Unsupported patch operation '{op}': {operation}")
+        if op in ("add", "update") and "value" not in operation:
+            fail(f"Patch operation '{op}' needs a 'value': {operation}")
+        return operation, self._parse(path)
 
     @staticmethod
-    def convert_json_to_string(json_object, indent=None):
+    def _apply_json_patch_operation(document, operation):
+        op, path = operation["op"], operation["path"]
+        try:
+            if op == "test":
+                actual = document.get(parse_json_pointer(path))
+                if actual != operation["value"]:
+                    fail(
+                        f"JSON Patch test failed for {path}: "
+                        f"{actual} != {operation['value']}"
+                    )
+                return
+            if op in ("move", "copy"):
+                source = parse_json_pointer(operation["from"])
+                value = deepcopy(document.get(source))
+                if op == "move":
+                    document.remove(source)
+            elif op == "remove":
+                document.remove(parse_json_pointer(path))
+                return
+            else:
+                value = deepcopy(operation["value"])
+            if op == "replace":
+                document.replace(parse_json_pointer(path), value)
+            else:
+                document.add(parse_json_pointer(path), value)
+        except JsonPointerError as e:
+            fail(f"JSON Patch operation '{op}' failed: {e}")
+
+    @_class_callable
+    def convert_json_to_string(self, json_object, indent=None):
         """Convert JSON object to string
 
         Arguments:
@@ -215,10 +1637,11 @@ class JSONLibrary:
         | ${json_str}=  |  Convert JSON To String | ${json_obj} |
         | ${json_str}=  |  Convert JSON To String | ${json_obj} | indent=${4} |
         """
-        return json.dumps(json_object, indent=indent)
+        with self._instrumentation.phase(SERIALIZE):
+            return self.json_backend.dumps(json_object, indent=indent)
 
-    @staticmethod
-    def convert_string_to_json(json_string):
+    @_class_callable
+    def convert_string_to_json(self, json_string):
         """Convert String to JSON object
 
         Arguments:
@@ -229,23 +1652,66 @@ class JSONLibrary:
         Examples:
         | ${json_object}=  |  Convert String to JSON | ${json_string} |
         """
-        return json.loads(json_string)
+        with self._instrumentation.phase(DESERIALIZE):
+            return self.json_backend.loads(json_string)
 
-    def dump_json_to_file(self, dest_file, json_object, encoding=None):
+    def dump_json_to_file(
+        self,
+        dest_file,
+        json_object,
+        encoding=None,
+        json_lines=False,
+        indent=None,
+        compact=False,
+        atomic=False,
+        gzip=False,
+    ):
         """Dump JSON to file
 
+        The JSON is written to a temporary file while it is serialized, the whole
+        string is never held in memory. The temporary file replaces dest_file once it
+        is complete, so a failure, e.g. a value that is not serializable, leaves
+        dest_file as it was. A symbolic link is written through, and a file with hard
+        links or another owner is overwritten in place once the JSON is complete.
+
         Arguments:
             - dest_file: destination file
             - json_object: json as a dictionary object.
+            - encoding: encoding of the file
+            - json_lines: append json_object as one line to the JSON Lines file instead of overwriting the file
+            - indent: indent level for pretty-printing, like in `Convert Json To String`
+            - compact: write without spaces after ``,`` and ``:``
+            - atomic: also sync the file to disk and always replace dest_file, so even a crash of the machine never leaves a partial file
+            - gzip: write the file gzipped
 
         Export the JSON object to a file
 
         Examples:
         |  Dump JSON To File  | ${OUTPUT_DIR)${/}output.json | ${json} |
+        |  Dump JSON To File  | ${OUTPUT_DIR)${/}events.ndjson | ${event} | json_lines=${True} |
+        |  Dump JSON To File  | ${OUTPUT_DIR)${/}report.json | ${json} | indent=${2} | atomic=${True} |
+        |  Dump JSON To File  | ${OUTPUT_DIR)${/}output.json.gz | ${json} | compact=${True} | gzip=${True} |
         """
-        json_str = self.convert_json_to_string(json_object)
-        with open(dest_file, "w", encoding=encoding) as json_file:
-            json_file.write(json_str)
+        phase = self._instrumentation.phase
+        if json_lines:
+            if atomic:
+                fail("atomic is not supported when appending to a JSON Lines file")
+            with phase(SERIALIZE), open_text_output(
+                dest_file, encoding, append=True, compress=gzip
+            ) as json_file:
+                json_record = self.json_backend.dumps(
+                    json_object, separators=COMPACT_SEPARATORS
+                )
+                json_file.write(json_record + "\n")
+            return str(dest_file)
+        separators = COMPACT_SEPARATORS if compact else None
+        with phase(SERIALIZE), open_text_output(
+            dest_file, encoding, atomic=atomic, compress=gzip
+        ) as json_file:
+            for chunk in iter_encode(
+                json_object, self.json_backend.dumps, indent, separators
+            ):
+                json_file.write(chunk)
         return str(dest_file)
 
     def should_have_value_in_json(self, json_object, json_path):
@@ -255,14 +1721,16 @@ class JSONLibrary:
             - json_object: json as a dictionary object.
             - json_path: jsonpath expression
 
-        Fail if no value is found
+        Fail if no value is found, the json object is only walked until the first match
 
         Examples:
         |  Should Have Value In Json  | ${json} |  $..id_card_number |
         """
         try:
-            self.get_value_from_json(json_object, json_path, fail_on_empty=True)
+            found, _ = self._json_has_value(json_object, json_path)
         except AssertionError:
+            found = False
+        if not found:
             fail(f"No value found for path {json_path}")
 
     def should_not_have_value_in_json(self, json_object, json_path):
@@ -278,43 +1746,171 @@ class JSONLibrary:
         |  Should Not Have Value In Json  | ${json} |  $..id_card_number |
         """
         try:
-            rv = self.get_value_from_json(json_object, json_path, fail_on_empty=True)
+            found, _ = self._json_has_value(json_object, json_path)
         except AssertionError:
-            pass
-        else:
+            return
+        if found:
+            rv = self.get_value_from_json(json_object, json_path)
             fail(f"Match found for parent {json_path}: {rv}")
 
     def validate_json_by_schema_file(
-        self, json_object, path_to_schema, encoding=None
+        self, json_object, path_to_schema, encoding=None, max_errors=None
     ) -> None:
         """Validate json object by json schema file.
+
+        A schema without ``$id`` is given the URI of the file, its references are
+        resolved relative to the file. Its validator is cached apart from the one of
+        the same schema given to `Validate Json By Schema`, see `Schema cache`.
+
         Arguments:
             - json_object: json as a dictionary object.
             - json_path: path to file with json schema
+            - encoding: encoding of the schema file
+            - max_errors: report up to this number of errors instead of the most relevant one
 
         Fail if json object does not match the schema
 
         Examples:
         | Simple | Validate Json By Schema File  |  {"foo":bar}  |  ${CURDIR}${/}schema.json |
+        | Simple | Validate Json By Schema File  |  ${json}  |  ${CURDIR}${/}schema.json | max_errors=${100} |
         """
-        with open(path_to_schema, encoding=encoding) as f:
-            self.validate_json_by_schema(json_object, json.load(f))
+        schema, key = load_schema_file(
+            path_to_schema, encoding, self.json_backend.loads
+        )
+        with self._instrumentation.phase(VALIDATE):
+            self._validate(json_object, schema, key, max_errors)
 
     @staticmethod
-    def validate_json_by_schema(json_object, schema) -> None:
+    def validate_json_by_schema(json_object, schema, max_errors=None) -> None:
         """Validate json object by json schema.
         Arguments:
             - json_object: json as a dictionary object.
             - schema: schema as a dictionary object.
+            - max_errors: report up to this number of errors instead of the most relevant one
+
+        By default the failure reports the most relevant error. With ``max_errors``
+        every error is reported, with the JSONPath of the invalid value and the path
+        of the failed keyword in the schema. Errors are found lazily, so validation
+        stops once ``max_errors`` errors are found.
 
         Fail if json object does not match the schema
 
         Examples:
         | Simple | Validate Json By Schema  |  {"foo":bar}  |  {"$schema": "https://schema", "type": "object"} |
+        | Simple | Validate Json By Schema  |  ${json}  |  ${schema} | max_errors=${100} |
+        """
+        JSONLibrary._validate(json_object, schema, max_errors=max_errors)
+
+    def validate_json_items_by_schema(
+        self,
+        items,
+        schema,
+        executor=THREAD,
+        workers=None,
+        chunk_size=None,
+        fail_on_errors=True,
+        encoding=None,
+    ):
+        """Validate many json objects by one json schema, in parallel.
+
+        The schema is checked and compiled once. The items are validated in chunks by
+        a pool of threads or processes. Threads share the compiled validator, but
+        python runs only one of them at a time, so they mostly help when files must be
+        read. Processes validate on every core, each one compiles the validator once
+        and gets the items a chunk at a time.
+
+        Arguments:
+            - items: list of json objects, or glob pattern of json files (e.g. ``${OUTPUT_DIR}/responses/**/*.json``)
+            - schema: schema as a dictionary object, or path to the schema file
+            - executor: ``thread`` or ``process``
+            - workers: number of threads or processes, the number of CPUs by default
+            - chunk_size: number of items sent to a worker at once, a few chunks per worker by default
+            - fail_on_errors: fail if any item does not match the schema, return the failures otherwise
+            - encoding: encoding of the json and schema files
+
+        Return dictionary of the failure message of every invalid item, keyed by its index in the list or by its file name
+
+        Examples:
+        | Validate Json Items By Schema  |  ${json}[items]  |  ${schema} |
+        | Validate Json Items By Schema  |  ${OUTPUT_DIR}${/}responses${/}*.json  |  ${CURDIR}${/}schema.json | executor=process |
+        | ${failures}=  |  Validate Json Items By Schema  |  ${items}  |  ${schema} | fail_on_errors=${False} |
         """
+        if executor not in EXECUTORS:
+            fail(
+                f"Unsupported executor '{executor}', "
+                f"expected one of: {', '.join(EXECUTORS)}"
+            )
+        key = None
+        if isinstance(schema, str):
+            schema, key = load_schema_file(schema, encoding, self.json_backend.loads)
+        loads = None
+        if isinstance(items, str):
+            file_names = sorted(glob.glob(items, recursive=True))
+            if not file_names:
+                fail(f"No json file matches {items}")
+            items = [(file_name, file_name) for file_name in file_names]
+            loads = self.json_backend.loads
+        else:
+            items = list(enumerate(items))
+        from jsonschema import SchemaError
+
         try:
-            jsonschema.validate(json_object, schema)
-        except jsonschema.ValidationError as e:
-            fail(f"{e.message}, Schema path: {' > '.join(e.schema_path)}")
-        except jsonschema.SchemaError as e:
+            with self._instrumentation.phase(VALIDATE):
+                failures = validate_items(
+                    items,
+                    schema,
+                    key,
+                    loads,
+                    encoding,
+                    executor,
+                    int(workers) if workers is not None else None,
+                    int(chunk_size) if chunk_size is not None else None,
+                )
+        except SchemaError as e:
             fail(f"Json schema error: {e}")
+        logger.debug(f"{len(failures)} of {len(items)} items do not match the schema")
+        if failures and fail_on_errors:
+            lines = [f"{key}: {message}" for key, message in failures.items()]
+            if len(lines) > 20:
+                lines = lines[:20] + [f"... and {len(lines) - 20} more"]
+            fail(
+                "\n".join(
+                    [f"{len(failures)} of {len(items)} items do not match the schema:"]
+                    + lines
+                )
+            )
+        return failures
+
+    @staticmethod
+    def _validate(json_object, schema, key=None, max_errors=None):
+        from jsonschema import SchemaError, ValidationError
+
+        try:
+            if max_errors is None:
+                validate_by_schema(json_object, schema, key)
+            else:
+                JSONLibrary._validate_all(json_object, schema, key, int(max_errors))
+        except ValidationError as e:
+            fail(f"{e.message}, Schema path: {format_schema_path(e)}")
+        except SchemaError as e:
+            fail(f"Json schema error: {e}")
+        except reference_errors() as e:
+            fail(f"Json schema error: {e}")
+
+    @staticmethod
+    def _validate_all(json_object, schema, key, max_errors):
+        if max_errors < 1:
+            fail(f"max_errors must be a positive number, got {max_errors}")
+        errors, more = iter_schema_errors(json_object, schema, key, max_errors)
+        if not errors:
+            return
+        lines = [
+            f"{e.message}, Json path: {to_json_path(e.absolute_path)}, "
+            f"Schema path: {format_schema_path(e)}"
+            for e in errors
+        ]
+        count = f"{len(errors)} error{'s' if len(errors) > 1 else ''}"
+        if more:
+            count = f"first {count}"
+        header = f"Json object does not match the schema, {count}:"
+        fail("\n".join([header] + lines))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import json
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+
+class JsonLinesError(ValueError):
+    """Raised when a line of a JSON Lines file is not valid JSON"""
+
+
+def iter_records(fp, loads=json.loads):
+    """Yield the records of the JSON Lines text file fp, reading one line at a time
+
+    Every line is parsed by loads, blank lines are skipped.
+    """
+    for line_number, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            yield loads(line)
+        except ValueError as e:
+            raise JsonLinesError(f"Invalid JSON on line {line_number}: {e}") from e
+
+
+def iter_matching_records(records, json_path_expr):
+    """Yield the records in which json_path_expr matches at least one value"""
+    for record in records:
+        if json_path_expr.find(record):
+            yield record
+
+
+def iter_values(records, json_path_expr):
+    """Yield the values json_path_expr matches in every record"""
+    for record in records:
+        for match in json_path_expr.find(record):
+            yield match.value
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+from itertools import islice
+from jsonpath_ng import (
+    Child,
+    DatumInContext,
+    Descendants,
+    Fields,
+    Index,
+    Slice,
+    Union,
+    Where,
+)
+from jsonpath_ng.ext.filter import Filter
+from jsonpath_ng.jsonpath import AutoIdForDatum
+from .parser import is_supported_jsonpath_ng
+from .simplepath import (
+    ANY_FIELD,
+    SLICE,
+    NotSimple,
+    SimpleMatch,
+    SimplePath,
+    apply_segment,
+)
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# matches of a simple path evaluated at once, between two checks for a first match
+_CHUNK_SIZE = 1024
+
+
+def iter_find(json_path_expr, data):
+    """Yield the matches of json_path_expr in data one at a time
+
+    The matches and their order are the same as ``json_path_expr.find(data)``, but
+    only the part of data needed for the next match is evaluated, so a caller
+    stopping at the first match does not walk the whole document. The find methods
+    of jsonpath_ng are copied, with other versions than the supported ones of
+    parser the matches are all found at once by jsonpath_ng.
+    """
+    if isinstance(json_path_expr, SimplePath):
+        yield from _iter_simple_path(json_path_expr, data)
+    elif is_supported_jsonpath_ng():
+        yield from _iter_jsonpath(json_path_expr, data)
+    else:
+        yield from json_path_expr.find(data)
+
+
+def _iter_simple_path(simple_path, data):
+    found = 0
+    try:
+        for match in _iter_segments(
+            simple_path.segments, [SimpleMatch(data, None, None)]
+        ):
+            found += 1
+            yield match
+    except NotSimple:
+        # matches are found in order, the ones before the first value needing
+        # coercion are the same with jsonpath_ng
+        yield from islice(iter_find(simple_path.json_path_expr, data), found, None)
+
+
+def _iter_segments(segments, matches):
+    if not segments:
+        yield from matches
+        return
+    for chunk in _iter_chunks(segments[0], matches):
+        yield from _iter_segments(segments[1:], chunk)
+
+
+def _iter_chunks(segment, matches):
+    """Yield the matches of segment for matches in order, in lists of about
+    _CHUNK_SIZE matches, so a wide list is not walked at once"""
+    kind = segment[0]
+    if kind not in (ANY_FIELD, SLICE):
+        # at most one match each
+        yield apply_segment(segment, matches)
+        return
+    pending = []
+    for match in matches:
+        value = match.value
+        if kind == SLICE and isinstance(value, list):
+            keys = range(len(value))[slice(*segment[1:])]
+        elif kind == ANY_FIELD and isinstance(value, dict):
+            keys = list(value)
+        else:
+            pending.extend(apply_segment(segment, [match]))
+            continue
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            pending.extend(
+                SimpleMatch(value[key], key, match)
+                for key in keys[start : start + _CHUNK_SIZE]
+            )
+            if len(pending) >= _CHUNK_SIZE:
+                yield pending
+                pending = []
+    if pending:
+        yield pending
+
+
+def _iter_jsonpath(json_path_expr, datum):
+    # the operators that can match many values are evaluated lazily, exactly like
+    # their jsonpath_ng find, any other one is evaluated by jsonpath_ng itself
+    if isinstance(json_path_expr, Child):
+        for subdata in _iter_jsonpath(json_path_expr.left, datum):
+            if not isinstance(subdata, AutoIdForDatum):
+                yield from _iter_jsonpath(json_path_expr.right, subdata)
+    elif isinstance(json_path_expr, Descendants):
+        left_matches = json_path_expr.left.find(datum)
+        if not isinstance(left_matches, list):
+            left_matches = [left_matches]
+        for left_match in left_matches:
+            yield from _iter_descendants(json_path_expr.right, left_match)
+    elif isinstance(json_path_expr, Union):
+        yield from _iter_jsonpath(json_path_expr.left, datum)
+        yield from _iter_jsonpath(json_path_expr.right, datum)
+    elif isinstance(json_path_expr, Where):
+        for subdata in _iter_jsonpath(json_path_expr.left, datum):
+            if json_path_expr.right.find(subdata):
+                yield subdata
+    elif isinstance(json_path_expr, Slice):
+        yield from _iter_slice(json_path_expr, datum)
+    elif isinstance(json_path_expr, Filter) and json_path_expr.expressions:
+        yield from _iter_filter(json_path_expr, datum)
+    else:
+        yield from json_path_expr.find(datum)
+
+
+def _iter_descendants(right, datum):
+    yield from _iter_jsonpath(right, datum)
+    value = datum.value
+    if isinstance(value, list):
+        for i in range(0, len(value)):
+            child = DatumInContext(value[i], context=datum, path=Index(i))
+            yield from _iter_descendants(right, child)
+    elif isinstance(value, dict):
+        for field in value.keys():
+            child = DatumInContext(value[field], context=datum, path=Fields(field))
+            yield from _iter_descendants(right, child)
+
+
+def _iter_slice(json_slice, datum):
+    datum = DatumInContext.wrap(datum)
+    if not datum.value:
+        return
+    if isinstance(datum.value, (dict, int, str)):
+        datum = DatumInContext([datum.value], path=datum.path, context=datum.context)
+    indexes = range(0, len(datum.value))
+    if not (
+        json_slice.start is None and json_slice.end is None and json_slice.step is None
+    ):
+        indexes = indexes[json_slice.start : json_slice.end : json_slice.step]
+    for i in indexes:
+        yield DatumInContext(datum.value[i], path=Index(i), context=datum)
+
+
+def _iter_filter(json_filter, datum):
+    datum = DatumInContext.wrap(datum)
+    if isinstance(datum.value, dict):
+        datum.value = list(datum.value.values())
+    if not isinstance(datum.value, list):
+        return
+    for i in range(0, len(datum.value)):
+        if all(
+            expression.find(datum.value[i]) for expression in json_filter.expressions
+        ):
+            yield DatumInContext(datum.value[i], path=Index(i), context=datum)
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+import re
+from collections import namedtuple
+from copy import copy, deepcopy
+from robot.api import logger
+from jsonpath_ng import Fields, Index
+from .simplepath import SimpleMatch, index_of, match_location
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+DEEPCOPY = "deepcopy"
+COPY_ON_WRITE = "copy-on-write"
+MUTATION_MODES = (DEEPCOPY, COPY_ON_WRITE)
+# not a library wide setting, the caller must own the json object
+INPLACE = "inplace"
+
+JSON_PATCH_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+_ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+# container is None when the match has no parent (the root of the document)
+Target = namedtuple("Target", ["container", "key", "value"])
+
+
+class JsonPointerError(Exception):
+    """Raised when a JSON Pointer does not address a value of the document"""
+
+
+def is_json_pointer(path):
+    return isinstance(path, str) and (path == "" or path.startswith("/"))
+
+
+def parse_json_pointer(pointer):
+    """Return the unescaped reference tokens of a RFC 6901 JSON Pointer"""
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]
+    ]
+
+
+def pointer_key(container, token, insert=False):
+    """Return the key of container a JSON Pointer reference token stands for
+
+    With insert the index of a list may be equal to its length.
+    """
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPointerError(f"member '{token}' not found")
+        return token
+    if isinstance(container, list):
+        if not _ARRAY_INDEX.fullmatch(token):
+            raise JsonPointerError(f"'{token}' is not an array index")
+        index = int(token)
+        if index > len(container) or (index == len(container) and not insert):
+            raise JsonPointerError(f"array index {index} out of range")
+        return index
+    raise JsonPointerError(f"cannot reference '{token}' in {type(container).__name__}")
+
+
+def match_keys(match, root):
+    """Return the list of keys leading from root to match
+
+    Return None if the match cannot be addressed by keys from root, e.g. when
+    jsonpath_ng matched inside a temporary list it created while coercing a value.
+    """
+    keys = []
+    if isinstance(match, SimpleMatch):
+        while match.parent is not None:
+            keys.append(match.key)
+            match = match.parent
+        keys.reverse()
+        return keys
+    chain = []
+    while match.context is not None:
+        path = match.path
+        if isinstance(path, Index) and index_of(path) is not None:
+            chain.append((index_of(path), match.value))
+        elif isinstance(path, Fields) and len(path.fields) == 1:
+            chain.append((path.fields[0], match.value))
+        else:
+            return None
+        match = match.context
+    if match.value is not root:
+        return None
+    node = root
+    for key, value in reversed(chain):
+        # e.g. a one character string matched by an index of itself
+        if not isinstance(node, (dict, list)):
+            return None
+        try:
+            node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+        if node is not value:
+            return None
+        keys.append(key)
+    return keys
+
+
+class Document:
+    """JSON document changed by the mutation keywords
+
+    The whole input is deep copied up front, matches are then changed directly.
+    """
+
+    def __init__(self, json_object):
+        self.root = deepcopy(json_object)
+
+    def find(self, json_path_expr, own_values=False):  # pylint: disable=unused-argument
+        """Return a Target for every match of json_path_expr in the document
+
+        With own_values the matched values are safe to change as well, not only
+        their containers. Every value of a deep copied document is.
+        """
+        targets = []
+        for match in json_path_expr.find(self.root):
+            location = match_location(match)
+            container, key = location if location is not None else (None, None)
+            targets.append(Target(container, key, match.value))
+        return targets
+
+    @property
+    def result(self):
+        return self.root
+
+    def get(self, tokens):
+        """Return the value addressed by the JSON Pointer tokens"""
+        node = self.root
+        for token in tokens:
+            node = node[pointer_key(node, token)]
+        return node
+
+    def add(self, tokens, value):
+        """Add value at the JSON Pointer tokens the way JSON Patch ``add`` does"""
+        if not tokens:
+            self.root = value
+            return
+        container = self._writable(tokens[:-1])
+        if isinstance(container, dict):
+            container[tokens[-1]] = value
+        elif isinstance(container, list) and tokens[-1] == "-":
+            container.append(value)
+        else:
+            # fails before looking up insert on a value that is not a list
+            index = pointer_key(container, tokens[-1], insert=True)
+            container.insert(index, value)
+
+    def replace(self, tokens, value):
+        if not tokens:
+            self.root = value
+            return
+        container = self._writable(tokens[:-1])
+        container[pointer_key(container, tokens[-1])] = value
+
+    def remove(self, tokens):
+        if not tokens:
+            raise JsonPointerError("the whole document cannot be removed")
+        container = self._writable(tokens[:-1])
+        del container[pointer_key(container, tokens[-1])]
+
+    def _writable(self, tokens):
+        """Return the container addressed by the JSON Pointer tokens, safe to change"""
+        return self.get(tokens)
+
+
+class InPlaceDocument(Document):
+    """JSON document changed directly, without any copy"""
+
+    def __init__(self, json_object):  # pylint: disable=super-init-not-called
+        self.root = json_object
+
+
+class CopyOnWriteDocument(Document):
+    """JSON document copied lazily, container by container
+
+    Only the containers on the path from the root to each changed node are copied,
+    every other subtree is shared with the input. The input itself is never changed.
+    """
+
+    def __init__(self, json_object):  # pylint: disable=super-init-not-called
+        self.root = json_object
+        self._copies = {}
+        self._owned = set()
+        # keeps originals and copies alive so their ids are not reused
+        self._objects = []
+        self._deepcopied = False
+
+    def find(self, json_path_expr, own_values=False):
+        if self._deepcopied:
+            return super().find(json_path_expr, own_values)
+        matches = json_path_expr.find(self.root)
+        paths = [match_keys(match, self.root) for match in matches]
+        if any(keys is None for keys in paths):
+            logger.debug(
+                f"Cannot copy on write matches of {json_path_expr}, deep copy instead"
+            )
+            self.root = deepcopy(self.root)
+            self._deepcopied = True
+            return super().find(json_path_expr, own_values)
+        targets = []
+        for keys in paths:
+            if not keys:
+                targets.append(Target(None, None, self._own_root()))
+                continue
+            container = self._own_path(keys[:-1])
+            value = container[keys[-1]]
+            if own_values:
+                value = container[keys[-1]] = self._own(value)
+            targets.append(Target(container, keys[-1], value))
+        return targets
+
+    @property
+    def result(self):
+        if self._deepcopied:
+            return self.root
+        return self._own_root()
+
+    def _writable(self, tokens):
+        if self._deepcopied:
+            return super()._writable(tokens)
+        return self._own_path(tokens, pointer=True)
+
+    def _own_root(self):
+        self.root = self._own(self.root)
+        return self.root
+
+    def _own_path(self, keys, pointer=False):
+        node = self._own_root()
+        for key in keys:
+            if pointer:
+                key = pointer_key(node, key)
+            child = node[key]
+            owned = self._own(child)
+            if owned is not child:
+                node[key] = owned
+            node = owned
+        return node
+
+    def _own(self, obj):
+        if id(obj) in self._owned:
+            return obj
+        obj_copy = self._copies.get(id(obj))
+        if obj_copy is None:
+            obj_copy = copy(obj)
+            if obj_copy is obj:
+                return obj
+            self._copies[id(obj)] = obj_copy
+            self._owned.add(id(obj_copy))
+            self._objects.append((obj, obj_copy))
+        return obj_copy
+
+
+def make_document(json_object, mutation_mode=DEEPCOPY):
+    """Return the Document implementing mutation_mode for json_object"""
+    if mutation_mode == COPY_ON_WRITE:
+        return CopyOnWriteDocument(json_object)
+    if mutation_mode == INPLACE:
+        return InPlaceDocument(json_object)
+    return Document(json_object)
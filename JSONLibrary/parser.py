@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import logging
+import re
+from functools import lru_cache
+from threading import Lock
+import ply.lex
+import ply.yacc
+from jsonpath_ng.exceptions import JsonPathLexerError
+from jsonpath_ng.ext import parse as parse_ng
+from jsonpath_ng.ext.parser import ExtendedJsonPathLexer
+from jsonpath_ng.parser import IteratorToTokenStream
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# the logger jsonpath_ng gives PLY
+_logger = logging.getLogger("jsonpath_ng.parser")
+_lock = Lock()
+_parser = None
+# the jsonpath_ng versions, from and up to excluding, whose internals the lexer
+# below and the lazy evaluation of lazypath copy
+SUPPORTED_VERSIONS = ((1, 5, 3), (1, 8))
+
+
+@lru_cache(maxsize=None)
+def is_supported_jsonpath_ng():
+    """Return whether the installed jsonpath_ng is one of SUPPORTED_VERSIONS"""
+    # imported here, it is only needed once
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        installed = version("jsonpath-ng")
+    except PackageNotFoundError:
+        return False
+    numbers = tuple(int(number) for number in re.findall(r"\d+", installed)[:3])
+    return SUPPORTED_VERSIONS[0] <= numbers < SUPPORTED_VERSIONS[1]
+
+
+class _Lexer(ExtendedJsonPathLexer):
+    """The lexer of jsonpath_ng, with its regular expressions compiled once"""
+
+    def __init__(self):
+        super().__init__()
+        self._lexer = ply.lex.lex(module=self, debug=self.debug, errorlog=_logger)
+
+    def tokenize(self, string):
+        new_lexer = self._lexer.clone()
+        new_lexer.latest_newline = 0
+        new_lexer.string_value = None
+        new_lexer.input(string)
+        while True:
+            t = new_lexer.token()
+            if t is None:
+                break
+            t.col = t.lexpos - new_lexer.latest_newline
+            yield t
+        if new_lexer.string_value is not None:
+            raise JsonPathLexerError("Unexpected EOF in string literal or identifier")
+
+
+def _build_parser():
+    from jsonpath_ng.ext.parser import ExtentedJsonPathParser
+
+    lr_parser = ply.yacc.yacc(
+        module=ExtentedJsonPathParser(),
+        debug=False,
+        # the name jsonpath_ng gives its tables, they are never written
+        tabmodule="parser_jsonpath_parsetab",
+        write_tables=False,
+        start="jsonpath",
+        errorlog=_logger,
+    )
+    return _Lexer(), lr_parser
+
+
+def parse(json_path):
+    """Same as ``jsonpath_ng.ext.parse``, with the parser built only once
+
+    jsonpath_ng builds the LALR tables of its grammar and compiles its lexer again
+    for every expression, which takes much longer than parsing the expression.
+    Other jsonpath_ng versions than SUPPORTED_VERSIONS parse with jsonpath_ng.
+    """
+    if not is_supported_jsonpath_ng():
+        return parse_ng(json_path)
+    global _parser  # pylint: disable=global-statement
+    with _lock:
+        if _parser is None:
+            _parser = _build_parser()
+        lexer, lr_parser = _parser
+        return lr_parser.parse(lexer=IteratorToTokenStream(lexer.tokenize(json_path)))
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+import glob
+import json
+import os
+from copy import deepcopy
+from itertools import islice
+from pathlib import Path
+from urllib.parse import urldefrag, urlparse
+from urllib.request import url2pathname
+from .cache import LRUCache
+from .files import open_text_input
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# jsonschema and referencing are imported by the functions using them, they take
+# longer to import than the rest of the library
+
+# checked validators keyed by the canonical JSON of their schema
+validator_cache = LRUCache(maxsize=64)
+# parsed schema files keyed by path, modification time, size and encoding
+schema_file_cache = LRUCache(maxsize=64)
+
+
+def schema_key(schema):
+    """Return the canonical JSON of schema, or None if it is not serializable"""
+    try:
+        return json.dumps(schema, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+
+def reference_errors():
+    """Return the exceptions raised when a ``$ref`` cannot be resolved"""
+    try:
+        from referencing.exceptions import Unresolvable
+    except ImportError:  # pragma: no cover
+        # jsonschema < 4.18 resolves with RefResolver
+        from jsonschema.exceptions import RefResolutionError
+
+        return (RefResolutionError,)
+    return (Unresolvable,)
+
+
+def file_uri(path):
+    return Path(path).resolve().as_uri()
+
+
+def id_keyword(schema):
+    """Return the keyword declaring the URI of schema, ``id`` before draft 6"""
+    from jsonschema.validators import validator_for
+
+    meta_schema = validator_for(schema).META_SCHEMA
+    return "id" if "id" in meta_schema.get("properties", {}) else "$id"
+
+
+def schema_id(schema):
+    if not isinstance(schema, dict):
+        return None
+    uri = schema.get(id_keyword(schema))
+    return urldefrag(uri)[0] if isinstance(uri, str) and uri else None
+
+
+class LocalSchemaRegistry:
+    """Schemas ``$ref`` resolves to, read from local files only
+
+    Schemas of registered directories are known by their file URI and by the URI
+    they declare. Any other ``file:`` URI is read when it is referenced. Remote URIs
+    are never fetched, referencing them is an error.
+    """
+
+    def __init__(self):
+        self.schemas = {}
+        self._registry = None
+
+    def register(self, uri, schema):
+        self.schemas[uri] = schema
+        declared = schema_id(schema)
+        if declared is not None:
+            self.schemas[declared] = schema
+        self._changed()
+
+    def register_directory(self, directory, pattern="**/*.json", encoding=None):
+        """Register every schema file matching pattern in directory
+
+        Return the number of registered files.
+        """
+        paths = sorted(glob.glob(os.path.join(directory, pattern), recursive=True))
+        paths = [path for path in paths if os.path.isfile(path)]
+        for path in paths:
+            self.register(file_uri(path), load_schema_file(path, encoding)[0])
+        return len(paths)
+
+    def clear(self):
+        self.schemas.clear()
+        self._changed()
+
+    def _changed(self):
+        # cached validators resolve references with the previous registry
+        self._registry = None
+        validator_cache.clear()
+
+    def retrieve(self, uri):
+        """Return the schema at uri, without ever fetching a remote URI"""
+        if uri in self.schemas:
+            return self.schemas[uri]
+        parsed = urlparse(uri)
+        if parsed.scheme != "file":
+            raise LookupError(
+                f"Cannot resolve {uri}: remote references are not fetched, "
+                "register a local schema directory declaring this URI"
+            )
+        return load_schema_file(url2pathname(parsed.path))[0]
+
+    def validator_options(self, schema):
+        """Return the keyword arguments making a validator of schema use this registry"""
+        try:
+            from referencing import Registry, Resource
+            from referencing.jsonschema import DRAFT202012
+        except ImportError:  # pragma: no cover - jsonschema < 4.18
+            return {"resolver": _local_ref_resolver(schema, self)}
+        if self._registry is None:
+            self._registry = Registry(retrieve=self._retrieve_resource)
+            self._registry = self._registry.with_resources(
+                (uri, Resource.from_contents(schema, DRAFT202012))
+                for uri, schema in self.schemas.items()
+            ).crawl()
+        return {"registry": self._registry}
+
+    def _retrieve_resource(self, uri):
+        from referencing import Resource
+        from referencing.exceptions import NoSuchResource
+        from referencing.jsonschema import DRAFT202012
+
+        try:
+            schema = self.retrieve(uri)
+        except (OSError, ValueError, LookupError) as e:
+            raise NoSuchResource(ref=uri) from e
+        return Resource.from_contents(schema, DRAFT202012)
+
+
+def _local_ref_resolver(schema, registry):  # pragma: no cover - jsonschema < 4.18
+    # pylint: disable=no-name-in-module
+    from jsonschema import RefResolver
+    from jsonschema.exceptions import RefResolutionError
+
+    class LocalRefResolver(RefResolver):
+        def resolve_remote(self, uri):
+            try:
+                return registry.retrieve(uri)
+            except (OSError, ValueError, LookupError) as e:
+                raise RefResolutionError(e) from e
+
+    return LocalRefResolver(schema_id(schema) or "", schema, store=registry.schemas)
+
+
+schema_registry = LocalSchemaRegistry()
+
+
+def get_validator(schema, key=None):
+    """Return a validator of schema, checked against its meta schema
+
+    The validator is built once per distinct schema. Raise SchemaError if the
+    schema is invalid, invalid schemas are not cached.
+    """
+    if key is None:
+        key = schema_key(schema)
+    validator = validator_cache.get(key) if key is not None else None
+    if validator is None:
+        from jsonschema.validators import validator_for
+
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        # the cached validator must not see later changes of the given schema
+        schema = deepcopy(schema)
+        validator = cls(schema, **schema_registry.validator_options(schema))
+        if key is not None:
+            validator_cache.put(key, validator)
+    return validator
+
+
+def validate(instance, schema, key=None):
+    """Same as ``jsonschema.validate`` with a cached validator"""
+    from jsonschema.exceptions import best_match
+
+    error = best_match(get_validator(schema, key).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def format_schema_path(error):
+    return " > ".join(str(part) for part in error.schema_path)
+
+
+def iter_errors(instance, schema, key=None, max_errors=None):
+    """Return the first max_errors validation errors, and whether there are more
+
+    Errors are produced lazily by the validator, it stops once the cap is exceeded.
+    """
+    errors = get_validator(schema, key).iter_errors(instance)
+    if max_errors is None:
+        return list(errors), False
+    errors = list(islice(errors, max_errors + 1))
+    return errors[:max_errors], len(errors) > max_errors
+
+
+def load_schema_file(path, encoding=None, loads=json.loads):
+    """Return the (schema, key) pair of the schema file at path
+
+    A schema without URI is given the URI of the file, so its relative references
+    resolve to the files next to it. The file is parsed again only once it changed
+    on disk.
+    """
+    stat = os.stat(path)
+    file_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, encoding)
+    cached = schema_file_cache.get(file_key)
+    if cached is None:
+        with open_text_input(path, encoding) as f:
+            schema = loads(f.read())
+        if isinstance(schema, dict) and schema_id(schema) is None:
+            schema = {id_keyword(schema): file_uri(path), **schema}
+        cached = (schema, schema_key(schema))
+        schema_file_cache.put(file_key, cached)
+    return cached
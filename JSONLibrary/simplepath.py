@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+import re
+from collections import namedtuple
+from robot.api import logger
+from jsonpath_ng import jsonpath, Child, Fields, Index, Root, Slice
+from .parser import is_supported_jsonpath_ng
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+# values without ``get``/``keys`` and a well known truthiness, jsonpath_ng never
+# matches a field on them and never coerces them when they are falsy
+_PLAIN_TYPES = (list, tuple, str, int, float, type(None))
+
+FIELD = "field"
+ANY_FIELD = "any_field"
+INDEX = "index"
+SLICE = "slice"
+
+SimpleMatch = namedtuple("SimpleMatch", ["value", "key", "parent"])
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class NotSimple(Exception):
+    """Raised when a value needs the coercion rules of jsonpath_ng"""
+
+
+def flatten(json_path_expr):
+    """Return the chain of ``Child`` operands of json_path_expr from left to right"""
+    if isinstance(json_path_expr, Child):
+        return flatten(json_path_expr.left) + flatten(json_path_expr.right)
+    return [json_path_expr]
+
+
+def to_segment(step):
+    """Return the segment evaluated natively for a jsonpath_ng step, or None
+
+    Always None with other versions than the supported ones of parser, whose
+    semantics the segments follow.
+    """
+    if not is_supported_jsonpath_ng():
+        return None
+    if isinstance(step, Fields) and len(step.fields) == 1:
+        if step.fields[0] == "*":
+            return (ANY_FIELD,)
+        return (FIELD, step.fields[0])
+    if isinstance(step, Index) and isinstance(step.index, int):
+        return (INDEX, step.index)
+    if isinstance(step, Slice) and step.step != 0:
+        return (SLICE, step.start, step.end, step.step)
+    return None
+
+
+def to_json_path(keys):
+    """Return the JSONPath of the value reached from the root by keys
+
+    Names the jsonpath_ng lexer would not read as a field, e.g. ``a b`` or
+    ``trueValue``, are written between brackets.
+    """
+    parts = ["$"]
+    for key in keys:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        elif (
+            _IDENTIFIER.fullmatch(key)
+            and key != "where"
+            and not key.startswith(("true", "false"))
+        ):
+            parts.append(f".{key}")
+        else:
+            quote = '"' if "'" in key else "'"
+            parts.append(f"[{quote}{key}{quote}]")
+    return "".join(parts)
+
+
+def compile_simple_path(json_path_expr):
+    """Compile a parsed jsonpath_ng expression into a SimplePath
+
+    Return None if the expression uses anything else than the root, field names,
+    ``*``, integer indexes and slices.
+    """
+    if jsonpath.auto_id_field is not None or not is_supported_jsonpath_ng():
+        return None
+    steps = flatten(json_path_expr)
+    if isinstance(steps[0], Root):
+        steps = steps[1:]
+    segments = [to_segment(step) for step in steps]
+    if any(segment is None for segment in segments):
+        return None
+    return SimplePath(json_path_expr, segments)
+
+
+def index_of(path):
+    """Return the index a jsonpath_ng ``Index`` stands for, None for several"""
+    # jsonpath_ng 1.8 replaced the index attribute by a tuple of indices
+    indices = getattr(path, "indices", None)
+    if indices is None:
+        return path.index
+    return indices[0] if len(indices) == 1 else None
+
+
+def match_location(match):
+    """Return the (container, key) pair a match was found at, or None for the root"""
+    if isinstance(match, SimpleMatch):
+        if match.parent is None:
+            return None
+        return match.parent.value, match.key
+    path = match.path
+    if isinstance(path, Index) and index_of(path) is not None:
+        return match.context.value, index_of(path)
+    if isinstance(path, Fields):
+        return match.context.value, path.fields[0]
+    return None
+
+
+def apply_segment(segment, matches):
+    """Return the matches of one segment for every match in matches"""
+    kind = segment[0]
+    result = []
+    append = result.append
+    if kind == FIELD:
+        name = segment[1]
+        for match in matches:
+            value = match.value
+            if isinstance(value, dict):
+                if name in value:
+                    append(SimpleMatch(value[name], name, match))
+            elif not isinstance(value, _PLAIN_TYPES):
+                raise NotSimple
+    elif kind == ANY_FIELD:
+        for match in matches:
+            value = match.value
+            if isinstance(value, dict):
+                for name, item in value.items():
+                    append(SimpleMatch(item, name, match))
+            elif not isinstance(value, _PLAIN_TYPES):
+                raise NotSimple
+    elif kind == INDEX:
+        index = segment[1]
+        for match in matches:
+            value = match.value
+            if isinstance(value, list) and index >= 0:
+                if index < len(value):
+                    append(SimpleMatch(value[index], index, match))
+            elif value or not isinstance(value, _PLAIN_TYPES):
+                raise NotSimple
+    else:
+        indexes = slice(*segment[1:])
+        for match in matches:
+            value = match.value
+            if isinstance(value, list):
+                for index in range(len(value))[indexes]:
+                    append(SimpleMatch(value[index], index, match))
+            elif value or not isinstance(value, _PLAIN_TYPES):
+                raise NotSimple
+    return result
+
+
+class SimplePath:
+    """Native evaluator for JSONPaths made of the root, fields, indexes and slices
+
+    It walks dictionaries and lists directly instead of building jsonpath_ng
+    ``DatumInContext`` objects. Values that jsonpath_ng would coerce (e.g. a slice on
+    a dictionary) make the whole expression fall back to jsonpath_ng, so results are
+    always the same.
+    """
+
+    def __init__(self, json_path_expr, segments):
+        self.json_path_expr = json_path_expr
+        self.segments = segments
+
+    def find(self, data):
+        matches = [SimpleMatch(data, None, None)]
+        try:
+            for segment in self.segments:
+                matches = apply_segment(segment, matches)
+        except NotSimple:
+            logger.debug(f"Fall back to jsonpath_ng for {self.json_path_expr}")
+            return self.json_path_expr.find(data)
+        return matches
+
+    def __str__(self):
+        return str(self.json_path_expr)
+
+
+def find_many(simple_paths, data):
+    """Evaluate several SimplePaths at once
+
+    The paths are merged into a trie of segments so a common prefix like
+    ``$.data.user`` is only walked once. Return the list of matches of every path,
+    in the order of simple_paths.
+    """
+    trie = ({}, [])
+    for position, simple_path in enumerate(simple_paths):
+        node = trie
+        for segment in simple_path.segments:
+            node = node[0].setdefault(segment, ({}, []))
+        node[1].append(position)
+    results = [None] * len(simple_paths)
+    _find_in_trie(trie, [SimpleMatch(data, None, None)], simple_paths, data, results)
+    return results
+
+
+def _find_in_trie(node, matches, simple_paths, data, results):
+    children, positions = node
+    for position in positions:
+        results[position] = matches
+    for segment, child in children.items():
+        try:
+            child_matches = apply_segment(segment, matches)
+        except NotSimple:
+            for position in _trie_positions(child):
+                results[position] = simple_paths[position].find(data)
+            continue
+        _find_in_trie(child, child_matches, simple_paths, data, results)
+
+
+def _trie_positions(node):
+    children, positions = node
+    result = list(positions)
+    for child in children.values():
+        result.extend(_trie_positions(child))
+    return result
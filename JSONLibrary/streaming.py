@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+import re
+from json import JSONDecodeError
+from json.decoder import scanstring
+from jsonpath_ng import Child, DatumInContext, Descendants, Fields, Parent, Root, This
+from .parser import is_supported_jsonpath_ng
+from .simplepath import ANY_FIELD, FIELD, INDEX, SLICE, flatten, to_segment
+
+__author__ = "Traitanit Huangsri"
+__email__ = "traitanit.hua@gmail.com"
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+CHUNK_SIZE = 64 * 1024
+DESCEND = "descend"
+
+START_MAP = "start_map"
+MAP_KEY = "map_key"
+END_MAP = "end_map"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+VALUE = "value"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+_LITERALS = (
+    ("true", True),
+    ("false", False),
+    ("null", None),
+    ("NaN", float("nan")),
+    ("Infinity", float("inf")),
+    ("-Infinity", float("-inf")),
+)
+_IJSON_SCALARS = {"null", "boolean", "integer", "double", "number", "string"}
+
+
+class JSONStreamError(ValueError):
+    """Raised when the streamed document is not valid JSON"""
+
+
+class _Buffer:
+    """Window over a text file, refilled chunk by chunk"""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self):
+        """Read the next chunk, return False at the end of the file"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.text = self.text[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace, return the next character or '' at the end of the file"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def error(self, message):
+        return JSONStreamError(f"{message}: char {self.offset + self.pos}")
+
+    def string(self):
+        while True:
+            try:
+                value, end = scanstring(self.text, self.pos + 1)
+            except JSONDecodeError as e:
+                # the string (or one of its escapes) may continue in the next chunk
+                if self.fill():
+                    continue
+                raise self.error(e.msg) from e
+            self.pos = end
+            return value
+
+    def number(self):
+        while True:
+            match = _NUMBER.match(self.text, self.pos)
+            if match is None:
+                # a lone "-" may be followed by digits in the next chunk
+                if len(self.text) - self.pos < 2 and self.fill():
+                    continue
+                return self.literal()
+            # "1." or "1e-" may be completed by the next chunk
+            if match.end() + 2 >= len(self.text) and self.fill():
+                continue
+            self.pos = match.end()
+            integer, frac, exp = match.groups()
+            if frac or exp:
+                return float(match.group())
+            return int(integer)
+
+    def literal(self):
+        for word, value in _LITERALS:
+            while len(self.text) - self.pos < len(word) and self.fill():
+                pass
+            if self.text.startswith(word, self.pos):
+                self.pos += len(word)
+                return value
+        raise self.error("Expecting value")
+
+
+def iter_events(fp, chunk_size=CHUNK_SIZE):
+    """Parse the JSON text file fp incrementally
+
+    Yield ``(event, value)`` pairs: ``start_map``, ``map_key``, ``end_map``,
+    ``start_array``, ``end_array`` and ``value`` for every scalar. Only one chunk of
+    the file is held in memory at a time.
+    """
+    buf = _Buffer(fp, chunk_size)
+    in_map = []
+    while True:
+        # a value is expected
+        char = buf.peek()
+        if char == "{":
+            buf.pos += 1
+            yield START_MAP, None
+            if buf.peek() == "}":
+                buf.pos += 1
+                yield END_MAP, None
+            else:
+                in_map.append(True)
+                if buf.peek() != '"':
+                    raise buf.error("Expecting property name enclosed in double quotes")
+                yield MAP_KEY, buf.string()
+                buf.expect(":")
+                continue
+        elif char == "[":
+            buf.pos += 1
+            yield START_ARRAY, None
+            if buf.peek() == "]":
+                buf.pos += 1
+                yield END_ARRAY, None
+            else:
+                in_map.append(False)
+                continue
+        elif char == '"':
+            yield VALUE, buf.string()
+        elif char in "-0123456789":
+            yield VALUE, buf.number()
+        elif char:
+            yield VALUE, buf.literal()
+        else:
+            raise buf.error("Expecting value")
+        # a value is complete, close the containers it completes
+        while True:
+            if not in_map:
+                if buf.peek():
+                    raise buf.error("Extra data")
+                return
+            char = buf.peek()
+            buf.pos += 1
+            if char == ",":
+                if in_map[-1]:
+                    if buf.peek() != '"':
+                        raise buf.error(
+                            "Expecting property name enclosed in double quotes"
+                        )
+                    yield MAP_KEY, buf.string()
+                    buf.expect(":")
+                break
+            if char == "}" and in_map[-1]:
+                in_map.pop()
+                yield END_MAP, None
+            elif char == "]" and not in_map[-1]:
+                in_map.pop()
+                yield END_ARRAY, None
+            else:
+                buf.pos -= 1
+                raise buf.error("Expecting ',' delimiter")
+
+
+def iter_ijson_events(fp):
+    """Same events as iter_events, parsed by ijson from the binary file fp"""
+    try:
+        for event, value in ijson.basic_parse(fp, use_float=True):
+            if event in _IJSON_SCALARS:
+                yield VALUE, value
+            else:
+                yield event, value
+    except ijson.JSONError as e:
+        raise JSONStreamError(str(e)) from e
+
+
+def build(events, event, value):
+    """Return the python value starting with (event, value)"""
+    if event == VALUE:
+        return value
+    if event == START_MAP:
+        obj = {}
+        for event, key in events:
+            if event == END_MAP:
+                return obj
+            event, value = next(events)
+            obj[key] = build(events, event, value)
+    obj = []
+    for event, value in events:
+        if event == END_ARRAY:
+            return obj
+        obj.append(build(events, event, value))
+    return obj
+
+
+def skip(events, event):
+    """Consume the value starting with event without building it"""
+    if event != START_MAP and event != START_ARRAY:
+        return
+    depth = 1
+    for event, _ in events:
+        if event == START_MAP or event == START_ARRAY:
+            depth += 1
+        elif event == END_MAP or event == END_ARRAY:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def find_in_value(value, steps):
+    """Return the values matched by the jsonpath_ng steps in an in-memory value"""
+    datums = [DatumInContext(value)]
+    for step in steps:
+        datums = [match for datum in datums for match in step.find(datum)]
+    return [datum.value for datum in datums]
+
+
+def _flatten(json_path_expr):
+    """Return the steps of json_path_expr, ``..name`` becoming a step of its own"""
+    if isinstance(json_path_expr, Descendants):
+        right = flatten(json_path_expr.right)
+        if (
+            isinstance(right[0], Fields)
+            and len(right[0].fields) == 1
+            and right[0].fields[0] != "*"
+        ):
+            return (
+                _flatten(json_path_expr.left)
+                + [Descendants(This(), right[0])]
+                + right[1:]
+            )
+    if isinstance(json_path_expr, Child):
+        return _flatten(json_path_expr.left) + _flatten(json_path_expr.right)
+    return [json_path_expr]
+
+
+def _to_streaming_segment(step):
+    if isinstance(step, Descendants):
+        if (
+            is_supported_jsonpath_ng()
+            and isinstance(step.left, This)
+            and isinstance(step.right, Fields)
+            and len(step.right.fields) == 1
+        ):
+            return (DESCEND, step.right.fields[0])
+        return None
+    return to_segment(step)
+
+
+class StreamingPath:
+    """Evaluate a JSONPath on the events of a document while it is parsed
+
+    Field names, ``*``, indexes, slices and ``..name`` are followed on the events, so
+    only the values they match are built. When a step cannot be followed on the
+    events (e.g. a filter) the value it applies to is built and the rest of the path
+    is evaluated on it by jsonpath_ng. Once every value is yielded the rest of the
+    events are consumed, so data after the root value fails like it fails
+    ``json.load``.
+    """
+
+    def __init__(self, json_path, json_path_expr):
+        self.json_path_expr = json_path_expr
+        steps = _flatten(json_path_expr)
+        if isinstance(steps[0], Root):
+            steps = steps[1:]
+        # steps relative to something else than the current value need the document
+        self.whole_document = (
+            json_path.count("$") > 1
+            or "`parent`" in json_path
+            or any(isinstance(step, (Root, Parent)) for step in steps)
+        )
+        self.steps = steps
+        self.segments = [_to_streaming_segment(step) for step in steps]
+
+    def iter_values(self, events, ordered=True, materialize=True):
+        """Yield the values matched in the document parsed into events
+
+        With ordered False matches are yielded as soon as they are found, which may
+        differ from the order of jsonpath_ng for ``..name``. With materialize False
+        None is yielded instead of each matched value, which is then never built.
+        """
+        events = iter(events)
+        event, value = next(events)
+        if self.whole_document:
+            document = build(events, event, value)
+            for match in self.json_path_expr.find(document):
+                yield match.value
+        else:
+            yield from self._stream(events, event, value, 0, ordered, materialize)
+        # the parsers raise on anything but whitespace after the root value
+        for _ in events:
+            raise JSONStreamError("Extra data after the root value")
+
+    def _stream(self, events, event, value, i, ordered, materialize):
+        if i == len(self.steps):
+            if materialize:
+                yield build(events, event, value)
+            else:
+                skip(events, event)
+                yield None
+            return
+        segment = self.segments[i]
+        kind = segment[0] if segment else None
+        if kind in (FIELD, ANY_FIELD):
+            if event == START_MAP:
+                for key_event, key in events:
+                    if key_event == END_MAP:
+                        return
+                    child_event, child_value = next(events)
+                    if kind == ANY_FIELD or key == segment[1]:
+                        yield from self._stream(
+                            events,
+                            child_event,
+                            child_value,
+                            i + 1,
+                            ordered,
+                            materialize,
+                        )
+                    else:
+                        skip(events, child_event)
+                return
+            # a field never matches in lists and scalars
+            skip(events, event)
+            return
+        if kind in (INDEX, SLICE) and event == START_ARRAY:
+            selected = self._selected_indexes(segment)
+            if selected is not None:
+                position = 0
+                for child_event, child_value in events:
+                    if child_event == END_ARRAY:
+                        return
+                    if selected(position):
+                        yield from self._stream(
+                            events,
+                            child_event,
+                            child_value,
+                            i + 1,
+                            ordered,
+                            materialize,
+                        )
+                    else:
+                        skip(events, child_event)
+                    position += 1
+                return
+        elif kind in (INDEX, SLICE) and event == VALUE and not value:
+            # falsy scalars are never coerced into a list by jsonpath_ng
+            return
+        elif kind == DESCEND:
+            if ordered:
+                yield from self._descend_ordered(events, event, value, i)
+            else:
+                yield from self._descend(events, event, value, i)
+            return
+        # follow the rest of the path in memory
+        for match in find_in_value(build(events, event, value), self.steps[i:]):
+            yield match if materialize else None
+
+    @staticmethod
+    def _selected_indexes(segment):
+        if segment[0] == INDEX:
+            index = segment[1]
+            return None if index < 0 else index.__eq__
+        start, end, step = segment[1:]
+        if any(bound is not None and bound < 0 for bound in (start, end, step)):
+            return None
+        start = start or 0
+        step = step or 1
+        return lambda position: (
+            position >= start
+            and (end is None or position < end)
+            and (position - start) % step == 0
+        )
+
+    def _descend(self, events, event, value, i):
+        name = self.segments[i][1]
+        if event == START_MAP:
+            for key_event, key in events:
+                if key_event == END_MAP:
+                    return
+                event, value = next(events)
+                if key == name:
+                    child = build(events, event, value)
+                    yield from find_in_value(child, self.steps[i + 1 :])
+                    yield from find_in_value(child, self.steps[i:])
+                else:
+                    yield from self._descend(events, event, value, i)
+        elif event == START_ARRAY:
+            for event, value in events:
+                if event == END_ARRAY:
+                    return
+                yield from self._descend(events, event, value, i)
+
+    def _descend_ordered(self, events, event, value, i):
+        # jsonpath_ng yields the match of a dictionary itself before the matches
+        # of its children, whatever the position of the key
+        name = self.segments[i][1]
+        if event == START_MAP:
+            own = []
+            nested = []
+            for key_event, key in events:
+                if key_event == END_MAP:
+                    break
+                event, value = next(events)
+                if key == name:
+                    child = build(events, event, value)
+                    own.extend(find_in_value(child, self.steps[i + 1 :]))
+                    nested.extend(find_in_value(child, self.steps[i:]))
+                else:
+                    nested.extend(self._descend_ordered(events, event, value, i))
+            yield from own
+            yield from nested
+        elif event == START_ARRAY:
+            for event, value in events:
+                if event == END_ARRAY:
+                    return
+                yield from self._descend_ordered(events, event, value, i)
@@ -0,0 +1,468 @@
+"""Benchmark of the JSONLibrary keywords
+
+Times every keyword on generated documents of several sizes and shapes, over
+simple, filter and recursive descent JSONPaths, and optionally records the peak
+memory allocated by each call. Results can be saved and compared against a saved
+baseline, the run fails when a case got slower than the threshold allows.
+
+    python benchmarks/benchmark.py --sizes 1KB,100KB,10MB --save baseline.json
+    python benchmarks/benchmark.py --baseline baseline.json --threshold 0.25
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from JSONLibrary import JSONLibrary
+from JSONLibrary.__version__ import __version__
+from JSONLibrary.cache import parse_size
+from JSONLibrary.parser import parse as parse_ng
+
+# depth and width of the records of each document shape
+SHAPES = {
+    "flat": (1, 8),
+    "deep": (6, 2),
+    "wide": (2, 40),
+}
+PATHS = {
+    "simple": "$.items[*].id",
+    "filter": "$.items[?(@.status=='FAILED')].id",
+    "recursive": "$..id",
+}
+# seconds below which timings are too noisy to report a regression
+MIN_SECONDS = 0.001
+
+
+def make_record(number, depth, width, rng):
+    record = {
+        "id": number,
+        "status": "FAILED" if number % 1000 == 999 else "PASSED",
+        "name": f"record {number}",
+    }
+    for field in range(width):
+        if depth > 1:
+            record[f"child{field}"] = make_record(number, depth - 1, width, rng)
+        else:
+            record[f"value{field}"] = rng.choice(
+                [
+                    rng.random(),
+                    rng.randint(0, 10**6),
+                    f"text {rng.random()}",
+                    True,
+                    None,
+                ]
+            )
+    return record
+
+
+def make_document(size, shape, seed=0):
+    """Return a document of about size bytes of JSON with records of shape"""
+    depth, width = SHAPES[shape]
+    rng = random.Random(seed)
+    record_size = len(json.dumps(make_record(0, depth, width, rng)))
+    count = max(1, size // record_size)
+    return {
+        "meta": {"shape": shape, "count": count},
+        "items": [make_record(number, depth, width, rng) for number in range(count)],
+    }
+
+
+def make_schema():
+    return {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "status": {"enum": ["PASSED", "FAILED"]},
+                    },
+                    "required": ["id", "status"],
+                },
+            }
+        },
+    }
+
+
+def write_files(document, temp_dir, parts=4):
+    """Write document, its items as JSON Lines and in parts, return the names"""
+    file_name = os.path.join(temp_dir, "document.json")
+    with open(file_name, "w", encoding="utf8") as json_file:
+        json.dump(document, json_file)
+    lines_file_name = os.path.join(temp_dir, "items.ndjson")
+    with open(lines_file_name, "w", encoding="utf8") as lines_file:
+        for item in document["items"]:
+            lines_file.write(json.dumps(item) + "\n")
+    parts_dir = os.path.join(temp_dir, "parts")
+    os.mkdir(parts_dir)
+    items = document["items"]
+    step = len(items) // parts + 1
+    for part in range(parts):
+        with open(
+            os.path.join(parts_dir, f"part{part}.json"), "w", encoding="utf8"
+        ) as part_file:
+            json.dump({"items": items[part * step : (part + 1) * step]}, part_file)
+    schema_file_name = os.path.join(temp_dir, "schema.json")
+    with open(schema_file_name, "w", encoding="utf8") as schema_file:
+        json.dump(make_schema(), schema_file)
+    return file_name, lines_file_name, parts_dir, schema_file_name
+
+
+def make_cases(library, document, temp_dir):
+    """Return the (name, function) pairs of the cases run on document"""
+    file_name, lines_file_name, parts_dir, schema_file_name = write_files(
+        document, temp_dir
+    )
+    json_string = library.convert_json_to_string(document)
+    schema = make_schema()
+    item_schema = schema["properties"]["items"]["items"]
+    changed = copy.deepcopy(document)
+    changed["items"].reverse()
+    operations = [
+        {"op": "update", "path": "$.meta.count", "value": 0},
+        {"op": "add", "path": "$.meta", "value": {"added": True}},
+        {"op": "delete", "path": "$.meta.shape"},
+        {"op": "replace", "path": "/items/0/name", "value": "patched"},
+    ]
+    ids = library.get_json_column(document, "$.items", "id")
+    passed = [
+        status
+        for status in library.get_json_column(document, "$.items", "status")
+        if status == "PASSED"
+    ]
+
+    def index_json():
+        # the index is removed so that the other cases walk the document
+        library.index_json(document)
+        library.clear_json_index(document)
+
+    # the in-place cases restore the document so that the other cases see it as is
+    def add_object_to_json_inplace():
+        library.add_object_to_json(document, "$.meta", {"added": True}, inplace=True)
+        del document["meta"]["added"]
+
+    def delete_object_from_json_inplace():
+        shape = document["meta"]["shape"]
+        library.delete_object_from_json(document, "$.meta.shape", inplace=True)
+        document["meta"]["shape"] = shape
+
+    cases = []
+    for kind, path in PATHS.items():
+        cases += [
+            (
+                f"get value from json {kind}",
+                lambda path=path: library.get_value_from_json(document, path),
+            ),
+            (
+                f"get first value from json {kind}",
+                lambda path=path: library.get_first_value_from_json(document, path),
+            ),
+            (
+                f"get value from json file {kind}",
+                lambda path=path: library.get_value_from_json_file(file_name, path),
+            ),
+        ]
+    cases += [
+        (
+            "get values from json",
+            lambda: library.get_values_from_json(
+                document, ["$.meta.count", "$.items[0].id", "$.items[-1:].id"]
+            ),
+        ),
+        (
+            "should have value in json",
+            lambda: library.should_have_value_in_json(document, "$.items[-1:].id"),
+        ),
+        (
+            "should not have value in json recursive",
+            lambda: library.should_not_have_value_in_json(document, "$..missing"),
+        ),
+        (
+            "count values in json file",
+            lambda: library.count_values_in_json_file(file_name, "$.items[*].id"),
+        ),
+        (
+            "should have value in json file",
+            lambda: library.should_have_value_in_json_file(file_name, "$.meta.count"),
+        ),
+        (
+            "should not have value in json file",
+            lambda: library.should_not_have_value_in_json_file(file_name, "$.missing"),
+        ),
+        (
+            "load json lines from file",
+            lambda: library.load_json_lines_from_file(lines_file_name),
+        ),
+        (
+            "get value from json lines file",
+            lambda: library.get_value_from_json_lines_file(lines_file_name, "$.id"),
+        ),
+        (
+            "count values in json lines file",
+            lambda: library.count_values_in_json_lines_file(lines_file_name, "$.id"),
+        ),
+        (
+            "should have value in json lines file",
+            lambda: library.should_have_value_in_json_lines_file(
+                lines_file_name, "$.id"
+            ),
+        ),
+        (
+            "should not have value in json lines file",
+            lambda: library.should_not_have_value_in_json_lines_file(
+                lines_file_name, "$.missing"
+            ),
+        ),
+        ("index json", index_json),
+        (
+            "get json column",
+            lambda: library.get_json_column(document, "$.items", "id"),
+        ),
+        (
+            "get json columns",
+            lambda: library.get_json_columns(document, "$.items", "id", "status"),
+        ),
+        ("aggregate json column", lambda: library.aggregate_json_column(ids, "sum")),
+        (
+            "json column should be sorted",
+            lambda: library.json_column_should_be_sorted(ids, strict=True),
+        ),
+        (
+            "json column values should be equal",
+            lambda: library.json_column_values_should_be_equal(passed),
+        ),
+        (
+            "json column values should be unique",
+            lambda: library.json_column_values_should_be_unique(ids),
+        ),
+        ("patch json", lambda: library.patch_json(document, operations)),
+        (
+            "update value to json deepcopy",
+            lambda: library.update_value_to_json(document, "$.meta.count", 0),
+        ),
+        (
+            "update value to json copy-on-write",
+            lambda: library.update_value_to_json(
+                document, "$.meta.count", 0, mutation_mode="copy-on-write"
+            ),
+        ),
+        (
+            "update value to json inplace",
+            lambda: library.update_value_to_json(
+                document, "$.meta.count", document["meta"]["count"], inplace=True
+            ),
+        ),
+        (
+            "add object to json deepcopy",
+            lambda: library.add_object_to_json(document, "$.meta", {"added": True}),
+        ),
+        (
+            "add object to json copy-on-write",
+            lambda: library.add_object_to_json(
+                document, "$.meta", {"added": True}, mutation_mode="copy-on-write"
+            ),
+        ),
+        ("add object to json inplace", add_object_to_json_inplace),
+        (
+            "delete object from json deepcopy",
+            lambda: library.delete_object_from_json(document, "$.meta.shape"),
+        ),
+        (
+            "delete object from json copy-on-write",
+            lambda: library.delete_object_from_json(
+                document, "$.meta.shape", mutation_mode="copy-on-write"
+            ),
+        ),
+        ("delete object from json inplace", delete_object_from_json_inplace),
+        ("convert json to string", lambda: library.convert_json_to_string(document)),
+        ("convert string to json", lambda: library.convert_string_to_json(json_string)),
+        (
+            "dump json to file",
+            lambda: library.dump_json_to_file(
+                os.path.join(temp_dir, "dumped.json"), document
+            ),
+        ),
+        ("load json from file", lambda: library.load_json_from_file(file_name)),
+        ("load json from files", lambda: library.load_json_from_files(parts_dir)),
+        (
+            "validate json by schema",
+            lambda: library.validate_json_by_schema(document, schema),
+        ),
+        (
+            "validate json by schema file",
+            lambda: library.validate_json_by_schema_file(document, schema_file_name),
+        ),
+        (
+            "validate json items by schema",
+            lambda: library.validate_json_items_by_schema(
+                document["items"], item_schema
+            ),
+        ),
+        ("compare json", lambda: library.compare_json(document, changed)),
+        (
+            "compare json ignore order",
+            lambda: library.compare_json(document, changed, ignore_order=True),
+        ),
+        (
+            "json should be equal",
+            lambda: library.json_should_be_equal(document, document),
+        ),
+    ]
+    return cases
+
+
+def measure(function, repeat, budget):
+    """Return the median duration of function, run up to repeat times within budget"""
+    durations = []
+    deadline = time.perf_counter() + budget
+    while len(durations) < repeat:
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    return statistics.median(durations)
+
+
+def measure_peak_memory(function):
+    """Return the peak number of bytes allocated while function runs"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, shapes, selected, repeat, budget, memory):
+    results = {}
+
+    def run_cases(cases, size_name, shape):
+        for name, function in cases:
+            if selected and not any(part in name for part in selected):
+                continue
+            result = {"seconds": measure(function, repeat, budget)}
+            if memory:
+                result["peak_bytes"] = measure_peak_memory(function)
+            key = f"{name} | {size_name} | {shape}"
+            results[key] = result
+            print(format_result(key, result), flush=True)
+
+    # parsing does not depend on the document
+    parse_cases = [
+        (f"parse path {kind}", lambda path=path: parse_ng(path))
+        for kind, path in PATHS.items()
+    ]
+    run_cases(parse_cases, "-", "-")
+    library = JSONLibrary()
+    for size_name in sizes:
+        for shape in shapes:
+            document = make_document(parse_size(size_name), shape)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                run_cases(make_cases(library, document, temp_dir), size_name, shape)
+    return results
+
+
+def format_result(key, result, baseline=None):
+    line = f"{key:<60} {result['seconds'] * 1000:>12.3f} ms"
+    if "peak_bytes" in result:
+        line += f" {result['peak_bytes'] / 2**20:>10.1f} MB"
+    if baseline is not None:
+        change = result["seconds"] / baseline["seconds"] - 1
+        line += f"  baseline {baseline['seconds'] * 1000:.3f} ms ({change:+.0%})"
+    return line
+
+
+def compare(results, baseline, threshold):
+    """Print the cases slower than the baseline by more than threshold, return them"""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None or result["seconds"] < MIN_SECONDS:
+            continue
+        if result["seconds"] > expected["seconds"] * (1 + threshold):
+            regressions.append(key)
+            print("REGRESSION " + format_result(key, result, expected))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1KB,100KB,10MB",
+        help="comma separated document sizes, e.g. 1KB,10MB,500MB",
+    )
+    parser.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help=f"comma separated document shapes among {', '.join(SHAPES)}",
+    )
+    parser.add_argument(
+        "--cases", default="", help="comma separated parts of the case names to run"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each case")
+    parser.add_argument(
+        "--budget", type=float, default=2.0, help="seconds to spend on each case"
+    )
+    parser.add_argument(
+        "--memory", action="store_true", help="record the peak memory of each case"
+    )
+    parser.add_argument("--save", help="file to save the results to")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown against the baseline, 0.25 is 25%%",
+    )
+    args = parser.parse_args(argv)
+    shapes = args.shapes.split(",")
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)}")
+    results = run(
+        args.sizes.split(","),
+        shapes,
+        [case for case in args.cases.split(",") if case],
+        args.repeat,
+        args.budget,
+        args.memory,
+    )
+    if args.save:
+        with open(args.save, "w", encoding="utf8") as results_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "jsonlibrary": __version__,
+                    "results": results,
+                },
+                results_file,
+                indent=2,
+            )
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} cases are slower than the baseline")
+            return 1
+        print("No regression against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
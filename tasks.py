@@ -52,6 +52,29 @@ def test(ctx):
     ctx.run("tox")
 
 
+@task(
+    help={
+        "sizes": "comma separated document sizes, e.g. 1KB,10MB,500MB",
+        "baseline": "results file to compare against",
+        "save": "file to save the results to",
+        "memory": "record the peak memory of each case",
+        "threshold": "allowed slowdown against the baseline, 0.25 is 25%",
+    }
+)
+def benchmark(
+    ctx, sizes="1KB,100KB,10MB", baseline=None, save=None, memory=False, threshold=0.25
+):
+    command = f"{sys.executable} benchmarks/benchmark.py --sizes {sizes}"
+    command += f" --threshold {threshold}"
+    if baseline:
+        command += f" --baseline {baseline}"
+    if save:
+        command += f" --save {save}"
+    if memory:
+        command += " --memory"
+    ctx.run(command)
+
+
 @task
 def style_check(ctx):
     ctx.run("black . --check --diff")
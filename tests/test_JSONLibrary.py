@@ -3,11 +3,30 @@
 __author__ = "Traitanit Huangsri"
 __email__ = "traitanit.hua@ascendcorp.com"
 
+import bz2
+import gzip
+import lzma
+import json as stdlib_json
 import os
+import random
+import re
+import subprocess
+import sys
 import tempfile
+import tracemalloc
 import pytest
+from array import array
 from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
 from JSONLibrary import JSONLibrary
+from JSONLibrary.backends import get_json_backend, iter_encode
+from JSONLibrary.lazypath import iter_find
+from JSONLibrary.cache import LRUCache, SizedLRUCache, parse_size
+from JSONLibrary.parser import is_supported_jsonpath_ng, parse
+from JSONLibrary.schema import schema_registry
+from JSONLibrary.simplepath import SimplePath, to_json_path
+from jsonpath_ng.ext import parse as parse_ng
 
 
 class TestJSONLibrary:
@@ -162,12 +181,122 @@ class TestJSONLibrary:
         json_obj = self.json_library.convert_string_to_json('{"firstName": "John"}')
         assert "firstName" in json_obj
 
+    def test_keywords_called_on_class(self, json):
+        file_path = os.path.join(self.dir_path, "json", "example.json")
+        assert JSONLibrary.load_json_from_file(file_path) == json
+        json_string = JSONLibrary.convert_json_to_string({"a": 1}, indent=2)
+        assert json_string == '{\n  "a": 1\n}'
+        assert JSONLibrary.convert_string_to_json(json_string) == {"a": 1}
+        # called on an instance they still use its settings
+        json_library = JSONLibrary(instrumentation="time")
+        json_library.convert_json_to_string({"a": 1})
+        assert list(json_library.get_json_instrumentation_statistics()["phases"]) == [
+            "serialize"
+        ]
+
     def test_dump_json_to_file(self, json):
         with tempfile.TemporaryDirectory() as temp_dir:
             file_path = "%ssample.json" % temp_dir
             json_file = self.json_library.dump_json_to_file(file_path, json)
             assert os.path.exists(json_file)
 
+    @pytest.mark.parametrize(
+        "indent, compact, expected_indent, separators",
+        [
+            (None, False, None, None),
+            (2, False, 2, None),
+            (None, True, None, (",", ":")),
+            ("\t", True, "\t", (",", ":")),
+        ],
+    )
+    def test_dump_json_to_file_options(
+        self, json, indent, compact, expected_indent, separators
+    ):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sample.json")
+            self.json_library.dump_json_to_file(
+                file_path, json, indent=indent, compact=compact
+            )
+            with open(file_path) as json_file:
+                assert json_file.read() == stdlib_json.dumps(
+                    json, indent=expected_indent, separators=separators
+                )
+            gzip_path = self.json_library.dump_json_to_file(
+                file_path + ".gz", json, indent=indent, compact=compact, gzip=True
+            )
+            with gzip.open(gzip_path, "rt") as json_file:
+                assert json_file.read() == stdlib_json.dumps(
+                    json, indent=expected_indent, separators=separators
+                )
+
+    def test_dump_json_to_file_atomic(self, json):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sample.json")
+            self.json_library.dump_json_to_file(file_path, {"previous": True})
+            os.chmod(file_path, 0o640)
+            with pytest.raises(TypeError):
+                self.json_library.dump_json_to_file(
+                    file_path, {"a": list(range(5000)), "b": object()}, atomic=True
+                )
+            assert os.listdir(temp_dir) == ["sample.json"]
+            assert self.json_library.load_json_from_file(file_path) == {
+                "previous": True
+            }
+            self.json_library.dump_json_to_file(file_path, json, atomic=True)
+            assert os.listdir(temp_dir) == ["sample.json"]
+            assert self.json_library.load_json_from_file(file_path) == json
+            assert os.stat(file_path).st_mode & 0o777 == 0o640
+            with pytest.raises(AssertionError, match="atomic is not supported"):
+                self.json_library.dump_json_to_file(
+                    file_path, json, json_lines=True, atomic=True
+                )
+
+    def test_dump_json_to_file_keeps_file_on_error(self, json):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sample.json")
+            self.json_library.dump_json_to_file(file_path, json)
+            with pytest.raises(TypeError):
+                self.json_library.dump_json_to_file(
+                    file_path, {"a": list(range(5000)), "b": datetime.now()}
+                )
+            assert os.listdir(temp_dir) == ["sample.json"]
+            assert self.json_library.load_json_from_file(file_path) == json
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs links")
+    @pytest.mark.parametrize("atomic", [False, True])
+    def test_dump_json_to_file_keeps_links(self, json, atomic):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sample.json")
+            self.json_library.dump_json_to_file(file_path, {})
+            symlink_path = os.path.join(temp_dir, "symlink.json")
+            os.symlink(file_path, symlink_path)
+            self.json_library.dump_json_to_file(symlink_path, json, atomic=atomic)
+            assert os.path.islink(symlink_path)
+            assert self.json_library.load_json_from_file(file_path) == json
+            hardlink_path = os.path.join(temp_dir, "hardlink.json")
+            os.link(file_path, hardlink_path)
+            self.json_library.dump_json_to_file(hardlink_path, {"a": 1})
+            assert os.path.samefile(file_path, hardlink_path)
+            assert self.json_library.load_json_from_file(file_path) == {"a": 1}
+            assert sorted(os.listdir(temp_dir)) == [
+                "hardlink.json",
+                "sample.json",
+                "symlink.json",
+            ]
+
+    @pytest.mark.parametrize("depth, batch_size", [(0, 1), (1, 2), (2, 2), (3, 1000)])
+    @pytest.mark.parametrize("indent", [None, 0, 4, "\t"])
+    @pytest.mark.parametrize("separators", [None, (",", ":")])
+    def test_iter_encode(self, json, depth, batch_size, indent, separators):
+        json_object = {**json, "records": [json, [], {}, [1, [2]]], 1: "key"}
+        for value in (json_object, [json_object] * 3, [], "value"):
+            chunks = iter_encode(
+                value, stdlib_json.dumps, indent, separators, depth, batch_size
+            )
+            assert "".join(chunks) == stdlib_json.dumps(
+                value, indent=indent, separators=separators
+            )
+
     def test_validate_json_by_schema_file(self, json):
         schema_path = os.path.join(self.dir_path, "json", "example_schema.json")
         self.json_library.validate_json_by_schema_file(json, schema_path)
@@ -177,6 +306,11 @@ class TestJSONLibrary:
             json, {"type": "object", "properties": {"firstName": {"type": "string"}}}
         )
 
+    def test_validate_json_by_schema_called_on_class(self, json):
+        JSONLibrary.validate_json_by_schema(json, {"type": "object"})
+        with pytest.raises(AssertionError, match="is not of type 'array'"):
+            JSONLibrary.validate_json_by_schema(json, {"type": "array"})
+
     def test_validate_json_by_schema_file_fail(self, json):
         schema_path = os.path.join(self.dir_path, "json", "example_schema.json")
         new_json = self.json_library.delete_object_from_json(json, "$..phoneNumbers")
@@ -195,3 +329,1356 @@ class TestJSONLibrary:
         schema_path = os.path.join(self.dir_path, "json", "broken_schema.json")
         with pytest.raises(AssertionError):
             self.json_library.validate_json_by_schema_file(json, schema_path)
+
+    def test_jsonpath_cache_hit(self, json):
+        self.json_library.clear_jsonpath_cache()
+        self.json_library.get_value_from_json(json, "$..number")
+        self.json_library.get_value_from_json(json, "$..number")
+        self.json_library.should_have_value_in_json(json, "$..number")
+        info = self.json_library.get_jsonpath_cache_info()
+        assert info["misses"] == 1
+        assert info["hits"] == 2
+        assert info["size"] == 1
+
+    @pytest.mark.parametrize(
+        "json_path",
+        [
+            "$..number",
+            "$..address",
+            "$..address.city",
+            "$..phoneNumbers[0]",
+            "$..phoneNumbers[*].type",
+            "$..phoneNumbers[1:].number",
+            "$..address.*",
+            "$..missing",
+            "$..phoneNumbers[?(@.type=='home')]",
+        ],
+    )
+    def test_index_json(self, json, json_path):
+        json_object = {"people": [json, deepcopy(json)], "address": {"city": "Nara"}}
+        expected = self.json_library.get_value_from_json(json_object, json_path)
+        try:
+            assert self.json_library.index_json(json_object) > 0
+            assert (
+                self.json_library.get_value_from_json(json_object, json_path)
+                == expected
+            )
+            values = self.json_library.get_values_from_json(json_object, [json_path])
+            assert values == {json_path: expected}
+        finally:
+            self.json_library.clear_json_index()
+
+    def test_index_json_invalidation(self, json):
+        self.json_library.index_json(json)
+        try:
+            updated = self.json_library.update_value_to_json(json, "$..city", "Bangkok")
+            assert self.json_library.get_value_from_json(updated, "$..city") == [
+                "Bangkok"
+            ]
+            assert self.json_library.get_value_from_json(json, "$..city") == ["Nara"]
+            self.json_library.update_value_to_json(
+                json, "$..city", "Bangkok", inplace=True
+            )
+            assert self.json_library.get_value_from_json(json, "$..city") == ["Bangkok"]
+            self.json_library.index_json(json)
+            self.json_library.clear_json_index(json)
+            json["address"]["city"] = "Chiang Mai"
+            self.json_library.should_have_value_in_json(json, "$..address.city")
+            assert self.json_library.get_value_from_json(json, "$..city") == [
+                "Chiang Mai"
+            ]
+        finally:
+            self.json_library.clear_json_index()
+
+    def test_index_json_inplace_change_of_part(self):
+        document = {"a": {"b": 0}, "id": 1}
+        self.json_library.index_json(document)
+        try:
+            self.json_library.add_object_to_json(document["a"], "$.id", 2, inplace=True)
+            assert self.json_library.get_value_from_json(document, "$..id") == [1, 2]
+        finally:
+            self.json_library.clear_json_index()
+
+    @pytest.mark.parametrize(
+        "json_path",
+        [
+            "$",
+            "$.phoneNumbers[*].type",
+            "$.phoneNumbers[::-1].*",
+            "$.*.*",
+            "$..number",
+            "$..phoneNumbers[1:]",
+            "$.phoneNumbers[?(@.type=='home')].number",
+            "$..phoneNumbers[?(@.type=='iPhone')]",
+            "$.firstName | $.lastName",
+            "$.address.city.`parent`",
+            "$.age[*]",
+        ],
+    )
+    def test_iter_find(self, json, json_path):
+        json_path_expr = self.json_library._parse(json_path)
+        expected = [match.value for match in json_path_expr.find(json)]
+        assert [match.value for match in iter_find(json_path_expr, json)] == expected
+        first = self.json_library.get_first_value_from_json(json, json_path)
+        assert first == (expected[0] if expected else None)
+
+    def test_get_first_value_from_json(self, json):
+        # the second item would fail jsonpath_ng, it is never reached
+        json_object = {"items": [{"id": [1, 2]}, {"id": {"a": 3}}]}
+        assert self.json_library.get_first_value_from_json(json_object, "$..id[0]") == 1
+        self.json_library.should_have_value_in_json(json_object, "$..id[0]")
+        assert self.json_library.get_first_value_from_json(json, "$..missing") is None
+        with pytest.raises(
+            AssertionError,
+            match="Get First Value From Json keyword failed to find a value for",
+        ):
+            self.json_library.get_first_value_from_json(
+                json, "$..missing", fail_on_empty=True
+            )
+        with pytest.raises(AssertionError, match="Match found for parent .*Nara"):
+            self.json_library.should_not_have_value_in_json(json, "$..city")
+
+    def test_jsonpath_cache_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("$.a", 1)
+        cache.put("$.b", 2)
+        assert cache.get("$.a") == 1
+        cache.put("$.c", 3)
+        assert "$.b" not in cache
+        assert "$.a" in cache and "$.c" in cache
+        cache.resize(0)
+        assert len(cache) == 0
+
+    def test_file_cache(self, json):
+        file_name = os.path.join(self.dir_path, "json", "example.json")
+        json_library = JSONLibrary(file_cache_size="1MB")
+        try:
+            json_library.clear_json_file_cache()
+            first = json_library.load_json_from_file(file_name)
+            first["firstName"] = "changed"
+            second = json_library.load_json_from_file(file_name)
+            assert second == json
+            second["phoneNumbers"].append({})
+            assert json_library.load_json_from_file(file_name) == json
+            info = json_library.get_json_file_cache_info()
+            assert info["misses"] == 1
+            assert info["hits"] == 2
+            assert info["size"] == 1
+            assert 0 < info["bytes"] <= info["maxsize"] == 1024**2
+        finally:
+            JSONLibrary(file_cache_size=0)
+        assert self.json_library.get_json_file_cache_info()["size"] == 0
+
+    def test_default_arguments_keep_cache_sizes(self):
+        JSONLibrary(path_cache_size=1024, file_cache_size="1MB")
+        try:
+            JSONLibrary()
+            JSONLibrary.convert_json_to_string({"a": 1})
+            assert JSONLibrary.get_jsonpath_cache_info()["maxsize"] == 1024
+            assert JSONLibrary.get_json_file_cache_info()["maxsize"] == 1024**2
+        finally:
+            JSONLibrary(path_cache_size=128, file_cache_size=0)
+
+    def test_file_cache_reloads_changed_file(self):
+        json_library = JSONLibrary(file_cache_size=4096)
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_name = os.path.join(temp_dir, "fixture.json")
+                json_library.dump_json_to_file(file_name, {"version": 1})
+                assert json_library.load_json_from_file(file_name) == {"version": 1}
+                json_library.dump_json_to_file(file_name, {"version": 10})
+                assert json_library.load_json_from_file(file_name) == {"version": 10}
+        finally:
+            JSONLibrary(file_cache_size=0)
+
+    def test_file_cache_by_json_backend(self):
+        pytest.importorskip("orjson")
+        json_library = JSONLibrary(json_backend="orjson", file_cache_size=4096)
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_name = os.path.join(temp_dir, "fixture.json")
+                with open(file_name, "w", encoding="utf8") as json_file:
+                    json_file.write("[18446744073709551616]")
+                # orjson parses integers above 64 bits as floats
+                assert type(json_library.load_json_from_file(file_name)[0]) is float
+                value = self.json_library.load_json_from_file(file_name)
+                assert value == [2**64] and type(value[0]) is int
+        finally:
+            JSONLibrary(file_cache_size=0)
+
+    def test_file_cache_eviction(self):
+        cache = SizedLRUCache(maxsize=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        assert cache.get("a") == b"1234"
+        cache.put("c", b"1234")
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        cache.put("d", b"12345678901")
+        assert "d" not in cache
+        info = cache.info()
+        assert info["evictions"] == 1
+        assert info["bytes"] == 8
+        cache.resize(0)
+        assert len(cache) == 0 and cache.nbytes == 0
+
+    @pytest.mark.parametrize(
+        "size, expected",
+        [(0, 0), ("4096", 4096), ("512KB", 512 * 1024), ("64mb", 64 * 1024**2)],
+    )
+    def test_parse_size(self, size, expected):
+        assert parse_size(size) == expected
+
+    def test_invalid_file_cache_size(self):
+        with pytest.raises(AssertionError, match="Invalid size '64 apples'"):
+            JSONLibrary(file_cache_size="64 apples")
+
+    @pytest.mark.parametrize(
+        "json_path",
+        [
+            "$",
+            "$.address.city",
+            "$.phoneNumbers[1].number",
+            "$.phoneNumbers[*].type",
+            "$.phoneNumbers[1:].type",
+            "$.phoneNumbers[-1].type",
+            "$.address.*",
+            "$.address[*]",
+            "$.age[*]",
+            "$.firstName[0]",
+            "$.siblings[0]",
+            "$.occupation.name",
+            "$.favoriteColor.name",
+        ],
+    )
+    def test_fast_path_same_as_jsonpath_ng(self, json, json_path):
+        json_path_expr = self.json_library._parse(json_path)
+        # other jsonpath_ng versions evaluate every path themselves
+        assert isinstance(json_path_expr, SimplePath) is is_supported_jsonpath_ng()
+        values = self.json_library.get_value_from_json(json, json_path)
+        assert values == [match.value for match in parse_ng(json_path).find(json)]
+
+    def test_fast_path_update_and_delete(self, json):
+        json_object = self.json_library.update_value_to_json(
+            json, "$.phoneNumbers[*].type", "mobile"
+        )
+        assert [pn["type"] for pn in json_object["phoneNumbers"]] == ["mobile"] * 3
+        json_object = self.json_library.delete_object_from_json(
+            json, "$.phoneNumbers[0:2]"
+        )
+        assert json_object["phoneNumbers"] == json["phoneNumbers"][2:]
+
+    def test_filter_is_not_fast_path(self):
+        json_path_expr = self.json_library._parse("$.bankAccounts[?(@.amount>=100)]")
+        assert not isinstance(json_path_expr, SimplePath)
+
+    @pytest.mark.parametrize(
+        "keyword, args",
+        [
+            ("add_object_to_json", ("$..address", {"country": "Thailand"})),
+            ("add_object_to_json", ("$.favoriteColor", "green")),
+            ("add_object_to_json", ("$.address.country", "Thailand")),
+            ("update_value_to_json", ("$..phoneNumbers[*].type", "mobile")),
+            ("update_value_to_json", ("$.bankAccounts[?(@.amount>=100)]", None)),
+            ("update_value_to_json", ("$.address[*]", None)),
+            ("delete_object_from_json", ("$..number",)),
+            ("delete_object_from_json", ("$.phoneNumbers[0:2]",)),
+        ],
+    )
+    def test_copy_on_write_same_as_deepcopy(self, json, keyword, args):
+        json_cpy = deepcopy(json)
+        keyword = getattr(self.json_library, keyword)
+        expected = keyword(json, *args)
+        json_object = keyword(json_cpy, *args, mutation_mode="copy-on-write")
+        assert json_object == expected
+        assert json_cpy == json
+
+    @pytest.mark.parametrize(
+        "keyword, args",
+        [
+            ("add_object_to_json", ("$.x[0]", {"a": 1})),
+            ("update_value_to_json", ("$.x[0]", "y")),
+            ("delete_object_from_json", ("$.x[0]",)),
+        ],
+    )
+    def test_copy_on_write_index_of_string(self, keyword, args):
+        # jsonpath_ng matches an index of a string: like deepcopy, copy-on-write
+        # ignores it when adding and fails to change it otherwise
+        keyword = getattr(self.json_library, keyword)
+
+        def outcome(mutation_mode):
+            json_object = {"x": "x"}
+            try:
+                result = keyword(json_object, *args, mutation_mode=mutation_mode)
+            except TypeError as e:
+                result = type(e)
+            assert json_object == {"x": "x"}
+            return result
+
+        assert outcome("copy-on-write") == outcome("deepcopy")
+
+    def test_copy_on_write_shares_untouched_values(self, json):
+        json_object = self.json_library.update_value_to_json(
+            json, "$.address.city", "Bangkok", mutation_mode="copy-on-write"
+        )
+        assert json_object is not json
+        assert json_object["address"] is not json["address"]
+        assert json_object["phoneNumbers"] is json["phoneNumbers"]
+        assert json["address"]["city"] == "Nara"
+
+    def test_invalid_mutation_mode(self, json):
+        with pytest.raises(AssertionError):
+            self.json_library.delete_object_from_json(
+                json, "$.age", mutation_mode="inplace"
+            )
+
+    @pytest.mark.parametrize(
+        "keyword, args",
+        [
+            ("add_object_to_json", ("$..address", {"country": "Thailand"})),
+            ("add_object_to_json", ("$.address.country", "Thailand")),
+            ("update_value_to_json", ("$..phoneNumbers[0].type", "mobile")),
+            ("delete_object_from_json", ("$..phoneNumbers[*]",)),
+        ],
+    )
+    def test_inplace_same_as_copy(self, json, keyword, args):
+        json_cpy = deepcopy(json)
+        keyword = getattr(self.json_library, keyword)
+        expected = keyword(json, *args)
+        json_object = keyword(json_cpy, *args, inplace=True)
+        assert json_object is json_cpy
+        assert json_cpy == expected
+
+    @pytest.mark.parametrize("mutation_mode", ["deepcopy", "copy-on-write"])
+    def test_patch_json(self, json, mutation_mode):
+        json_cpy = deepcopy(json)
+        operations = [
+            {"op": "add", "path": "$..address", "value": {"country": "Thailand"}},
+            {"op": "update", "path": "$..phoneNumbers[*].type", "value": "mobile"},
+            {"op": "delete", "path": "$..isMarried"},
+            {"op": "add", "path": "$.address.geo", "value": {}},
+            {"op": "add", "path": "$.address.geo", "value": {"lat": 13.7}},
+        ]
+        expected = json
+        for operation in operations:
+            if operation["op"] == "add":
+                expected = self.json_library.add_object_to_json(
+                    expected, operation["path"], operation["value"]
+                )
+            elif operation["op"] == "update":
+                expected = self.json_library.update_value_to_json(
+                    expected, operation["path"], operation["value"]
+                )
+            else:
+                expected = self.json_library.delete_object_from_json(
+                    expected, operation["path"]
+                )
+        json_object = self.json_library.patch_json(
+            json_cpy, operations, mutation_mode=mutation_mode
+        )
+        assert json_object == expected
+        assert json_cpy == json
+        assert operations[3]["value"] == {}
+
+    @pytest.mark.parametrize("mutation_mode", ["deepcopy", "copy-on-write"])
+    def test_patch_json_rfc6902(self, json, mutation_mode):
+        json_cpy = deepcopy(json)
+        json_object = self.json_library.patch_json(
+            json_cpy,
+            '[{"op": "test", "path": "/address/city", "value": "Nara"},'
+            ' {"op": "replace", "path": "/address/city", "value": "Bangkok"},'
+            ' {"op": "add", "path": "/favoriteColor/0", "value": "green"},'
+            ' {"op": "add", "path": "/favoriteColor/-", "value": "red"},'
+            ' {"op": "remove", "path": "/phoneNumbers/0"},'
+            ' {"op": "copy", "from": "/address", "path": "/home"},'
+            ' {"op": "move", "from": "/age", "path": "/a~1b"}]',
+            mutation_mode=mutation_mode,
+        )
+        assert json_object["address"]["city"] == "Bangkok"
+        assert json_object["home"] == json_object["address"]
+        assert json_object["home"] is not json_object["address"]
+        assert json_object["favoriteColor"] == ["green", "blue", "red"]
+        assert len(json_object["phoneNumbers"]) == 2
+        assert json_object["a/b"] == 26 and "age" not in json_object
+        assert json_cpy == json
+
+    @pytest.mark.parametrize(
+        "operations, message",
+        [
+            ([{"op": "add", "path": "$.a.b", "value": 1}], "no match found for parent"),
+            ([{"op": "delete", "path": "$.[?(@.id == 1)]"}], "Parser failed"),
+            ([{"op": "remove", "path": "/missing"}], "member 'missing' not found"),
+            ([{"op": "test", "path": "/age", "value": 1}], "JSON Patch test failed"),
+            ([{"op": "replace", "path": "/favoriteColor/1", "value": 1}], "range"),
+            ([{"op": "rename", "path": "$.age"}], "Unsupported patch operation"),
+            (
+                [{"op": "add", "path": "/age/a", "value": 1}],
+                "cannot reference 'a' in int",
+            ),
+            (
+                '[{"op": "delete", "path": "$.age"}',
+                "Patch operations are not valid JSON",
+            ),
+            ('{"op": "delete", "path": "$.age"}', "Patch operations must be a list"),
+        ],
+    )
+    def test_patch_json_failure(self, json, operations, message):
+        with pytest.raises(AssertionError, match=message):
+            self.json_library.patch_json(json, operations)
+
+    def test_get_values_from_json(self, json):
+        json_paths = [
+            "$.address.city",
+            "$.address.postalCode",
+            "$.phoneNumbers[*].number",
+            "$.phoneNumbers[0].type",
+            "$.address[*]",
+            "$..number",
+            "$.bankAccounts[?(@.amount>=100)].bank",
+            "$.notfound",
+        ]
+        values = self.json_library.get_values_from_json(json, json_paths)
+        assert list(values) == json_paths
+        for json_path in json_paths:
+            assert values[json_path] == self.json_library.get_value_from_json(
+                json, json_path
+            )
+
+    def test_get_values_from_json_single_path(self, json):
+        values = self.json_library.get_values_from_json(json, "$.address.city")
+        assert values == {"$.address.city": ["Nara"]}
+        with pytest.raises(AssertionError, match=r"\$\.notfound$"):
+            self.json_library.get_values_from_json(
+                json, ["$.address.city", "$.notfound"], fail_on_empty="$.notfound"
+            )
+
+    def test_get_values_from_json_by_name(self, json):
+        values = self.json_library.get_values_from_json(
+            json, {"city": "$.address.city", "missing": "$.notfound"}
+        )
+        assert values == {"city": ["Nara"], "missing": []}
+        self.json_library.get_values_from_json(
+            json,
+            {"city": "$.address.city", "missing": "$.notfound"},
+            fail_on_empty=["city"],
+        )
+        with pytest.raises(AssertionError, match="missing"):
+            self.json_library.get_values_from_json(
+                json,
+                {"city": "$.address.city", "missing": "$.notfound"},
+                fail_on_empty=True,
+            )
+
+    @pytest.fixture(params=["gzip", "bz2", "xz", "zstd"])
+    def compressed_file(self, request, json):
+        if request.param == "zstd":
+            zstandard = pytest.importorskip("zstandard")
+            compress = zstandard.ZstdCompressor().compress
+        else:
+            compress = {"gzip": gzip, "bz2": bz2, "xz": lzma}[request.param].compress
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # without extension, the compression is found by the magic number
+            file_name = os.path.join(temp_dir, "fixture")
+            with open(file_name, "wb") as json_file:
+                json_file.write(compress(stdlib_json.dumps(json).encode("utf-16")))
+            yield file_name
+
+    def test_load_json_from_compressed_file(self, json, compressed_file):
+        loaded = self.json_library.load_json_from_file(compressed_file, "utf-16")
+        assert loaded == json
+        objects = self.json_library.load_json_from_files(
+            [compressed_file], encoding="utf-16"
+        )
+        assert objects == {compressed_file: json}
+        value = self.json_library.get_value_from_json_file(
+            compressed_file, "$.address.city", encoding="utf-16"
+        )
+        assert value == [json["address"]["city"]]
+
+    def test_stream_compressed_file(self, json, streaming_backend):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = self.json_library.dump_json_to_file(
+                os.path.join(temp_dir, "example.json.gz"), json, gzip=True
+            )
+            values = self.json_library.get_value_from_json_file(file_name, "$..number")
+            assert values == [phone["number"] for phone in json["phoneNumbers"]]
+            self.json_library.dump_json_to_file(
+                file_name + ".ndjson", json, json_lines=True, gzip=True
+            )
+            assert self.json_library.load_json_lines_from_file(
+                file_name + ".ndjson"
+            ) == [json]
+
+    def test_load_json_from_file_memory_map(self, json, json_backend):
+        json_library = JSONLibrary(json_backend=json_backend.name)
+        file_name = os.path.join(self.dir_path, "json", "example.json")
+        assert json_library.load_json_from_file(file_name, memory_map=True) == json
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = json_library.dump_json_to_file(
+                os.path.join(temp_dir, "fixture.json.gz"), json, gzip=True
+            )
+            loaded = json_library.load_json_from_file(file_name, memory_map=True)
+            assert loaded == json
+            file_name = os.path.join(temp_dir, "fixture.json")
+            for content, encoding in (
+                ('{"name": "\u0e2a\u0e21\u0e0a\u0e32\u0e22"}', "utf-8"),
+                ('{"name": "\u0e2a\u0e21\u0e0a\u0e32\u0e22"}', "utf-16"),
+                ('{"nan": NaN}', "utf-8"),
+            ):
+                with open(file_name, "w", encoding=encoding) as json_file:
+                    json_file.write(content)
+                loaded = json_library.load_json_from_file(
+                    file_name, encoding, memory_map=True
+                )
+                assert stdlib_json.dumps(loaded) == stdlib_json.dumps(
+                    stdlib_json.loads(content)
+                )
+            for content in ("", "{invalid"):
+                with open(file_name, "w") as json_file:
+                    json_file.write(content)
+                with pytest.raises(ValueError):
+                    json_library.load_json_from_file(file_name, memory_map=True)
+
+    def test_load_json_from_corrupted_compressed_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "example.json.gz")
+            with open(file_name, "w") as json_file:
+                json_file.write("{}")
+            with pytest.raises(OSError, match="Not a gzipped file"):
+                self.json_library.load_json_from_file(file_name)
+
+    @pytest.fixture(params=["python", "ijson"])
+    def streaming_backend(self, request, monkeypatch):
+        if request.param == "ijson":
+            pytest.importorskip("ijson")
+        else:
+            monkeypatch.setattr("JSONLibrary.jsonlibrary.ijson", None)
+        return request.param
+
+    @pytest.mark.parametrize(
+        "json_path",
+        [
+            "$",
+            "$.address.city",
+            "$.address[*]",
+            "$.phoneNumbers[*].type",
+            "$.phoneNumbers[1:].number",
+            "$.phoneNumbers[-1].type",
+            "$..number",
+            "$..address.city",
+            "$..*",
+            "$.bankAccounts[?(@.amount>=100)].bank",
+            "$.address.`parent`.age",
+            "$.notfound",
+        ],
+    )
+    def test_get_value_from_json_file(self, json, streaming_backend, json_path):
+        file_name = os.path.join(self.dir_path, "json", "example.json")
+        values = self.json_library.get_value_from_json_file(file_name, json_path)
+        assert values == self.json_library.get_value_from_json(json, json_path)
+        count = self.json_library.count_values_in_json_file(file_name, json_path)
+        assert count == len(values)
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+    def test_streaming_parser_chunk_boundaries(self, json, chunk_size):
+        from io import StringIO
+        from JSONLibrary.streaming import build, iter_events
+
+        text = self.json_library.convert_json_to_string(
+            {**json, "special": ['a\\u00e9"', -1.5e-3, 10, True, None, {}, []]}
+        )
+        events = iter_events(StringIO(text), chunk_size)
+        event, value = next(events)
+        assert build(events, event, value) == self.json_library.convert_string_to_json(
+            text
+        )
+
+    def test_should_have_value_in_json_file(self, streaming_backend):
+        file_name = os.path.join(self.dir_path, "json", "example.json")
+        self.json_library.should_have_value_in_json_file(file_name, "$..number")
+        self.json_library.should_not_have_value_in_json_file(file_name, "$..notfound")
+        with pytest.raises(AssertionError, match="No value found"):
+            self.json_library.should_have_value_in_json_file(file_name, "$..notfound")
+        with pytest.raises(AssertionError, match="Match found"):
+            self.json_library.should_not_have_value_in_json_file(file_name, "$..number")
+        with pytest.raises(AssertionError, match="failed to find a value"):
+            self.json_library.get_value_from_json_file(
+                file_name, "$..notfound", fail_on_empty=True
+            )
+
+    def test_json_file_not_found(self):
+        with pytest.raises(IOError):
+            self.json_library.get_value_from_json_file("notfound.json", "$..number")
+
+    def test_streaming_invalid_json(self, streaming_backend):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_name = os.path.join(tmpdir, "invalid.json")
+            with open(file_name, "w") as json_file:
+                json_file.write('{"a": [1, 2,, 3]}')
+            with pytest.raises(ValueError):
+                self.json_library.get_value_from_json_file(file_name, "$.a[*]")
+
+    @pytest.mark.parametrize(
+        "json_path", ["$.a[*]", "$..b", "$.a[?(@ > 2.5)]", "$.a[0]", "$.c"]
+    )
+    def test_streaming_non_finite_numbers(self, streaming_backend, json_path):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_name = os.path.join(tmpdir, "numbers.json")
+            with open(file_name, "w") as json_file:
+                json_file.write('{"a": [2, 3, NaN, Infinity, -Infinity, 1e400], ')
+                json_file.write('"b": {"b": 1}, "c": 4}')
+            expected = self.json_library.get_value_from_json(
+                self.json_library.load_json_from_file(file_name), json_path
+            )
+            values = self.json_library.get_value_from_json_file(file_name, json_path)
+            assert repr(values) == repr(expected)
+            count = self.json_library.count_values_in_json_file(file_name, json_path)
+            assert count == len(expected)
+
+    @pytest.mark.parametrize("extra", [" x", '{"b": 2}', "]"])
+    def test_streaming_extra_data(self, streaming_backend, extra):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_name = os.path.join(tmpdir, "extra.json")
+            with open(file_name, "w") as json_file:
+                json_file.write('{"a": [1, 2]} ' + extra)
+            with pytest.raises(ValueError, match="Extra data"):
+                self.json_library.load_json_from_file(file_name)
+            for json_path in ("$.a[*]", "$.a[?(@ > 1)]", "$.missing", "$..a"):
+                with pytest.raises(ValueError, match="Extra data"):
+                    self.json_library.get_value_from_json_file(file_name, json_path)
+                with pytest.raises(ValueError, match="Extra data"):
+                    self.json_library.count_values_in_json_file(file_name, json_path)
+
+    def test_load_json_lines_from_file(self):
+        file_name = os.path.join(self.dir_path, "json", "example.ndjson")
+        records = self.json_library.load_json_lines_from_file(file_name)
+        assert [record["id"] for record in records] == [1, 2, 3, 4, 5]
+        db_records = self.json_library.load_json_lines_from_file(
+            file_name, "$.tags[?(@=='db')]"
+        )
+        assert [record["id"] for record in db_records] == [2, 3]
+        first = self.json_library.load_json_lines_from_file(file_name, "$.tags[0]", 2)
+        assert [record["id"] for record in first] == [1, 2]
+
+    def test_get_value_from_json_lines_file(self):
+        file_name = os.path.join(self.dir_path, "json", "example.ndjson")
+        tags = self.json_library.get_value_from_json_lines_file(file_name, "$.tags[*]")
+        assert tags == ["boot", "db", "retry", "db"]
+        ids = self.json_library.get_value_from_json_lines_file(
+            file_name, "$.id", limit=3
+        )
+        assert ids == [1, 2, 3]
+        assert self.json_library.count_values_in_json_lines_file(file_name, "$") == 5
+        assert (
+            self.json_library.count_values_in_json_lines_file(
+                file_name, "$.tags[?(@=='db')]"
+            )
+            == 2
+        )
+        with pytest.raises(AssertionError, match="failed to find a value"):
+            self.json_library.get_value_from_json_lines_file(
+                file_name, "$.notfound", fail_on_empty=True
+            )
+
+    def test_should_have_value_in_json_lines_file(self):
+        file_name = os.path.join(self.dir_path, "json", "example.ndjson")
+        self.json_library.should_have_value_in_json_lines_file(file_name, "$.status")
+        self.json_library.should_not_have_value_in_json_lines_file(
+            file_name, "$.exception"
+        )
+        with pytest.raises(AssertionError, match="No value found"):
+            self.json_library.should_have_value_in_json_lines_file(
+                file_name, "$.notfound"
+            )
+        with pytest.raises(AssertionError, match="Match found"):
+            self.json_library.should_not_have_value_in_json_lines_file(
+                file_name, "$.status"
+            )
+        with pytest.raises(IOError):
+            self.json_library.load_json_lines_from_file("notfound.ndjson")
+
+    def test_dump_json_lines_to_gzip_file(self, json):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "events.ndjson.gz")
+            for number in range(3):
+                self.json_library.dump_json_to_file(
+                    file_path, {"number": number}, json_lines=True, gzip=True
+                )
+            with gzip.open(file_path, "rt") as json_file:
+                assert json_file.read().splitlines() == [
+                    '{"number":0}',
+                    '{"number":1}',
+                    '{"number":2}',
+                ]
+
+    def test_dump_json_lines_to_file(self, json):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sample.ndjson")
+            self.json_library.dump_json_to_file(file_path, json, json_lines=True)
+            self.json_library.dump_json_to_file(file_path, [1, 2], json_lines=True)
+            with open(file_path) as json_file:
+                assert len(json_file.readlines()) == 2
+            records = self.json_library.load_json_lines_from_file(file_path)
+            assert records == [json, [1, 2]]
+            with open(file_path, "a") as json_file:
+                json_file.write("{invalid\n")
+            with pytest.raises(ValueError, match="line 3"):
+                self.json_library.load_json_lines_from_file(file_path)
+
+    JSON_BACKEND_DOCUMENTS = [
+        {"a": 1, "b": [1, 2.5, None, True, False], "c": {}, "d": []},
+        {"text": 'é ü 中文 😀 \u007f \x01 \n \t / " \\'},
+        [1e16, 1e-05, 0.1, -0.0, 1.7976931348623157e308, 5e-324, 123456.789],
+        [float("nan"), float("inf"), float("-inf")],
+        [2**63, 2**64, -(2**63) - 1, 12345678901234567890123],
+        {1: "int key", None: "null key"},
+        "\ud800",
+        ("tuple", {"nested": ({"deep": [[]]},)}),
+    ]
+
+    @pytest.fixture(params=["json", "orjson"])
+    def json_backend(self, request):
+        if request.param == "orjson":
+            pytest.importorskip("orjson")
+        return get_json_backend(request.param)
+
+    @pytest.mark.parametrize("document", JSON_BACKEND_DOCUMENTS)
+    @pytest.mark.parametrize(
+        "indent, separators",
+        [(None, None), (2, None), (4, None), ("\t", None), (None, (",", ":"))],
+    )
+    def test_json_backend_dumps(self, json_backend, document, indent, separators):
+        expected = stdlib_json.dumps(document, indent=indent, separators=separators)
+        assert json_backend.dumps(document, indent, separators) == expected
+
+    @pytest.mark.parametrize(
+        "json_string",
+        [
+            '{"a": 1, "b": [1, 2.5, null, true], "c": "\\u00e9\\ud83d\\ude00"}',
+            '"\\ud800"',
+            "[NaN, Infinity, -Infinity, 1e400]",
+            '{"a": 1, "a": 2}',
+            " [1e5, 0.30000000000000004, -0] ",
+            b'{"bytes": "\xc3\xa9"}',
+            '{"a" 1}',
+            "[1,]",
+            "01",
+            '"\t"',
+            "",
+        ],
+    )
+    def test_json_backend_loads(self, json_backend, json_string):
+        try:
+            expected = stdlib_json.loads(json_string)
+        except ValueError as e:
+            with pytest.raises(type(e)) as error:
+                json_backend.loads(json_string)
+            assert str(error.value) == str(e)
+        else:
+            assert repr(json_backend.loads(json_string)) == repr(expected)
+
+    def test_set_json_backend(self, json):
+        json_library = JSONLibrary(json_backend="auto")
+        file_name = os.path.join(self.dir_path, "json", "example.json")
+        assert json_library.load_json_from_file(file_name) == json
+        assert json_library.convert_json_to_string(
+            json, indent=2
+        ) == self.json_library.convert_json_to_string(json, indent=2)
+        previous = json_library.set_json_backend("json")
+        assert previous in ("json", "orjson")
+        assert json_library.set_json_backend(previous) == "json"
+        with pytest.raises(AssertionError, match="Unsupported json backend"):
+            json_library.set_json_backend("simdjson")
+
+    def test_schema_cache(self, json):
+        self.json_library.clear_json_schema_cache()
+        schema = {"type": "object", "required": ["firstName"]}
+        self.json_library.validate_json_by_schema(json, schema)
+        self.json_library.validate_json_by_schema(json, dict(schema))
+        info = self.json_library.get_json_schema_cache_info()["validators"]
+        assert (info["hits"], info["misses"], info["size"]) == (1, 1, 1)
+        # a changed schema is a different schema, not a stale cached one
+        schema["required"].append("notfound")
+        with pytest.raises(AssertionError, match="'notfound' is a required property"):
+            self.json_library.validate_json_by_schema(json, schema)
+        self.json_library.clear_json_schema_cache()
+        info = self.json_library.get_json_schema_cache_info()["validators"]
+        assert (info["hits"], info["misses"], info["size"]) == (0, 0, 0)
+
+    def test_schema_file_cache(self, json):
+        self.json_library.clear_json_schema_cache()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            schema_path = os.path.join(temp_dir, "schema.json")
+            self.json_library.dump_json_to_file(schema_path, {"type": "object"})
+            self.json_library.validate_json_by_schema_file(json, schema_path)
+            self.json_library.validate_json_by_schema_file(json, schema_path)
+            info = self.json_library.get_json_schema_cache_info()["schema_files"]
+            assert (info["hits"], info["misses"]) == (1, 1)
+            self.json_library.dump_json_to_file(schema_path, {"type": "array"})
+            with pytest.raises(AssertionError, match="is not of type 'array'"):
+                self.json_library.validate_json_by_schema_file(json, schema_path)
+
+    def test_validate_json_by_schema_file_with_refs(self, json):
+        schema_dir = os.path.join(self.dir_path, "json", "schemas")
+        schema_path = os.path.join(schema_dir, "person.json")
+        # relative references resolve to the files next to the schema
+        self.json_library.validate_json_by_schema(
+            json["address"], {"$ref": Path(schema_dir, "address.json").as_uri()}
+        )
+        # schemas referenced by their $id are never fetched remotely
+        with pytest.raises(AssertionError, match="Unresolvable: https://example.com"):
+            self.json_library.validate_json_by_schema_file(json, schema_path)
+        try:
+            assert self.json_library.register_json_schema_directory(schema_dir) == 4
+            self.json_library.validate_json_by_schema_file(json, schema_path)
+            invalid = deepcopy(json)
+            invalid["address"]["city"] = ""
+            with pytest.raises(AssertionError, match="'' should be non-empty"):
+                self.json_library.validate_json_by_schema_file(invalid, schema_path)
+            del invalid["phoneNumbers"][1]["number"]
+            invalid["address"]["city"] = "Nara"
+            with pytest.raises(AssertionError, match="'number' is a required property"):
+                self.json_library.validate_json_by_schema_file(invalid, schema_path)
+        finally:
+            schema_registry.clear()
+
+    def test_validate_json_by_schema_max_errors(self):
+        schema = {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {"id": {"type": "integer"}},
+            },
+        }
+        items = [{"id": "bad"}, {"id": 1}, {"name": "no id"}, {"id": 2.5}]
+        with pytest.raises(AssertionError) as error:
+            self.json_library.validate_json_by_schema(items, schema, max_errors=10)
+        assert str(error.value).splitlines() == [
+            "Json object does not match the schema, 3 errors:",
+            "'bad' is not of type 'integer', Json path: $[0].id, "
+            "Schema path: items > properties > id > type",
+            "'id' is a required property, Json path: $[2], Schema path: items > required",
+            "2.5 is not of type 'integer', Json path: $[3].id, "
+            "Schema path: items > properties > id > type",
+        ]
+        with pytest.raises(AssertionError, match="first 2 errors:") as error:
+            self.json_library.validate_json_by_schema(
+                items * 100000, schema, max_errors=2
+            )
+        assert len(str(error.value).splitlines()) == 3
+        self.json_library.validate_json_by_schema([{"id": 1}], schema, max_errors=1)
+        with pytest.raises(AssertionError, match="must be a positive number"):
+            self.json_library.validate_json_by_schema(items, schema, max_errors=0)
+
+    @pytest.mark.parametrize(
+        "keys, json_path",
+        [
+            ([], "$"),
+            (["address", "city"], "$.address.city"),
+            (["phoneNumbers", 1, "type"], "$.phoneNumbers[1].type"),
+            (
+                ["a b", "it's", "where", "trueName", "0"],
+                "$['a b'][\"it's\"]['where']['trueName']['0']",
+            ),
+        ],
+    )
+    def test_to_json_path(self, keys, json_path):
+        assert to_json_path(keys) == json_path
+        document = value = {}
+        for key in keys:
+            value[key] = {}
+            value = value[key]
+        if keys and not any(isinstance(key, int) for key in keys):
+            assert self.json_library.get_value_from_json(document, json_path) == [{}]
+
+    @pytest.mark.parametrize(
+        "executor, workers, chunk_size",
+        [("thread", 1, None), ("thread", 3, 2), ("process", 2, 3)],
+    )
+    def test_validate_json_items_by_schema(self, json, executor, workers, chunk_size):
+        schema_path = os.path.join(self.dir_path, "json", "example_schema.json")
+        invalid = deepcopy(json)
+        del invalid["phoneNumbers"]
+        items = [json, invalid, json, {**json, "age": "26"}, json]
+        failures = self.json_library.validate_json_items_by_schema(
+            items,
+            schema_path,
+            executor=executor,
+            workers=workers,
+            chunk_size=chunk_size,
+            fail_on_errors=False,
+        )
+        assert failures == {
+            1: "'phoneNumbers' is a required property, Schema path: required",
+            3: "'26' is not of type 'integer', Schema path: properties > age > type",
+        }
+        with pytest.raises(AssertionError, match="2 of 5 items do not match"):
+            self.json_library.validate_json_items_by_schema(
+                items, schema_path, executor=executor, workers=workers
+            )
+
+    def test_validate_json_files_by_schema(self, json):
+        schema = {"type": "object", "required": ["firstName"]}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, document in [("a", json), ("b", {}), ("c", json)]:
+                self.json_library.dump_json_to_file(
+                    os.path.join(temp_dir, f"{name}.json"), document
+                )
+            with open(os.path.join(temp_dir, "d.json"), "w") as json_file:
+                json_file.write("{invalid")
+            failures = self.json_library.validate_json_items_by_schema(
+                os.path.join(temp_dir, "*.json"),
+                schema,
+                workers=2,
+                chunk_size=1,
+                fail_on_errors=False,
+            )
+        assert list(failures) == [
+            os.path.join(temp_dir, "b.json"),
+            os.path.join(temp_dir, "d.json"),
+        ]
+        assert "'firstName' is a required property" in failures[list(failures)[0]]
+        assert failures[list(failures)[1]].startswith("Cannot load json:")
+        with pytest.raises(AssertionError, match="No json file matches"):
+            self.json_library.validate_json_items_by_schema("notfound/*.json", schema)
+
+    @pytest.mark.parametrize("executor, workers", [("thread", None), ("process", 2)])
+    def test_load_json_from_files(self, json, executor, workers):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.mkdir(os.path.join(temp_dir, "nested"))
+            names = ["a.json", "b.json", os.path.join("nested", "c.json")]
+            for position, name in enumerate(names):
+                self.json_library.dump_json_to_file(
+                    os.path.join(temp_dir, name), {**json, "position": position}
+                )
+            objects = self.json_library.load_json_from_files(
+                temp_dir, executor=executor, workers=workers
+            )
+            assert list(objects) == [
+                os.path.join(temp_dir, "a.json"),
+                os.path.join(temp_dir, "b.json"),
+            ]
+            objects = self.json_library.load_json_from_files(
+                temp_dir, pattern="**/*.json", executor=executor, workers=workers
+            )
+            assert [value["position"] for value in objects.values()] == [0, 1, 2]
+            file_names = [os.path.join(temp_dir, name) for name in reversed(names)]
+            objects = self.json_library.load_json_from_files(
+                file_names, executor=executor, workers=workers
+            )
+            assert list(objects) == file_names
+            assert objects[file_names[0]] == {**json, "position": 2}
+
+    def test_load_json_from_files_errors(self):
+        with pytest.raises(
+            IOError, match="JSON files not found: missing1.json, missing2.json"
+        ):
+            self.json_library.load_json_from_files(
+                [
+                    os.path.join(self.dir_path, "json", "example.json"),
+                    "missing1.json",
+                    "missing2.json",
+                ]
+            )
+        with pytest.raises(IOError, match="JSON directory notfound not found"):
+            self.json_library.load_json_from_files("notfound")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "invalid.json")
+            with open(file_name, "w") as json_file:
+                json_file.write("{invalid")
+            with pytest.raises(
+                ValueError, match="invalid.json: Expecting property name"
+            ):
+                self.json_library.load_json_from_files([file_name, file_name])
+
+    @staticmethod
+    def run_keyword(library, name, *args, **kwargs):
+        # what Robot Framework does with the library listener
+        attributes = {"kwname": name, "libname": "JSONLibrary"}
+        listener = library.ROBOT_LIBRARY_LISTENER
+        listener.start_keyword(f"JSONLibrary.{name}", attributes)
+        try:
+            return getattr(library, name.lower().replace(" ", "_"))(*args, **kwargs)
+        finally:
+            listener.end_keyword(f"JSONLibrary.{name}", attributes)
+
+    def test_instrumentation(self, json):
+        json_library = JSONLibrary(instrumentation="time")
+        for _ in range(2):
+            self.run_keyword(
+                json_library, "Update Value To Json", json, "$..number", "0"
+            )
+        self.run_keyword(json_library, "Convert Json To String", json)
+        listener = json_library.ROBOT_LIBRARY_LISTENER
+        listener.start_keyword("BuiltIn.Log", {"kwname": "Log", "libname": "BuiltIn"})
+        json_library.get_value_from_json(json, "$..number")
+        listener.end_keyword("BuiltIn.Log", {"kwname": "Log", "libname": "BuiltIn"})
+        statistics = json_library.get_json_instrumentation_statistics()
+        assert statistics["mode"] == "time"
+        assert set(statistics["keywords"]) == {
+            "Update Value To Json",
+            "Convert Json To String",
+        }
+        update = statistics["keywords"]["Update Value To Json"]
+        assert update["calls"] == 2
+        assert update["min"] <= update["mean"] <= update["max"] <= update["total"]
+        assert set(update["phases"]) == {"parse", "copy", "find", "mutate"}
+        assert update["phases"]["find"]["calls"] == 2
+        assert "peak_memory" not in update
+        assert set(statistics["keywords"]["Convert Json To String"]["phases"]) == {
+            "serialize"
+        }
+        # phases outside of the library keywords are only recorded in total
+        assert statistics["phases"]["find"]["calls"] == 3
+        assert statistics["phases"]["parse"]["calls"] == 3
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "statistics.json")
+            json_library.log_json_instrumentation_statistics(file_name)
+            with open(file_name, encoding="utf-8") as statistics_file:
+                assert stdlib_json.load(statistics_file) == statistics
+        json_library.clear_json_instrumentation_statistics()
+        assert json_library.get_json_instrumentation_statistics() == {
+            "mode": "time",
+            "keywords": {},
+            "phases": {},
+        }
+
+    def test_instrumentation_memory(self, json):
+        json_library = JSONLibrary(instrumentation="memory")
+        schema_path = os.path.join(self.dir_path, "json", "example_schema.json")
+        self.run_keyword(
+            json_library, "Validate Json By Schema File", json, schema_path
+        )
+        self.run_keyword(json_library, "Get Value From Json", json, "$..number")
+        statistics = json_library.get_json_instrumentation_statistics()
+        for keyword in ("Validate Json By Schema File", "Get Value From Json"):
+            assert statistics["keywords"][keyword]["peak_memory"] > 0
+        assert set(statistics["phases"]) == {"validate", "parse", "find"}
+        assert not tracemalloc.is_tracing()
+
+    def test_set_json_instrumentation(self, json):
+        json_library = JSONLibrary()
+        self.run_keyword(json_library, "Get Value From Json", json, "$..number")
+        assert json_library.get_json_instrumentation_statistics()["keywords"] == {}
+        assert json_library.set_json_instrumentation("time") == "off"
+        # the keyword enabling the instrumentation is not recorded
+        self.run_keyword(json_library, "Set Json Instrumentation", "time")
+        self.run_keyword(json_library, "Get Value From Json", json, "$..number")
+        statistics = json_library.get_json_instrumentation_statistics()
+        assert list(statistics["keywords"]) == ["Get Value From Json"]
+        assert json_library.set_json_instrumentation("off") == "time"
+        with pytest.raises(AssertionError, match="Unsupported instrumentation mode"):
+            json_library.set_json_instrumentation("always")
+        with pytest.raises(AssertionError, match="Unsupported instrumentation mode"):
+            JSONLibrary(instrumentation="always")
+
+    @pytest.mark.parametrize(
+        "json_path",
+        [
+            "$",
+            "$..phoneNumbers[?(@.type=='iPhone')].number",
+            "$.phoneNumbers[?(@.type!=\"home\" & @.number=~'^0')]",
+            "$.phoneNumbers[/type,\\number]",
+            "$['first name'].`len`",
+            "$.firstName | $.lastName",
+            "$.address.city.`sub(/N/, M)`",
+            "$.age + 1",
+            "$.a[0,1]",
+            "$.a[",
+            "$.'abc",
+            "$.[?(@.id == 1)]",
+        ],
+    )
+    def test_parse(self, json_path):
+        def parse_result(parse_function):
+            try:
+                # nodes without equality are compared by their repr
+                return re.sub(" at 0x[0-9a-f]+", "", repr(parse_function(json_path)))
+            except Exception as e:
+                return type(e), str(e)
+
+        expected = parse_result(parse_ng)
+        assert parse_result(parse) == expected
+        assert parse_result(parse) == expected
+
+    @pytest.mark.parametrize(
+        "version, supported",
+        [("1.4.3", False), ("1.5.3", True), ("1.7.0", True), ("1.8.0", False)],
+    )
+    def test_supported_jsonpath_ng(self, monkeypatch, version, supported):
+        monkeypatch.setattr("importlib.metadata.version", lambda name: version)
+        assert is_supported_jsonpath_ng.__wrapped__() is supported
+
+    def test_unsupported_jsonpath_ng(self, json, monkeypatch):
+        # other versions are only used through the public api of jsonpath_ng
+        monkeypatch.setattr(
+            "JSONLibrary.parser.is_supported_jsonpath_ng", lambda: False
+        )
+        monkeypatch.setattr(
+            "JSONLibrary.lazypath.is_supported_jsonpath_ng", lambda: False
+        )
+        json_path = "$.phoneNumbers[?(@.type=='home')].number"
+        assert repr(parse(json_path)) == repr(parse_ng(json_path))
+        json_path_expr = parse("$..number")
+        assert [match.value for match in iter_find(json_path_expr, json)] == [
+            match.value for match in json_path_expr.find(json)
+        ]
+
+    def test_import_time(self):
+        # jsonschema and multiprocessing are imported by the keywords using them
+        root = os.path.dirname(self.dir_path)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [root, os.environ.get("PYTHONPATH")])
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import JSONLibrary"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imported = {
+            line.split("|")[-1].strip(): line
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        assert "JSONLibrary" in imported, result.stderr
+        for module in ("jsonschema", "referencing", "concurrent.futures.process"):
+            assert module not in imported, imported["JSONLibrary"]
+
+    @pytest.mark.parametrize(
+        "values, typecode",
+        [
+            ([1, -2, 3], "q"),
+            ([1.5, 2, -3], "d"),
+            ([2**63], None),
+            ([2**60, 0.5], None),
+            ([True, False], None),
+            (["a", "b"], None),
+            ([1, None], None),
+            ([], None),
+        ],
+    )
+    def test_get_json_column(self, values, typecode):
+        json_object = {"items": [{"value": value} for value in values]}
+        for json_path in ("$.items", "$.items[*]"):
+            column = self.json_library.get_json_column(json_object, json_path, "value")
+            assert getattr(column, "typecode", None) == typecode
+            assert list(column) == values
+
+    def test_get_json_columns(self, json):
+        json_object = {
+            "items": [
+                {"id": 1, "price": 9.5, "address": {"city": "Nara"}},
+                {"id": 2, "price": 10, "address": {"city": "Osaka"}},
+                {"id": 3, "address": None},
+            ]
+        }
+        columns = self.json_library.get_json_columns(
+            json_object, "$.items[:2]", "id", "price", "address.city"
+        )
+        assert columns == {
+            "id": array("q", [1, 2]),
+            "price": array("d", [9.5, 10.0]),
+            "address.city": ["Nara", "Osaka"],
+        }
+        with pytest.raises(AssertionError, match="Record 2 has no field price"):
+            self.json_library.get_json_columns(json_object, "$.items", "id", "price")
+        columns = self.json_library.get_json_columns(
+            json_object, "$.items", "price", "address.city", fail_on_missing=False
+        )
+        assert columns == {
+            "price": [9.5, 10, None],
+            "address.city": ["Nara", "Osaka", None],
+        }
+        column = self.json_library.get_json_column(json, "$.phoneNumbers", "type")
+        assert column == ["iPhone", "home", "car"]
+
+    def test_get_json_columns_numpy(self):
+        np = pytest.importorskip("numpy")
+        json_object = {
+            "items": [
+                {"id": 1, "price": 9.5, "name": "a", "tags": []},
+                {"id": 2, "price": 10, "name": "b", "tags": None},
+            ]
+        }
+        columns = self.json_library.get_json_columns(
+            json_object, "$.items", "id", "price", "name", "tags", numpy=True
+        )
+        assert [column.dtype.kind for column in columns.values()] == list("ifUO")
+        assert columns["price"].tolist() == [9.5, 10.0]
+        assert columns["tags"].tolist() == [[], None]
+
+    @pytest.mark.parametrize("column_type", ["list", "array", "numpy"])
+    def test_json_column_keywords(self, column_type):
+        def column(values):
+            if column_type == "numpy":
+                return pytest.importorskip("numpy").array(values)
+            if column_type == "array" and all(type(v) is int for v in values):
+                return array("q", values)
+            return values
+
+        aggregate = self.json_library.aggregate_json_column
+        ids = column([3, 1, 2, 1])
+        assert aggregate(ids, "count") == 4
+        assert aggregate(ids, "sum") == 7
+        assert aggregate(ids, "min") == 1
+        assert aggregate(ids, "max") == 3
+        assert aggregate(ids, "mean") == 1.75
+        assert aggregate(ids, "distinct") == [3, 1, 2]
+        assert type(aggregate(ids, "sum")) is int
+        assert aggregate(column(["b", "a", "b"]), "distinct") == ["b", "a"]
+        assert aggregate(column([]), "sum") == 0
+        with pytest.raises(AssertionError, match="Cannot get the min of an empty"):
+            aggregate(column([]), "min")
+        with pytest.raises(AssertionError, match="Unsupported aggregate 'median'"):
+            aggregate(ids, "median")
+        self.json_library.json_column_should_be_sorted(column([1, 1, 2]))
+        self.json_library.json_column_should_be_sorted(
+            column([3, 2, 1]), descending=True, strict=True
+        )
+        with pytest.raises(
+            AssertionError,
+            match="not sorted in ascending order: 3 at index 0 is followed by 1",
+        ):
+            self.json_library.json_column_should_be_sorted(ids)
+        with pytest.raises(AssertionError, match="1 at index 0 is followed by 1"):
+            self.json_library.json_column_should_be_sorted(
+                column([1, 1, 2]), strict=True
+            )
+        self.json_library.json_column_values_should_be_equal(column([5, 5]))
+        self.json_library.json_column_values_should_be_equal(column(["a", "a"]), "a")
+        self.json_library.json_column_values_should_be_equal(column([]))
+        with pytest.raises(AssertionError, match="2 at index 2 is not equal to 1"):
+            self.json_library.json_column_values_should_be_equal(column([1, 1, 2]))
+        self.json_library.json_column_values_should_be_unique(column([3, 1, 2]))
+        with pytest.raises(AssertionError, match="1 at index 3 is a duplicate"):
+            self.json_library.json_column_values_should_be_unique(ids)
+
+    def test_json_column_keywords_with_objects(self):
+        column = [{"a": 1}, [1], {"a": 1}]
+        assert self.json_library.aggregate_json_column(column, "distinct") == [
+            {"a": 1},
+            [1],
+        ]
+        with pytest.raises(AssertionError, match="at index 2 is a duplicate"):
+            self.json_library.json_column_values_should_be_unique(column)
+        with pytest.raises(AssertionError, match="Cannot compare the values"):
+            self.json_library.json_column_should_be_sorted(column)
+
+    def test_compare_json(self, json):
+        assert self.json_library.compare_json(json, deepcopy(json)) == []
+        actual = deepcopy(json)
+        actual["age"] = 26.0
+        actual["address"]["city"] = "Osaka"
+        del actual["address"]["postalCode"]
+        actual["phoneNumbers"].pop()
+        actual["phoneNumbers"][1]["number"] = None
+        actual["phoneNumbers"][0]["type"] = {"name": "iPhone"}
+        actual["new key"] = [1]
+        assert self.json_library.compare_json(json, actual) == [
+            '$.address.city: expected "Nara" but got "Osaka"',
+            '$.address.postalCode: missing, expected "630-0192"',
+            '$.phoneNumbers[0].type: expected "iPhone" but got {"name": "iPhone"}',
+            '$.phoneNumbers[1].number: expected "0123-4567-8910" but got null',
+            '$.phoneNumbers[2]: missing, expected {"type": "car", "number": '
+            '"0123-4567-8999"}',
+            "$['new key']: unexpected [1]",
+        ]
+        assert len(self.json_library.compare_json(json, actual, max_differences=2)) == 2
+        assert self.json_library.compare_json([[1, 2]], [[1]]) == [
+            "$[0][1]: missing, expected 2"
+        ]
+        assert self.json_library.compare_json({"a": "x" * 100}, {"a": 1}) == [
+            f'$.a: expected "{"x" * 76}... but got 1'
+        ]
+
+    def test_compare_json_ignore_paths(self, json):
+        actual = deepcopy(json)
+        actual["address"]["city"] = "Osaka"
+        actual["phoneNumbers"][1]["number"] = None
+        actual["phoneNumbers"][2]["type"] = "bike"
+        del actual["lastName"]
+        actual["firstName"] = "Taro"
+        ignore_paths = [
+            "$.address.city",
+            "$..number",
+            "$.phoneNumbers[?(@.type=='car')]",
+            "$.lastName",
+            "$.missing",
+        ]
+        assert self.json_library.compare_json(json, actual, ignore_paths) == [
+            '$.firstName: expected "John" but got "Taro"'
+        ]
+        assert self.json_library.compare_json(json, actual, "$") == []
+        assert self.json_library.compare_json(
+            [{"id": 1, "ts": 5}], [{"id": 1, "ts": 6}, {"id": 2, "ts": 7}], "$[*].ts"
+        ) == ['$[1]: unexpected {"id": 2, "ts": 7}']
+
+    def test_compare_json_booleans(self):
+        compare_json = self.json_library.compare_json
+        assert compare_json({"a": 1}, {"a": True}) == ["$.a: expected 1 but got true"]
+        assert compare_json([0.0], [False]) == ["$[0]: expected 0.0 but got false"]
+        assert compare_json(True, 1) == ["$: expected true but got 1"]
+        assert compare_json({"a": [1]}, {"a": [1.0]}) == []
+        assert compare_json([1, 0], [True, False], ignore_order=True) == [
+            "$[0]: unexpected true",
+            "$[1]: unexpected false",
+            "$[0]: missing, expected 1",
+            "$[1]: missing, expected 0",
+        ]
+        assert compare_json([[1], {"a": False}], [{"a": 0}, [True]], ignore_order=True)
+        assert compare_json([True, 1], [1, True], ignore_order=True) == []
+
+    def test_compare_json_ignore_order(self):
+        expected = {"items": [1, 2, 2, {"tags": ["a", "b"]}, [1, [2, 3]]]}
+        actual = {"items": [[[3, 2], 1], {"tags": ["b", "a"]}, 2, 1, 2]}
+        assert self.json_library.compare_json(expected, actual) != []
+        assert self.json_library.compare_json(expected, actual, ignore_order=True) == []
+        assert self.json_library.compare_json(
+            [1, 2, 2, 3], [3, 2, 4, 1, 4], ignore_order=True
+        ) == ["$[2]: unexpected 4", "$[4]: unexpected 4", "$[2]: missing, expected 2"]
+        assert self.json_library.compare_json(
+            [[1, 1, 2]], [[1, 2, 2]], ignore_order=True
+        ) == ["$[0]: unexpected [1, 2, 2]", "$[0]: missing, expected [1, 1, 2]"]
+        assert (
+            self.json_library.compare_json(
+                [{"id": 1, "ts": 1}, {"id": 2, "ts": 2}],
+                [{"id": 2, "ts": 3}, {"id": 1, "ts": 4}],
+                ignore_paths="$[*].ts",
+                ignore_order=True,
+            )
+            == []
+        )
+        items = [{"id": i, "tags": [i % 3, "x"]} for i in range(20000)]
+        shuffled = deepcopy(items)
+        random.Random(0).shuffle(shuffled)
+        shuffled[-1]["tags"].reverse()
+        assert self.json_library.compare_json(items, shuffled, ignore_order=True) == []
+        shuffled[5]["id"] = -1
+        differences = self.json_library.compare_json(items, shuffled, ignore_order=True)
+        assert len(differences) == 2
+        assert differences[0].startswith('$[5]: unexpected {"id": -1')
+
+    def test_json_should_be_equal(self, json):
+        self.json_library.json_should_be_equal(json, deepcopy(json))
+        self.json_library.json_should_be_equal(
+            {"a": 1, "b": [1]}, {"a": 1.0, "b": (1,)}
+        )
+        actual = deepcopy(json)
+        actual["firstName"] = "Taro"
+        actual["age"] = 27
+        actual["isMarried"] = True
+        with pytest.raises(AssertionError) as error:
+            self.json_library.json_should_be_equal(json, actual, max_differences=2)
+        assert str(error.value) == (
+            "Json objects are not equal:\n"
+            '$.firstName: expected "John" but got "Taro"\n'
+            "$.age: expected 26 but got 27\n"
+            "..."
+        )
+        self.json_library.json_should_be_equal(
+            json, actual, ignore_paths=["$.firstName", "$.age", "$.isMarried"]
+        )